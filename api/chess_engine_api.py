@@ -1,51 +1,398 @@
-from fastapi import APIRouter, Body, HTTPException
+import asyncio
+import os
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
 
+import chess
+
+from fastapi import (
+    APIRouter,
+    Body,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
+
+from api.dependencies import (
+    analysis_pool,
+    game_locks,
+    hub,
+    leaderboard,
+    service,
+    sessions,
+)
+from api.responses import ModelResponse
 from chess_app.chess_engine import ChessGame
+from chess_app.rating import rate_game
 from custom_errors.custom_errors import (
     GameNotFoundError,
     GameOverError,
     InvalidMoveError,
+    InvalidPlyError,
     InvalidTurnError,
     PlayernotFoundError,
+    StaleGameError,
 )
-from schemas.move_details import MoveDetails
-from services.strapi_service import StrapiApiService
+from metrics.metrics import GAMES_COMPLETED
+from schemas.analysis import AnalysisResult
+from schemas.book_move import BookMove
+from schemas.game import Game
+from schemas.move_details import MoveBatch, MoveDetails
+from schemas.move_event import MoveEvent
+from schemas.player import normalize_player_name, same_player
+from schemas.tablebase import TablebaseResult
 
 router = APIRouter()
-service = StrapiApiService()
+
+# Seconds between two SSE comments keeping idle subscriptions open through proxies.
+SSE_KEEPALIVE_INTERVAL = float(os.getenv("SSE_KEEPALIVE_INTERVAL", 15.0))
+# Reads of a game attempted by a move before giving up on concurrent updates.
+MOVE_ATTEMPTS = int(os.getenv("MOVE_ATTEMPTS", 3))
+# Largest change of a player's rating after a single game.
+ELO_K_FACTOR = int(os.getenv("ELO_K_FACTOR", 32))
+
+# Orders the read-modify-write cycles of player ratings within this worker.
+_ratings_lock = asyncio.Lock()
+
+
+def _move_event(chess_game: ChessGame) -> MoveEvent:
+    game = chess_game.game
+    return MoveEvent(
+        game_id=game.game_id,
+        fen=game.fen,
+        last_move=chess_game.get_last_move(),
+        turn=game.turn,
+        legal_moves=[] if game.game_over else chess_game.get_legal_move(),
+        game_over=game.game_over,
+        winner=game.winner,
+        result=game.result,
+    )
+
+
+def _publish_move(chess_game: ChessGame) -> None:
+    """Push the stored state of a game to its subscribers, if it has any."""
+    if hub.has_subscribers(chess_game.game.game_id):
+        hub.publish(_move_event(chess_game))
+
+
+async def _serialized(game_id: int, apply: Callable[[], Awaitable[Game]]) -> Game:
+    """
+    Run the read-modify-write of a game under its lock, retrying on concurrent updates.
+
+    `apply` reads the game, plays on it and stores it. When another worker stored the
+    game in between, the write is rejected on its version, the live session is dropped
+    and `apply` runs again on a fresh read, so the move is validated against the
+    latest position instead of being lost or applied twice.
+
+    Raises:
+        HTTPException: 409 if the game kept changing for `MOVE_ATTEMPTS` attempts.
+    """
+    async with game_locks.hold(game_id):
+        for _ in range(MOVE_ATTEMPTS):
+            try:
+                return await apply()
+            except StaleGameError:
+                sessions.discard(game_id)
+    raise HTTPException(
+        status_code=409,
+        detail=f"Game {game_id} is being updated concurrently, retry later",
+    )
+
+
+async def _rate_players(game: Game) -> None:
+    """
+    Update the ratings of the players of a game that just ended, and their rank.
+
+    Only the request whose write ended the game gets past the version check, so each
+    game is rated once. A game played without both seats taken, or whose player was
+    deleted meanwhile, is not rated.
+    """
+    if game.white_player is None or game.black_player is None:
+        return
+    async with _ratings_lock:
+        players = await service.get_players_by_name(
+            [game.white_player.name, game.black_player.name], missing_ok=True
+        )
+        white = players.get(normalize_player_name(game.white_player.name))
+        black = players.get(normalize_player_name(game.black_player.name))
+        if white is None or black is None or same_player(white, black):
+            return
+        white_rank, black_rank = rate_game(
+            white.rank, black.rank, game.result.result, ELO_K_FACTOR
+        )
+        # Only the ratings are written, so a join storing the players meanwhile is kept.
+        for player in await asyncio.gather(
+            service.update_player_rank(white, white_rank),
+            service.update_player_rank(black, black_rank),
+        ):
+            leaderboard.put(player)
+
+
+async def _store(chess_game: ChessGame) -> Game:
+    """
+    Store the game of a session at its new version, and push it to subscribers.
+    A game ended by the move is counted, and its players rated, once it is stored, so
+    a write retried on a stale version or failing is never counted.
+    """
+    stored_game = await service.update_game(chess_game.game)
+    chess_game.bind(stored_game)
+    _publish_move(chess_game)
+    if stored_game.game_over:
+        GAMES_COMPLETED.inc(result=stored_game.result.result)
+        await _rate_players(stored_game)
+    return stored_game
 
 
 @router.patch("/games/{game_id}")
-def make_a_move(game_id: int, move_details: MoveDetails = Body(...)):
-    try:
-        game = service.get_single_game(game_id=game_id)
-        player = service.get_single_player(name=move_details.player_name.capitalize())
-        chess_game = ChessGame(game=game)
-    except PlayernotFoundError as err:
-        raise HTTPException(status_code=404, detail=str(err))
-    except GameNotFoundError as err:
-        raise HTTPException(status_code=404, detail=str(err))
+async def make_a_move(game_id: int, move_details: MoveDetails = Body(...)):
+    async def apply() -> Game:
+        try:
+            game, player = await asyncio.gather(
+                service.get_single_game(game_id=game_id),
+                service.get_single_player(name=move_details.player_name),
+            )
+            chess_game = sessions.get(game)
+        except PlayernotFoundError as err:
+            raise HTTPException(status_code=404, detail=str(err))
+        except GameNotFoundError as err:
+            raise HTTPException(status_code=404, detail=str(err))
 
-    if player in [game.black_player, game.white_player]:
+        if not (
+            same_player(player, game.white_player)
+            or same_player(player, game.black_player)
+        ):
+            raise HTTPException(
+                status_code=403,
+                detail=f"{move_details.player_name} does not belong to this game, please choose a valid player",
+            )
         try:
-            updated_game = chess_game.move(move_details.move, player)
-            service.update_game(updated_game)
-            return updated_game
+            chess_game.move(move_details.move, player)
         except InvalidMoveError as err:
             raise HTTPException(status_code=400, detail=f"Invalid move: {err}")
         except InvalidTurnError as err:
             raise HTTPException(status_code=403, detail=str(err))
         except GameOverError as err:
             raise HTTPException(status_code=403, detail=str(err))
-    else:
-        raise HTTPException(
-            status_code=403,
-            detail=f"{move_details.player_name} does not belong to this game, please choose a valid player",
-        )
+        return await _store(chess_game)
+
+    return ModelResponse(await _serialized(game_id, apply))
+
+
+@router.post("/games/{game_id}/moves")
+async def play_moves(game_id: int, move_batch: MoveBatch = Body(...)):
+    """
+    Endpoint to replay a sequence of moves (or PGN movetext) on a game in one request.
+    Moves alternate between both sides from the current position; they are all
+    validated before the game is persisted, once. Only games without seated players
+    (imports, analysis boards) accept batches: nobody could check that a batch is
+    played by the side to move of a seated game.
+    Args:
+        game_id (int): The ID of the game.
+        move_batch (MoveBatch): The moves in SAN/UCI, or a PGN.
+    Returns:
+        Game: The updated game.
+    Raises:
+        HTTPException: If the game is not found, has a seated player or is over (403),
+            or a move is invalid (the detail reports the first invalid ply).
+    """
+
+    async def apply() -> Game:
+        try:
+            game = await service.get_single_game(game_id=game_id)
+        except GameNotFoundError as err:
+            raise HTTPException(status_code=404, detail=str(err))
+        if game.white_player is not None or game.black_player is not None:
+            raise HTTPException(
+                status_code=403,
+                detail=f"Game {game_id} has seated players, who play their moves one at a time",
+            )
+
+        chess_game = sessions.get(game)
+        try:
+            chess_game.play_moves(move_batch.to_moves())
+        except InvalidPlyError as err:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "ply": err.ply,
+                    "move": err.move,
+                    "error": f"Invalid move: {err}",
+                },
+            )
+        except GameOverError as err:
+            raise HTTPException(status_code=403, detail=str(err))
+        return await _store(chess_game)
+
+    return ModelResponse(await _serialized(game_id, apply))
 
 
 @router.get("/games/move/{game_id}")
-def legal_move(game_id: int):
-    game = service.get_single_game(game_id=game_id)
-    chess_game = ChessGame(game=game)
+async def legal_move(game_id: int, tablebase: bool = False):
+    """
+    Endpoint to retrieve the legal moves of the current position of a game.
+    Args:
+        game_id (int): The ID of the game.
+        tablebase (bool): Return each move with the exact result it leads to (WDL and
+            DTZ, best move first) when the position is in the endgame tablebase.
+    Returns:
+        list: The legal moves in UCI notation, or TablebaseMove objects if `tablebase` is set.
+    Raises:
+        HTTPException: If the game is not found.
+    """
+    try:
+        game = await service.get_single_game(game_id=game_id)
+    except GameNotFoundError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+    chess_game = sessions.get(game)
+    if tablebase:
+        return ModelResponse(chess_game.get_tablebase_moves())
     return chess_game.get_legal_move()
+
+
+@router.get("/games/{game_id}/analysis", response_model=AnalysisResult)
+async def analyse_position(
+    game_id: int,
+    depth: Optional[int] = Query(None, ge=1),
+    time_limit: Optional[float] = Query(None, gt=0),
+):
+    """
+    Endpoint to search the best move of the current position of a game.
+    The search runs in a worker process, by iterative deepening until `depth` or
+    `time_limit` is reached, both capped by the server's budget. Positions found in
+    the endgame tablebase get their exact result instead, without a search.
+    Args:
+        game_id (int): The ID of the game.
+        depth (int, optional): Maximum depth of the search, in plies.
+        time_limit (float, optional): Maximum duration of the search, in seconds.
+    Returns:
+        AnalysisResult: The best move, its score and principal variation, and the
+            depth, nodes and nodes per second of the search.
+    Raises:
+        HTTPException: If the game is not found.
+    """
+    try:
+        game = await service.get_single_game(game_id=game_id)
+    except GameNotFoundError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+    chess_game = sessions.get(game)
+    tablebase_result = chess_game.probe_tablebase()
+    if tablebase_result is not None:
+        return ModelResponse(_tablebase_analysis(chess_game, tablebase_result))
+    return ModelResponse(
+        await analysis_pool.analyse(chess_game.board, depth, time_limit)
+    )
+
+
+def _tablebase_analysis(
+    chess_game: ChessGame, result: TablebaseResult
+) -> AnalysisResult:
+    analysis = AnalysisResult(fen=chess_game.get_board_fen(), tablebase=result)
+    if result.best_move is not None:
+        best_move = chess.Move.from_uci(result.best_move)
+        analysis.best_move = result.best_move
+        analysis.best_move_san = chess_game.board.san(best_move)
+        analysis.pv = [result.best_move]
+    return analysis
+
+
+@router.get("/games/{game_id}/book", response_model=List[BookMove])
+async def book_moves(game_id: int):
+    """
+    Endpoint to retrieve the opening book moves of the current position of a game.
+    Args:
+        game_id (int): The ID of the game.
+    Returns:
+        List[BookMove]: The book moves with their weights, empty when out of book.
+    Raises:
+        HTTPException: If the game is not found, or no opening book is configured.
+    """
+    if ChessGame.opening_book is None:
+        raise HTTPException(status_code=503, detail="No opening book configured")
+    try:
+        game = await service.get_single_game(game_id=game_id)
+    except GameNotFoundError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+    return ModelResponse(sessions.get(game).get_book_moves())
+
+
+async def _current_state(game_id: int) -> MoveEvent:
+    game = await service.get_single_game(game_id=game_id)
+    return _move_event(sessions.get(game))
+
+
+@router.websocket("/games/{game_id}/ws")
+async def watch_game_ws(websocket: WebSocket, game_id: int):
+    """
+    WebSocket subscription to the moves of a game.
+    The first message is the current state of the game, then one message (a
+    MoveEvent) is sent after each move. Messages sent by the client are ignored.
+    Args:
+        game_id (int): The ID of the game.
+    """
+    with hub.subscribe(game_id) as subscription:
+        try:
+            state = await _current_state(game_id)
+        except GameNotFoundError as err:
+            await websocket.close(code=1008, reason=str(err))
+            return
+        await websocket.accept()
+        await websocket.send_text(state.model_dump_json())
+
+        async def forward_events() -> None:
+            while True:
+                event = await subscription.get()
+                await websocket.send_text(event.model_dump_json())
+
+        forwarder = asyncio.create_task(forward_events())
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            forwarder.cancel()
+
+
+def _sse_message(event_type: str, event: MoveEvent) -> str:
+    return f"event: {event_type}\ndata: {event.model_dump_json()}\n\n"
+
+
+async def _sse_stream(game_id: int) -> AsyncIterator[str]:
+    # Subscribe before reading the state, so no move is missed in between.
+    with hub.subscribe(game_id) as subscription:
+        try:
+            yield _sse_message("state", await _current_state(game_id))
+        except GameNotFoundError:
+            return
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), timeout=SSE_KEEPALIVE_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse_message("move", event)
+
+
+@router.get("/games/{game_id}/events")
+async def watch_game_sse(game_id: int):
+    """
+    Server-Sent Events subscription to the moves of a game.
+    A `state` event carries the current state of the game, then a `move` event (a
+    MoveEvent) is sent after each move.
+    Args:
+        game_id (int): The ID of the game.
+    Raises:
+        HTTPException: If the game is not found.
+    """
+    try:
+        await service.get_single_game(game_id=game_id)
+    except GameNotFoundError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+    return StreamingResponse(
+        _sse_stream(game_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
@@ -0,0 +1,29 @@
+from api.game_locks import GameLocks
+from api.matchmaking import MatchmakingQueue
+from api.move_hub import MoveHub
+from chess_app.analysis_pool import AnalysisPool
+from chess_app.session_registry import GameSessionRegistry
+from services.leaderboard import Leaderboard
+from services.storage import build_storage_service
+
+# A single storage instance (and so a single connection pool) shared by every router,
+# Strapi or SQL depending on STORAGE_BACKEND.
+service = build_storage_service()
+
+# Live boards of the active games, shared by the routers handling moves.
+sessions = GameSessionRegistry.from_env()
+
+# Per-game locks ordering the moves played on a game within this worker.
+game_locks = GameLocks()
+
+# Subscribers of the moves played on each game, fed by the routers handling moves.
+hub = MoveHub.from_env()
+
+# Worker processes running the engine searches of the analysis endpoint.
+analysis_pool = AnalysisPool.from_env()
+
+# Players sorted by rating, fed by the rating updates of finished games.
+leaderboard = Leaderboard.from_env()
+
+# Players of this worker waiting for an opponent, by rating bucket.
+matchmaking = MatchmakingQueue.from_env()
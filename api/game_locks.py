@@ -0,0 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List
+
+
+class GameLocks:
+    """
+    One asyncio lock per game, serializing its read-modify-write cycles within a worker.
+
+    Requests on the same game queue up instead of racing each other to the storage,
+    where only one of them would pass the version check. Other workers are kept in
+    order by that check alone. A lock is dropped as soon as no request holds or waits
+    for it, so the registry only grows with the games being played at the same time.
+    """
+
+    def __init__(self) -> None:
+        # Per game: its lock, and the number of requests holding or waiting for it.
+        self._locks: Dict[int, List] = {}
+
+    @asynccontextmanager
+    async def hold(self, game_id: int) -> AsyncIterator[None]:
+        """
+        Hold the lock of a game for the duration of the `async with` block.
+
+        Args:
+            game_id (int): The ID of the game.
+        """
+        entry = self._locks.get(game_id)
+        if entry is None:
+            entry = self._locks[game_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[game_id]
+
+    def __len__(self) -> int:
+        return len(self._locks)
@@ -0,0 +1,107 @@
+from typing import Any, AsyncIterator, Iterable, Optional
+
+from fastapi import HTTPException, Query
+
+from schemas.game import Game
+from schemas.player import PlayerRef
+from services.storage import StorageService
+
+GAME_FIELDS = frozenset(Game.model_fields)
+PLAYER_FIELDS = ("white_player", "black_player", "turn", "winner")
+
+
+def _parse_field_list(
+    value: Optional[str], allowed: Iterable[str], parameter: str
+) -> Optional[set]:
+    """Split a comma-separated query parameter, rejecting unknown names with a 400."""
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {parameter}: {', '.join(sorted(unknown))}",
+        )
+    return names
+
+
+class GameView:
+    """
+    Shape of the games returned by an endpoint, from the `fields` and `expand` query parameters.
+
+    By default games are returned as stored, with their players referenced by ID and
+    name. `expand` replaces the listed references with the full players, and `fields`
+    restricts the payload to the listed fields (the game ID is always included).
+    """
+
+    def __init__(
+        self,
+        fields: Optional[str] = Query(
+            None, description="Comma-separated game fields to return, e.g. `fen,turn`."
+        ),
+        expand: Optional[str] = Query(
+            None,
+            description="Comma-separated player fields to inline, e.g. `white_player,black_player`.",
+        ),
+    ) -> None:
+        self.fields = _parse_field_list(fields, GAME_FIELDS, "fields")
+        if self.fields is not None:
+            self.fields.add("game_id")
+        self.expand = _parse_field_list(expand, PLAYER_FIELDS, "expand") or set()
+        if self.fields is not None:
+            self.expand.intersection_update(self.fields)
+
+    @property
+    def is_default(self) -> bool:
+        """Whether games are returned as stored."""
+        return self.fields is None and not self.expand
+
+    async def render(
+        self, games: list[Game], storage: StorageService
+    ) -> list[dict[str, Any]]:
+        """
+        Serialize games, looking up the expanded players once for the whole list.
+
+        Args:
+            games (list[Game]): The games to serialize.
+            storage (StorageService): The storage the expanded players are read from.
+
+        Returns:
+            list[dict]: The games, with `Player` models for the expanded references.
+        """
+        players = {}
+        if self.expand:
+            players = await storage.get_players_by_name(
+                (
+                    name
+                    for game in games
+                    for name in self._referenced_names(game).values()
+                ),
+                missing_ok=True,
+            )
+        return [self._render_game(game, players) for game in games]
+
+    async def render_stream(
+        self, games: AsyncIterator[Game], storage: StorageService
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Serialize games one at a time, as they are read from the storage."""
+        async for game in games:
+            yield (await self.render([game], storage))[0]
+
+    def _referenced_names(self, game: Game) -> dict[str, str]:
+        """Names of the players referenced by the expanded fields of a game."""
+        names = {}
+        for field in self.expand:
+            reference = getattr(game, field)
+            if isinstance(reference, PlayerRef):
+                names[field] = reference.name
+        return names
+
+    def _render_game(self, game: Game, players: dict) -> dict[str, Any]:
+        payload = game.model_dump(include=self.fields)
+        for field, name in self._referenced_names(game).items():
+            player = players.get(name)
+            if player is not None:
+                payload[field] = player
+        return payload
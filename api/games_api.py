@@ -1,30 +1,126 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import os
+from typing import Optional
 
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+
+from api.dependencies import service as chess_api_manager
+from api.dependencies import game_locks, matchmaking, sessions
+from api.game_view import GameView
+from api.responses import ModelResponse
+from api.streaming import ndjson_response
 from custom_errors.custom_errors import (
     GameIsFullError,
     GameNotFoundError,
     PlayerAlreadyInGameError,
     PlayernotFoundError,
+    StaleGameError,
 )
+from metrics.metrics import MATCHMAKING_WAIT
 from schemas.game import Game
-from services.strapi_service import StrapiApiService
+from schemas.pairing import Pairing
+from schemas.player import Player
 
 router = APIRouter()
-chess_api_manager = StrapiApiService()
+
+# Longest time, in seconds, a player waits in the matchmaking queue per request.
+MATCHMAKING_TIMEOUT = float(os.getenv("MATCHMAKING_TIMEOUT", 30.0))
 
 
 @router.post("/games/", response_model=Game)
-def new_game():
+async def new_game():
     """
     Endpoint to create a new game.
     Returns:
         Game: The newly created game instance.
     """
-    return chess_api_manager.post_games(Game())
+    return ModelResponse(await chess_api_manager.post_games(Game()))
+
+
+@router.post("/games/bulk", response_model=list[Game])
+async def new_paired_games(pairings: list[Pairing] = Body(..., min_length=1)):
+    """
+    Endpoint to create the games of a round from a list of pairings.
+    Args:
+        pairings (list[Pairing]): The white and black player names of each game.
+    Returns:
+        list[Game]: The created games, seated and active, in the order of the pairings.
+    Raises:
+        HTTPException: If a player is not found.
+    """
+    try:
+        return ModelResponse(await chess_api_manager.create_paired_games(pairings))
+    except PlayernotFoundError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+
+
+@router.post("/matchmaking/{player_name}", response_model=Game)
+async def find_opponent(
+    player_name: str,
+    timeout: float = Query(MATCHMAKING_TIMEOUT, gt=0, le=MATCHMAKING_TIMEOUT),
+):
+    """
+    Endpoint to pair a player with an opponent of a close rating, in a new game.
+    The player is paired at once with a waiting player of its rating bucket (or of
+    the nearest one), who plays white; otherwise the request waits in the queue.
+    Args:
+        player_name (str): The name of the player looking for an opponent.
+        timeout (float): Seconds to wait for an opponent.
+    Returns:
+        Game: The created game, seated and active, or no content (204) if no
+            opponent was found in time.
+    Raises:
+        HTTPException: If the player is not found, or is already waiting (409).
+    """
+    try:
+        player = await chess_api_manager.get_single_player(player_name)
+    except PlayernotFoundError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+    if player.name in matchmaking:
+        raise HTTPException(
+            status_code=409, detail=f"{player.name} is already waiting for an opponent"
+        )
+
+    opponent = matchmaking.pop_opponent(player)
+    if opponent is None:
+        return await _wait_for_opponent(player, timeout)
+
+    try:
+        games = await chess_api_manager.create_paired_games(
+            [Pairing(white=opponent.player.name, black=player.name)]
+        )
+    except Exception as err:
+        opponent.game.set_exception(err)
+        raise
+    opponent.game.set_result(games[0])
+    MATCHMAKING_WAIT.observe(0.0, outcome="matched")
+    return ModelResponse(games[0])
+
+
+async def _wait_for_opponent(player: Player, timeout: float):
+    """Queue a player until an opponent creates their game, or `timeout` seconds pass."""
+    ticket = matchmaking.enqueue(player)
+    try:
+        # Shielded: a game being created for the ticket is awaited past the timeout.
+        game = await asyncio.wait_for(asyncio.shield(ticket.game), timeout)
+    except asyncio.TimeoutError:
+        if matchmaking.discard(ticket):
+            MATCHMAKING_WAIT.observe(
+                matchmaking.clock() - ticket.enqueued_at, outcome="timeout"
+            )
+            return Response(status_code=204)
+        game = await ticket.game
+    finally:
+        # The client went away, or the game could not be created.
+        matchmaking.discard(ticket)
+    MATCHMAKING_WAIT.observe(
+        matchmaking.clock() - ticket.enqueued_at, outcome="matched"
+    )
+    return ModelResponse(game)
 
 
 @router.patch("/games/{game_id}/{player_name}", response_model=Game)
-def join_game(game_id: int, player_name: str):
+async def join_game(game_id: int, player_name: str):
     """
     Endpoint to allow a player to join a game.
     Args:
@@ -33,10 +129,16 @@ def join_game(game_id: int, player_name: str):
     Returns:
         Game: The updated game instance after adding the player.
     Raises:
-        HTTPException: If the game is full or if the game is not found.
+        HTTPException: If the game is full, if the game is not found, or if it was
+            updated concurrently (409).
     """
     try:
-        return chess_api_manager.add_player_to_game(player_name.capitalize(), game_id)
+        async with game_locks.hold(game_id):
+            return ModelResponse(
+                await chess_api_manager.add_player_to_game(player_name, game_id)
+            )
+    except StaleGameError as err:
+        raise HTTPException(status_code=409, detail=str(err))
     except GameNotFoundError as err:
         raise HTTPException(status_code=404, detail=str(err))
     except GameIsFullError as err:
@@ -48,43 +150,64 @@ def join_game(game_id: int, player_name: str):
 
 
 @router.get("/games/", response_model=list[Game])
-def list_games():
+async def list_games(
+    page: Optional[int] = Query(None, ge=1),
+    page_size: int = Query(chess_api_manager.PAGE_SIZE, ge=1, le=100),
+    stream: bool = False,
+    view: GameView = Depends(),
+):
     """
     Endpoint to retrieve a list of all games.
-    if a player name is specified, retrives all the games with the specified player.
-
+    Args:
+        page (int, optional): Only return this page of games, all games are returned if omitted.
+        page_size (int): The number of games per page.
+        stream (bool): Stream the games as NDJSON (one game per line), starting at `page`.
+        view (GameView): The `fields` to return and the players to `expand`.
     Returns:
-        list[Game]: A list of all game instances. or with a specified name
+        list[Game]: A list of all game instances, or of the requested page.
     Raises:
         HTTPException: If no games are found.
     """
-
+    if stream:
+        games = chess_api_manager.iter_games(page_size, start_page=page or 1)
+        if not view.is_default:
+            games = view.render_stream(games, chess_api_manager)
+        return ndjson_response(games)
     try:
-        return chess_api_manager.get_games()
+        games = await chess_api_manager.get_games(page=page, page_size=page_size)
     except GameNotFoundError as err:
         raise HTTPException(status_code=404, detail=str(err))
+    if view.is_default:
+        return ModelResponse(games)
+    return ModelResponse(await view.render(games, chess_api_manager))
 
 
 @router.get("/games/{game_id}", response_model=Game)
-def retrieve_game(game_id: int):
+async def retrieve_game(game_id: int, view: GameView = Depends()):
     """
     Endpoint to retrieve a single game by its UUID.
     Args:
         game_uuid (int): The UUID of the game to retrieve.
+        view (GameView): The `fields` to return and the players to `expand`.
     Returns:
         Game: The game instance with the specified UUID.
     Raises:
         HTTPException: If no game with the specified UUID is found.
     """
     try:
-        return chess_api_manager.get_single_game(game_id)
+        game = await chess_api_manager.get_single_game(game_id)
     except GameNotFoundError as err:
         raise HTTPException(status_code=404, detail=str(err))
+    if view.is_default:
+        return ModelResponse(game)
+    return ModelResponse((await view.render([game], chess_api_manager))[0])
 
 
 @router.delete("/games/{game_id}")
-def delete_game(game_id: int):
+async def delete_game(game_id: int):
     try:
-        return chess_api_manager.delete_game(game_id)
+        return await chess_api_manager.delete_game(game_id)
     except GameNotFoundError as err:
         raise HTTPException(status_code=404, detail=str(err))
+    finally:
+        sessions.discard(game_id)
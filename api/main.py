@@ -1,9 +1,24 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from api import chess_engine_api, games_api, players_api
+from api import chess_engine_api, games_api, metrics_api, players_api
+from api.dependencies import analysis_pool, service
+from api.metrics_api import MetricsMiddleware
+from api.responses import ModelResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await service.aclose()
+    analysis_pool.shutdown()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ModelResponse)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(players_api.router)
 app.include_router(games_api.router)
 app.include_router(chess_engine_api.router)
+app.include_router(metrics_api.router)
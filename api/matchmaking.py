@@ -0,0 +1,120 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from schemas.game import Game
+from schemas.player import Player, normalize_player_name
+
+
+class Ticket:
+    """A player waiting for an opponent, and the game it will be seated in."""
+
+    def __init__(self, player: Player, bucket: int, enqueued_at: float) -> None:
+        self.player = player
+        self.bucket = bucket
+        self.enqueued_at = enqueued_at
+        self.game: "asyncio.Future[Game]" = asyncio.get_running_loop().create_future()
+
+
+class MatchmakingQueue:
+    """
+    Players of this worker waiting for an opponent, indexed by rating bucket.
+
+    A bucket holds the players whose rating falls in the same `bucket_width` points,
+    oldest first. A new player is paired with the oldest player of its own bucket,
+    or else of the nearest bucket at most `max_spread` buckets away, so finding an
+    opponent looks at a bounded number of buckets whatever the length of the queue.
+    """
+
+    def __init__(
+        self,
+        bucket_width: int = 100,
+        max_spread: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize an empty queue.
+
+        Args:
+            bucket_width (int): Rating points covered by a bucket.
+            max_spread (int): Farthest bucket, in buckets, an opponent may be taken from.
+            clock (Callable): Monotonic time source, injectable for tests.
+        """
+        self.bucket_width = bucket_width
+        self.max_spread = max_spread
+        self.clock = clock
+        self._buckets: Dict[int, "OrderedDict[str, Ticket]"] = {}
+        self._tickets: Dict[str, Ticket] = {}
+
+    @classmethod
+    def from_env(cls) -> "MatchmakingQueue":
+        """Build a queue sized by `MATCHMAKING_BUCKET_WIDTH` and `MATCHMAKING_MAX_SPREAD`."""
+        return cls(
+            bucket_width=int(os.getenv("MATCHMAKING_BUCKET_WIDTH", 100)),
+            max_spread=int(os.getenv("MATCHMAKING_MAX_SPREAD", 2)),
+        )
+
+    def enqueue(self, player: Player) -> Ticket:
+        """
+        Add a player to the queue of its rating bucket.
+
+        Args:
+            player (Player): The player, who must not be waiting already.
+
+        Returns:
+            Ticket: The ticket whose `game` is set once an opponent is found.
+        """
+        ticket = Ticket(player, player.rank // self.bucket_width, self.clock())
+        name = normalize_player_name(player.name)
+        self._buckets.setdefault(ticket.bucket, OrderedDict())[name] = ticket
+        self._tickets[name] = ticket
+        return ticket
+
+    def pop_opponent(self, player: Player) -> Optional[Ticket]:
+        """
+        Take the opponent of a player out of the queue.
+
+        Args:
+            player (Player): The player looking for an opponent, who must not be waiting.
+
+        Returns:
+            Ticket or None: The ticket of the player waiting the longest in the nearest
+                non-empty bucket, or None if no bucket within `max_spread` has a player.
+        """
+        bucket = player.rank // self.bucket_width
+        for spread in range(self.max_spread + 1):
+            waiting = [
+                next(iter(self._buckets[candidate].values()))
+                for candidate in {bucket - spread, bucket + spread}
+                if candidate in self._buckets
+            ]
+            if waiting:
+                ticket = min(waiting, key=lambda ticket: ticket.enqueued_at)
+                self.discard(ticket)
+                return ticket
+        return None
+
+    def discard(self, ticket: Ticket) -> bool:
+        """
+        Take a ticket out of the queue, e.g. when its player stops waiting.
+
+        Returns:
+            bool: Whether the ticket was still waiting, False once it was paired.
+        """
+        name = normalize_player_name(ticket.player.name)
+        if self._tickets.get(name) is not ticket:
+            return False
+        del self._tickets[name]
+        bucket = self._buckets[ticket.bucket]
+        del bucket[name]
+        if not bucket:
+            del self._buckets[ticket.bucket]
+        return True
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_player_name(name) in self._tickets
+
+    def __len__(self) -> int:
+        return len(self._tickets)
@@ -0,0 +1,96 @@
+import time
+from typing import Iterable, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.dependencies import matchmaking, service, sessions
+from chess_app.chess_engine import ChessGame
+from metrics.metrics import REQUEST_LATENCY, CounterFunction, GaugeFunction, registry
+
+router = APIRouter()
+
+# Version of the Prometheus text format served by `GET /metrics`.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware observing the duration of each HTTP request.
+
+    Requests are labelled by the template of their route (`/games/{game_id}`) rather
+    than their path, so that each endpoint has a single series. WebSocket connections
+    are not measured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope shared with the middlewares.
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "<unmatched>"),
+                status=str(status),
+            )
+
+
+def _cache_requests() -> Iterable[Tuple[Tuple[str, str], float]]:
+    legal_moves = ChessGame.legal_move_cache.stats()
+    yield ("legal_moves", "hit"), legal_moves["hits"]
+    yield ("legal_moves", "miss"), legal_moves["misses"]
+    yield ("game_sessions", "hit"), sessions.warm_hits
+    yield ("game_sessions", "miss"), sessions.rehydrations
+    for name in ("game_cache", "player_index"):
+        # Counters only: `stats()` also sizes the backend, which may query SQLite.
+        cache = getattr(service, name, None)
+        if cache is not None:
+            yield (name, "hit"), cache.hits
+            yield (name, "miss"), cache.misses
+
+
+registry.register(
+    CounterFunction(
+        "cache_requests_total",
+        "Lookups of the caches made by this process, by cache and result (hit or miss).",
+        ("cache", "result"),
+        _cache_requests,
+    )
+)
+registry.register(
+    GaugeFunction(
+        "matchmaking_queue_size",
+        "Players of this worker waiting for an opponent.",
+        (),
+        lambda: [((), len(matchmaking))],
+    )
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Endpoint exposing the metrics of the process to Prometheus.
+    Returns:
+        PlainTextResponse: The metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
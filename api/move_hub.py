@@ -0,0 +1,108 @@
+import asyncio
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, Set
+
+from schemas.move_event import MoveEvent
+
+
+class Subscription:
+    """Bounded queue of the events of one game, for one subscriber."""
+
+    def __init__(self, game_id: int, maxsize: int) -> None:
+        self.game_id = game_id
+        self.dropped = 0
+        self._queue: "asyncio.Queue[MoveEvent]" = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, event: MoveEvent) -> None:
+        """
+        Queue an event without waiting, dropping the oldest one if the subscriber lags behind.
+
+        Each event carries the full position, so a subscriber catching up only needs
+        the latest ones.
+        """
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def get(self) -> MoveEvent:
+        """Wait for the next event."""
+        return await self._queue.get()
+
+
+class MoveHub:
+    """
+    In-process publish/subscribe of the moves played on each game.
+
+    `make_a_move` publishes the new state of the game once it is stored, and every
+    WebSocket or SSE subscriber of that game receives it, so clients no longer poll
+    the game or its legal moves. Subscribers only see the moves handled by this
+    process.
+    """
+
+    def __init__(self, queue_size: int = 16) -> None:
+        """
+        Initialize the hub.
+
+        Args:
+            queue_size (int): Maximum number of events buffered per subscriber.
+        """
+        self.queue_size = queue_size
+        self.published = 0
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+
+    @classmethod
+    def from_env(cls) -> "MoveHub":
+        """Build a hub whose subscriber queues are sized by `MOVE_HUB_QUEUE_SIZE`."""
+        return cls(queue_size=int(os.getenv("MOVE_HUB_QUEUE_SIZE", 16)))
+
+    @contextmanager
+    def subscribe(self, game_id: int) -> Iterator[Subscription]:
+        """
+        Subscribe to the events of a game for the duration of the `with` block.
+
+        Args:
+            game_id (int): The ID of the game.
+
+        Yields:
+            Subscription: The queue the events of the game are delivered to.
+        """
+        subscription = Subscription(game_id, self.queue_size)
+        self._subscriptions.setdefault(game_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self._subscriptions.get(game_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[game_id]
+
+    def has_subscribers(self, game_id: int) -> bool:
+        """Whether anyone listens to a game, so events are only built when needed."""
+        return game_id in self._subscriptions
+
+    def publish(self, event: MoveEvent) -> int:
+        """
+        Deliver an event to the subscribers of its game, without waiting for them.
+
+        Args:
+            event (MoveEvent): The new state of the game.
+
+        Returns:
+            int: The number of subscribers the event was delivered to.
+        """
+        subscriptions = self._subscriptions.get(event.game_id, ())
+        for subscription in subscriptions:
+            subscription.put(event)
+        self.published += 1
+        return len(subscriptions)
+
+    def stats(self) -> dict:
+        """Number of subscribed games and subscribers, and of published events."""
+        return {
+            "games": len(self._subscriptions),
+            "subscribers": sum(map(len, self._subscriptions.values())),
+            "published": self.published,
+        }
@@ -1,23 +1,25 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
+from api.dependencies import leaderboard, service
+from api.responses import ModelResponse
+from api.streaming import ndjson_response
 from custom_errors.custom_errors import NameAlreadyExistsError, PlayernotFoundError
+from schemas.leaderboard import LeaderboardEntry
 from schemas.player import Player
-from services.strapi_service import StrapiApiService
+from services.leaderboard import Leaderboard
 
 router = APIRouter()
 
-service = StrapiApiService()
-
 
 @router.get("/")
-def home_page():
+async def home_page():
     return {"message": "Chess API"}
 
 
 @router.post("/players/{name}", response_model=Player)
-def new_player(name: str) -> Player:
+async def new_player(name: str):
     """
     Endpoint to create a new player.
     Args:
@@ -28,28 +30,41 @@ def new_player(name: str) -> Player:
         HTTPException: If a player with the same name already exists.
     """
     try:
-        return service.post_players(Player(name=name.capitalize()))
+        player = await service.post_players(Player(name=name))
     except NameAlreadyExistsError as err:
         raise HTTPException(status_code=403, detail=str(err))
+    leaderboard.put(player)
+    return ModelResponse(player)
 
 
 @router.get("/players/", response_model=List[Player])
-def list_players() -> List[Player]:
+async def list_players(
+    page: Optional[int] = Query(None, ge=1),
+    page_size: int = Query(service.PAGE_SIZE, ge=1, le=100),
+    stream: bool = False,
+):
     """
     Endpoint to retrieve a list of all players.
+    Args:
+        page (int, optional): Only return this page of players, all players are returned if omitted.
+        page_size (int): The number of players per page.
+        stream (bool): Stream the players as NDJSON (one player per line), starting at `page`.
     Returns:
-        List[Player]: A list of all player instances.
+        List[Player]: A list of all player instances, or of the requested page.
     Raises:
         HTTPException: If no players are found.
     """
+    if stream:
+        return ndjson_response(service.iter_players(page_size, start_page=page or 1))
     try:
-        return service.get_players()
+        players = await service.get_players(page=page, page_size=page_size)
     except PlayernotFoundError as err:
         raise HTTPException(status_code=404, detail=str(err))
+    return ModelResponse(players)
 
 
 @router.get("/players/{name}", response_model=Player)
-def retrieve_player(name: str) -> Player:
+async def retrieve_player(name: str):
     """
     Endpoint to retrieve a single player by name.
     Args:
@@ -60,14 +75,57 @@ def retrieve_player(name: str) -> Player:
         HTTPException: If no player with the specified name is found.
     """
     try:
-        return service.get_single_player(name=name.capitalize())
+        return ModelResponse(await service.get_single_player(name=name))
     except PlayernotFoundError as err:
         raise HTTPException(status_code=404, detail=str(err))
 
 
 @router.delete("/players/{name}")
-def delete_player(name: str):
+async def delete_player(name: str):
     try:
-        return service.delete_player(name=name)
+        await service.delete_player(name=name)
     except PlayernotFoundError as err:
         raise HTTPException(status_code=404, detail=str(err))
+    leaderboard.remove(name)
+
+
+async def _loaded_leaderboard() -> Leaderboard:
+    """Reload the leaderboard from the storage if it is stale, then return it."""
+    if leaderboard.is_stale():
+        leaderboard.load([player async for player in service.iter_players()])
+    return leaderboard
+
+
+@router.get("/leaderboard", response_model=List[LeaderboardEntry])
+async def get_leaderboard(
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Endpoint to retrieve the best rated players.
+    Args:
+        limit (int): The number of players to return.
+        offset (int): The number of better rated players to skip.
+    Returns:
+        List[LeaderboardEntry]: The players with their rank and rating, best first.
+    """
+    board = await _loaded_leaderboard()
+    return ModelResponse(board.top(limit, offset))
+
+
+@router.get("/leaderboard/{name}", response_model=LeaderboardEntry)
+async def get_player_rank(name: str):
+    """
+    Endpoint to retrieve the rank and rating of a player.
+    Args:
+        name (str): The name of the player.
+    Returns:
+        LeaderboardEntry: The player's rank and rating.
+    Raises:
+        HTTPException: If no player with the specified name is found.
+    """
+    board = await _loaded_leaderboard()
+    entry = board.rank_of(name)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Player {name} not found")
+    return ModelResponse(entry)
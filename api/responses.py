@@ -0,0 +1,19 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from services.serialization import to_json
+
+
+class ModelResponse(JSONResponse):
+    """
+    JSON response rendering pydantic models, and containers of them, in a single pass.
+
+    Endpoints return it directly so their result is not validated again against
+    the `response_model`, which is then only used to document the endpoint. It is
+    also the application's default response class, so plain values returned by the
+    other endpoints use the same encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
@@ -0,0 +1,33 @@
+from typing import Any, AsyncIterator, Union
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from services.serialization import to_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _ndjson_lines(
+    models: AsyncIterator[Union[BaseModel, dict[str, Any]]]
+) -> AsyncIterator[bytes]:
+    async for model in models:
+        yield to_json(model) + b"\n"
+
+
+def ndjson_response(
+    models: AsyncIterator[Union[BaseModel, dict[str, Any]]]
+) -> StreamingResponse:
+    """
+    Stream models as newline-delimited JSON, one object per line.
+
+    Models are serialized as they are produced, so memory stays flat and the first
+    line is sent as soon as the first storage page arrives.
+
+    Args:
+        models (AsyncIterator): The models, or JSON-ready dicts, to stream.
+
+    Returns:
+        StreamingResponse: A chunked `application/x-ndjson` response.
+    """
+    return StreamingResponse(_ndjson_lines(models), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,271 @@
+"""
+Move generation and game-state benchmarks of ChessGame, checked against stored baselines.
+
+Covers perft on the standard test positions (whose node counts are verified, so the
+suite also guards move generation), ChessGame construction from a FEN and from a move
+log, `move`, `get_legal_move`, `is_game_over`/`determine_winner`, `evaluate_outcome`
+and pydantic round-trips of `Game`.
+
+Each case is timed as the median of several runs, which one run slowed down by the
+machine does not move, and compared to the baseline saved in
+`benchmarks/baselines/bench_engine.json`: the run fails (exit status 1) when a case
+is slower than its baseline by more than the threshold, 20% by default. On a shared
+machine, whose speed can drift by up to 1.8x between two runs (all the cases alike),
+pass a looser one, e.g. `--threshold 1.0`. Baselines depend on the machine, save
+them again (`--save`) before comparing on another one.
+
+Run with: python -m benchmarks.bench_engine [--threshold 0.2] [--save] [--cases perft]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import chess
+
+from chess_app.chess_engine import ChessGame, evaluate_outcome
+from schemas.game import Game
+from schemas.player import Player
+
+BASELINES_PATH = os.path.join(
+    os.path.dirname(__file__), "baselines", "bench_engine.json"
+)
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+ENDGAME = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+PROMOTIONS = "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"
+CHECKMATE = "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"
+
+# Position, depth and the number of leaf nodes it must reach.
+PERFT_POSITIONS = {
+    "start": (chess.STARTING_FEN, 3, 8_902),
+    "kiwipete": (KIWIPETE, 2, 2_039),
+    "endgame": (ENDGAME, 4, 43_238),
+    "promotions": (PROMOTIONS, 2, 1_486),
+}
+
+# A Ruy Lopez, Closed: 30 plies replayed from the move log when the game is loaded.
+OPENING = (
+    "e4 e5 Nf3 Nc6 Bb5 a6 Ba4 Nf6 O-O Be7 Re1 b5 Bb3 d6 c3 O-O "
+    "h3 Nb8 d4 Nbd7 c4 c6 cxb5 axb5 Nc3 Bb7 Bg5 b4 Nb1 h6"
+).split()
+
+
+class Case(NamedTuple):
+    name: str
+    call: Callable[[], object]
+    # Calls per timed run, so that a run lasts long enough to be measured.
+    iterations: int
+
+
+def perft(board: chess.Board, depth: int) -> int:
+    """Number of leaf nodes of the legal move tree of `depth` plies."""
+    if depth == 1:
+        return board.legal_moves.count()
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+
+def new_game(**fields) -> Game:
+    white, black = Player(name="White", player_id=1), Player(name="Black", player_id=2)
+    return Game(
+        game_id=1,
+        is_active=True,
+        white_player=white,
+        black_player=black,
+        turn=white,
+        **fields,
+    )
+
+
+def perft_case(name: str, fen: str, depth: int, expected: int) -> Case:
+    chess_game = ChessGame(game=new_game(fen=fen))
+
+    def run() -> int:
+        nodes = perft(chess_game.board, depth)
+        if nodes != expected:
+            raise AssertionError(
+                f"perft {name} depth {depth}: {nodes} nodes, expected {expected}"
+            )
+        return nodes
+
+    return Case(f"perft {name} d{depth}", run, 1)
+
+
+def build_cases() -> List[Case]:
+    cases = [
+        perft_case(name, fen, depth, expected)
+        for name, (fen, depth, expected) in PERFT_POSITIONS.items()
+    ]
+
+    played = ChessGame(game=new_game())
+    played.play_moves(OPENING)
+    stored = played.game.model_copy()
+    stored_json = stored.model_dump_json()
+    white = Player(name="White", player_id=1)
+    black = Player(name="Black", player_id=2)
+
+    def play_four_plies() -> Game:
+        chess_game = ChessGame(game=new_game())
+        for move, player in zip(
+            ("e4", "e5", "Nf3", "Nc6"), (white, black, white, black)
+        ):
+            chess_game.move(move, player)
+        return chess_game.game
+
+    middlegame = ChessGame(game=stored.model_copy())
+    mated = ChessGame(game=new_game(fen=CHECKMATE))
+
+    def game_over_and_winner(chess_game: ChessGame) -> Callable[[], object]:
+        def run() -> object:
+            return chess_game.is_game_over() and chess_game.determine_winner()
+
+        return run
+
+    middlegame.get_legal_move()
+    cases += [
+        Case(
+            "ChessGame from FEN", lambda: ChessGame(game=new_game(fen=KIWIPETE)), 2_000
+        ),
+        Case(
+            f"ChessGame from {len(OPENING)}-ply log",
+            lambda: ChessGame(game=stored.model_copy()),
+            500,
+        ),
+        Case("move x4 from start", play_four_plies, 500),
+        Case("get_legal_move, cached", middlegame.get_legal_move, 20_000),
+        Case("legal move generation", middlegame._generate_legal_moves, 2_000),
+        # Cached by the ChessGame until the next ply.
+        Case("game over, middlegame", game_over_and_winner(middlegame), 2_000),
+        Case("game over + winner, mate", game_over_and_winner(mated), 2_000),
+        # Uncached, as evaluated once for each ply played.
+        Case("outcome, middlegame", lambda: evaluate_outcome(middlegame.board), 2_000),
+        Case("outcome, mate", lambda: evaluate_outcome(mated.board), 2_000),
+        Case(
+            "Game dump/validate",
+            lambda: Game.model_validate(stored.model_dump()),
+            5_000,
+        ),
+        Case(
+            "Game JSON round-trip", lambda: Game.model_validate_json(stored_json), 5_000
+        ),
+    ]
+    return cases
+
+
+def measure(cases: List[Case], repeat: int) -> Dict[str, float]:
+    """
+    Median over `repeat` runs of the mean duration of a call of each case.
+
+    Runs are interleaved across the cases, so that a slow stretch of the machine
+    affects one run of every case rather than all the runs of one case.
+
+    Args:
+        cases (List[Case]): The cases to time.
+        repeat (int): Timed runs per case.
+
+    Returns:
+        Dict[str, float]: The median duration of each case, in microseconds.
+    """
+    runs: Dict[str, List[float]] = {case.name: [] for case in cases}
+    for case in cases:
+        case.call()
+    for _ in range(repeat):
+        for case in cases:
+            start = time.perf_counter()
+            for _ in range(case.iterations):
+                case.call()
+            runs[case.name].append((time.perf_counter() - start) / case.iterations)
+    return {name: statistics.median(times) * 1e6 for name, times in runs.items()}
+
+
+def load_baselines(path: str) -> Dict[str, float]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as baselines:
+        return json.load(baselines)
+
+
+def save_baselines(path: str, results: Dict[str, float]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as baselines:
+        json.dump(
+            {name: round(us, 2) for name, us in results.items()}, baselines, indent=2
+        )
+        baselines.write("\n")
+
+
+def report(
+    results: Dict[str, float], baselines: Dict[str, float], threshold: float
+) -> List[str]:
+    """
+    Print each case against its baseline.
+
+    Args:
+        results (Dict[str, float]): Measured durations, in microseconds.
+        baselines (Dict[str, float]): Baseline durations, in microseconds.
+        threshold (float): Slowdown allowed over the baseline, 0.2 for 20%.
+
+    Returns:
+        List[str]: The names of the cases slower than their baseline by more than `threshold`.
+    """
+    regressions = []
+    for name, us in results.items():
+        baseline: Optional[float] = baselines.get(name)
+        if baseline is None:
+            print(f"{name:<32} {us:11.1f} us  (no baseline)")
+            continue
+        change = us / baseline - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<32} {us:11.1f} us  baseline {baseline:11.1f} us  {change:+7.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--repeat", type=int, default=15, help="timed runs per case, the median is kept"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 for 20%%"
+    )
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baselines"
+    )
+    parser.add_argument(
+        "--cases", help="only run the cases whose name contains this text"
+    )
+    args = parser.parse_args()
+
+    cases = [
+        case for case in build_cases() if not args.cases or args.cases in case.name
+    ]
+    results = measure(cases, args.repeat)
+    baselines = load_baselines(args.baselines)
+    regressions = report(results, baselines, args.threshold)
+
+    if args.save:
+        save_baselines(args.baselines, {**baselines, **results})
+        print(f"baselines saved to {args.baselines}")
+    elif regressions:
+        print(
+            f"{len(regressions)} case(s) slower than their baseline by more than {args.threshold:.0%}"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
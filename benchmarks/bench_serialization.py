@@ -0,0 +1,142 @@
+"""
+Serialization cost of Strapi payloads and API responses, before and after the single-pass path.
+
+Strapi payloads were built with `json.dumps({"data": json.loads(model.model_dump_json())})`
+and are now built by `strapi_payload`. Responses went through FastAPI's validation
+against the `response_model` and `JSONResponse`; they are now rendered by `ModelResponse`.
+Both are measured over a page of games and over players with friends and active games.
+
+Run with: python -m benchmarks.bench_serialization --iterations 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from api.responses import ModelResponse
+from schemas.game import Game
+from schemas.player import Player
+from services.serialization import strapi_payload
+
+
+def build_players(count: int) -> List[Player]:
+    friends = [
+        Player(name=f"Friend{index}", player_id=1000 + index) for index in range(10)
+    ]
+    return [
+        Player(
+            name=f"Player{index}",
+            player_id=index,
+            rank=1200 + index,
+            friends=friends,
+            active_games=list(range(index, index + 50)),
+        )
+        for index in range(count)
+    ]
+
+
+def build_games(players: List[Player]) -> List[Game]:
+    return [
+        Game(
+            game_id=index,
+            is_active=True,
+            white_player=white,
+            black_player=black,
+            turn=white,
+            fen="r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3",
+            move_log="Bww9pAYVD6Q=",
+        )
+        for index, (white, black) in enumerate(zip(players[::2], players[1::2]))
+    ]
+
+
+def legacy_strapi_payload(model: Any) -> str:
+    return json.dumps({"data": json.loads(model.model_dump_json())})
+
+
+def legacy_response(response_type: Any) -> Callable[[Any], bytes]:
+    """FastAPI's former rendering: validation against the response model, then `JSONResponse`."""
+    # FastAPI builds the response field once per route, outside of the request path.
+    field = create_response_field(name="response", type_=response_type)
+    loop = asyncio.new_event_loop()
+
+    def render(content: Any) -> bytes:
+        validated = loop.run_until_complete(
+            serialize_response(field=field, response_content=content)
+        )
+        return JSONResponse(validated).body
+
+    return render
+
+
+def measure(call: Callable[[], Any], iterations: int) -> float:
+    """Mean duration of a call, in microseconds."""
+    call()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def compare(
+    label: str, before: Callable[[], Any], after: Callable[[], Any], iterations: int
+) -> None:
+    before_us = measure(before, iterations)
+    after_us = measure(after, iterations)
+    print(
+        f"{label:<28} before {before_us:9.1f} us  after {after_us:9.1f} us  "
+        f"speedup x{before_us / after_us:.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    players = build_players(100)
+    games = build_games(players)
+    game, player = games[0], players[0]
+    render_game = legacy_response(Game)
+    render_games = legacy_response(List[Game])
+    render_players = legacy_response(List[Player])
+
+    compare(
+        "strapi payload, game",
+        lambda: legacy_strapi_payload(game),
+        lambda: strapi_payload(game),
+        args.iterations,
+    )
+    compare(
+        "strapi payload, player",
+        lambda: legacy_strapi_payload(player),
+        lambda: strapi_payload(player),
+        args.iterations,
+    )
+    compare(
+        "response, game",
+        lambda: render_game(game),
+        lambda: ModelResponse(game).body,
+        args.iterations,
+    )
+    compare(
+        f"response, {len(games)} games",
+        lambda: render_games(games),
+        lambda: ModelResponse(games).body,
+        args.iterations // 10,
+    )
+    compare(
+        f"response, {len(players)} players",
+        lambda: render_players(players),
+        lambda: ModelResponse(players).body,
+        args.iterations // 10,
+    )
+
+
+if __name__ == "__main__":
+    main()
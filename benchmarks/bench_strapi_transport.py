@@ -0,0 +1,98 @@
+"""
+Per-request latency of StrapiApiService with and without the pooled transport.
+
+Replays the Strapi calls made by one `make_a_move` (get game, get player, update game)
+against the local fake Strapi, once through module-level `requests` calls (a new TCP
+connection per request, as before) and once through the shared keep-alive session.
+
+Run with: python -m benchmarks.bench_strapi_transport --iterations 500
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+import requests
+
+from benchmarks.fake_strapi import FakeStrapiServer
+from schemas.game import Game
+from schemas.player import Player
+from services.strapi_service import StrapiApiService
+
+
+class UnpooledSession:
+    """Session look-alike forwarding to module-level `requests`, one connection per call."""
+
+    def get(self, *args, **kwargs) -> requests.Response:
+        return requests.get(*args, **kwargs)
+
+    def post(self, *args, **kwargs) -> requests.Response:
+        return requests.post(*args, **kwargs)
+
+    def put(self, *args, **kwargs) -> requests.Response:
+        return requests.put(*args, **kwargs)
+
+    def delete(self, *args, **kwargs) -> requests.Response:
+        return requests.delete(*args, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+def seed(service: StrapiApiService) -> Game:
+    white = service.post_players(Player(name="White"))
+    black = service.post_players(Player(name="Black"))
+    return service.post_games(
+        Game(white_player=white, black_player=black, turn=white, is_active=True)
+    )
+
+
+def measure(call: Callable[[], None], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: List[float], calls_per_iteration: int) -> float:
+    per_request = [sample / calls_per_iteration for sample in samples]
+    quantiles = statistics.quantiles(per_request, n=100)
+    mean = statistics.fmean(per_request)
+    print(
+        f"{label:<10} mean {mean:7.3f} ms  p50 {quantiles[49]:7.3f} ms  "
+        f"p95 {quantiles[94]:7.3f} ms  p99 {quantiles[98]:7.3f} ms"
+    )
+    return mean
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    server = FakeStrapiServer().start()
+    try:
+        results = {}
+        for label, session in (("unpooled", UnpooledSession()), ("pooled", None)):
+            service = StrapiApiService(session=session)
+            service.API_URL = server.api_url
+            game = seed(service) if label == "unpooled" else service.get_single_game(1)
+
+            def make_a_move_round_trips() -> None:
+                current = service.get_single_game(game.game_id)
+                service.get_single_player(current.white_player.name)
+                service.update_game(current)
+
+            make_a_move_round_trips()
+            samples = measure(make_a_move_round_trips, args.iterations)
+            results[label] = report(label, samples, calls_per_iteration=3)
+            service.close()
+        print(f"speedup    x{results['unpooled'] / results['pooled']:.2f} per request")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
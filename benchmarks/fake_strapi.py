@@ -0,0 +1,264 @@
+"""
+In-memory stand-in for the Strapi REST API.
+
+Serves `/api/players` and `/api/games` with the same `{"data": {"id", "attributes"}}`
+shapes that `PlayerFactory` and `GameFactory` parse, so the service layer can be
+exercised without the Strapi container. Each response can be delayed by a fixed
+latency plus a random jitter, to stand in for a remote Strapi and its database.
+
+Run standalone with: python -m benchmarks.fake_strapi --port 1337 --latency-ms 5 --jitter-ms 2
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+COLLECTIONS = ("players", "games")
+MAX_PAGE_SIZE = 100
+
+
+class StaleVersion(Exception):
+    pass
+
+
+class FakeStrapiStore:
+    """Thread-safe storage of the fake collections."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.rows: Dict[str, Dict[int, Dict[str, Any]]] = {
+            name: {} for name in COLLECTIONS
+        }
+        self.next_id = {name: 1 for name in COLLECTIONS}
+
+    @staticmethod
+    def _entry(row_id: int, attributes: Dict[str, Any]) -> Dict[str, Any]:
+        return {"id": row_id, "attributes": attributes}
+
+    def list(
+        self,
+        collection: str,
+        filters: Dict[str, str],
+        page: int = 1,
+        page_size: int = 25,
+    ) -> Dict[str, Any]:
+        with self.lock:
+            rows = [
+                self._entry(row_id, attributes)
+                for row_id, attributes in sorted(self.rows[collection].items())
+                if all(
+                    str(attributes.get(key)) == value for key, value in filters.items()
+                )
+            ]
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        page_count = -(-len(rows) // page_size)
+        pagination = {
+            "page": page,
+            "pageSize": page_size,
+            "pageCount": page_count,
+            "total": len(rows),
+        }
+        page_rows = rows[(page - 1) * page_size : page * page_size]
+        return {"data": page_rows, "meta": {"pagination": pagination}}
+
+    def get(self, collection: str, row_id: int) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            attributes = self.rows[collection].get(row_id)
+            return None if attributes is None else self._entry(row_id, attributes)
+
+    def create(
+        self, collection: str, attributes: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            if collection == "players" and any(
+                row["name"] == attributes.get("name")
+                for row in self.rows["players"].values()
+            ):
+                return None
+            row_id = self.next_id[collection]
+            self.next_id[collection] += 1
+            self.rows[collection][row_id] = attributes
+            return self._entry(row_id, attributes)
+
+    def update(
+        self, collection: str, row_id: int, attributes: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Update a row, or raise `StaleVersion` if the `version` sent is not the stored one."""
+        with self.lock:
+            row = self.rows[collection].get(row_id)
+            if row is None:
+                return None
+            if "version" in attributes:
+                # Compare-and-set of the game controller, see chess_db/src/api/game/controllers/game.js
+                if attributes["version"] != row.get("version", 0):
+                    raise StaleVersion(row_id)
+                attributes = {**attributes, "version": attributes["version"] + 1}
+            row.update(attributes)
+            return self._entry(row_id, row)
+
+    def delete(self, collection: str, row_id: int) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            attributes = self.rows[collection].pop(row_id, None)
+            return None if attributes is None else self._entry(row_id, attributes)
+
+
+class FakeStrapiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY a kept-alive
+    # connection stalls on delayed ACKs like a real server never would.
+    disable_nagle_algorithm = True
+    store: FakeStrapiStore
+    # Seconds added to every response: `latency` plus up to `jitter`.
+    latency: float = 0.0
+    jitter: float = 0.0
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _route(self) -> Tuple[Optional[str], Optional[int], Dict[str, str]]:
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        if len(parts) < 2 or parts[0] != "api" or parts[1] not in COLLECTIONS:
+            return None, None, {}
+        row_id = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else None
+        params = {}
+        for key, value in parse_qsl(url.query):
+            if key.startswith("filters[") and key.endswith("][$eq]"):
+                params[key[len("filters[") : -len("][$eq]")]] = value
+            elif key.startswith("pagination["):
+                params[key] = value
+        return parts[1], row_id, params
+
+    def _read_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0))
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length)).get("data", {})
+
+    def _send(self, status: int, body: Optional[Dict[str, Any]]) -> None:
+        if body is None:
+            status, body = 404, {
+                "data": None,
+                "error": {"status": 404, "name": "NotFoundError"},
+            }
+        payload = json.dumps(body).encode()
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        collection, row_id, filters = self._route()
+        if collection is None:
+            return self._send(404, None)
+        if row_id is None:
+            page = int(filters.pop("pagination[page]", 1))
+            page_size = int(filters.pop("pagination[pageSize]", 25))
+            return self._send(
+                200, self.store.list(collection, filters, page, page_size)
+            )
+        entry = self.store.get(collection, row_id)
+        self._send(200, entry and {"data": entry, "meta": {}})
+
+    def do_POST(self) -> None:
+        collection, _, _ = self._route()
+        attributes = self._read_body()
+        if collection is None:
+            return self._send(404, None)
+        entry = self.store.create(collection, attributes)
+        if entry is None:
+            return self._send(
+                400, {"data": None, "error": {"status": 400, "name": "ValidationError"}}
+            )
+        self._send(200, {"data": entry, "meta": {}})
+
+    def do_PUT(self) -> None:
+        collection, row_id, _ = self._route()
+        attributes = self._read_body()
+        if collection is None or row_id is None:
+            return self._send(404, None)
+        try:
+            entry = self.store.update(collection, row_id, attributes)
+        except StaleVersion:
+            return self._send(
+                409, {"data": None, "error": {"status": 409, "name": "ConflictError"}}
+            )
+        self._send(200, entry and {"data": entry, "meta": {}})
+
+    def do_DELETE(self) -> None:
+        collection, row_id, _ = self._route()
+        if collection is None or row_id is None:
+            return self._send(404, None)
+        entry = self.store.delete(collection, row_id)
+        self._send(200, entry and {"data": entry, "meta": {}})
+
+
+class FakeStrapiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops the connections a client pool opens at once,
+    # which then wait a full second for a SYN retransmit.
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+    ) -> None:
+        """
+        Bind the server, without serving requests yet.
+
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port to listen on, a free one if 0.
+            latency (float): Seconds added to every response.
+            jitter (float): Maximum random seconds added on top of `latency`.
+        """
+        self.store = FakeStrapiStore()
+        handler = type(
+            "BoundFakeStrapiHandler",
+            (FakeStrapiHandler,),
+            {"store": self.store, "latency": latency, "jitter": jitter},
+        )
+        super().__init__((host, port), handler)
+
+    @property
+    def api_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> "FakeStrapiServer":
+        """Serve requests from a daemon thread and return immediately."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1337)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    server = FakeStrapiServer(
+        args.host, args.port, args.latency_ms / 1000, args.jitter_ms / 1000
+    )
+    print(f"Fake Strapi listening on {server.api_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
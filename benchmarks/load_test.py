@@ -0,0 +1,242 @@
+"""
+End-to-end load test: concurrent simulated games played through the FastAPI app.
+
+The app runs in process, behind httpx's ASGI transport, on top of the local fake
+Strapi (`benchmarks/fake_strapi.py`) with a configurable response latency, so the
+measure covers the routers, the engine and the async Strapi service without the
+Strapi container. The fake Strapi runs in its own process, so that its CPU time is
+not charged to the app. Each simulated game creates its two players and the game, seats
+them, then plays random legal moves (fetching them from `GET /games/move/{game_id}`)
+until the game ends or reaches `--plies`.
+
+Latency percentiles and requests/sec are reported per endpoint.
+
+Run with: python -m benchmarks.load_test --games 1000 --plies 20 --latency-ms 5 --jitter-ms 2
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.fake_strapi import FakeStrapiServer
+
+
+class LoadStats:
+    """Latencies (in milliseconds) and error counts of the requests, per endpoint."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(
+        self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs
+    ) -> Optional[httpx.Response]:
+        """
+        Send a request and record its latency under `endpoint`.
+
+        Returns:
+            httpx.Response or None: The response, or None if it failed.
+        """
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.latencies[endpoint].append((time.perf_counter() - start) * 1000)
+        if response is None or response.is_error:
+            self.errors[endpoint] += 1
+            return None
+        return response
+
+    def report(self, elapsed: float) -> None:
+        print(
+            f"{'endpoint':<34} {'requests':>8} {'errors':>6} {'req/s':>8} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        rows = sorted(self.latencies.items(), key=lambda item: -len(item[1]))
+        for endpoint, latencies in rows:
+            print(
+                f"{endpoint:<34} {len(latencies):>8} {self.errors[endpoint]:>6} "
+                + _summary(latencies, elapsed)
+            )
+        every_latency = [
+            latency for latencies in self.latencies.values() for latency in latencies
+        ]
+        print(
+            f"{'total':<34} {len(every_latency):>8} {sum(self.errors.values()):>6} "
+            + _summary(every_latency, elapsed)
+        )
+
+
+def _summary(latencies: List[float], elapsed: float) -> str:
+    if len(latencies) > 1:
+        quantiles = statistics.quantiles(latencies, n=100)
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+    return f"{len(latencies) / elapsed:>8.1f} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f}"
+
+
+async def play_game(
+    client: httpx.AsyncClient,
+    stats: LoadStats,
+    name: str,
+    plies: int,
+    rng: random.Random,
+) -> None:
+    """Create, seat and play one game with random legal moves."""
+    players = []
+    for color in ("white", "black"):
+        response = await stats.request(
+            client, "POST /players/{name}", "POST", f"/players/{name}{color}"
+        )
+        if response is None:
+            return
+        players.append(response.json()["name"])
+
+    response = await stats.request(client, "POST /games/", "POST", "/games/")
+    if response is None:
+        return
+    game_id = response.json()["game_id"]
+    for player in players:
+        if (
+            await stats.request(
+                client,
+                "PATCH /games/{game_id}/{player}",
+                "PATCH",
+                f"/games/{game_id}/{player}",
+            )
+            is None
+        ):
+            return
+
+    for ply in range(plies):
+        response = await stats.request(
+            client, "GET /games/move/{game_id}", "GET", f"/games/move/{game_id}"
+        )
+        if response is None or not response.json():
+            return
+        move = {"player_name": players[ply % 2], "move": rng.choice(response.json())}
+        response = await stats.request(
+            client, "PATCH /games/{game_id}", "PATCH", f"/games/{game_id}", json=move
+        )
+        if response is None or response.json()["game_over"]:
+            return
+
+    await stats.request(client, "GET /games/{game_id}", "GET", f"/games/{game_id}")
+
+
+def _serve_fake_strapi(
+    addresses: multiprocessing.Queue, latency: float, jitter: float
+) -> None:
+    server = FakeStrapiServer(latency=latency, jitter=jitter)
+    addresses.put(server.api_url)
+    server.serve_forever()
+
+
+def start_fake_strapi(
+    latency: float, jitter: float
+) -> Tuple[multiprocessing.Process, str]:
+    """
+    Start a fake Strapi in a child process.
+
+    Args:
+        latency (float): Seconds added to every response.
+        jitter (float): Maximum random seconds added on top of `latency`.
+
+    Returns:
+        Tuple[multiprocessing.Process, str]: The process, and the API URL it serves.
+    """
+    context = multiprocessing.get_context("spawn")
+    addresses = context.Queue()
+    process = context.Process(
+        target=_serve_fake_strapi, args=(addresses, latency, jitter), daemon=True
+    )
+    process.start()
+    return process, addresses.get(timeout=30)
+
+
+async def run(games: int, plies: int, concurrency: int, seed: int) -> None:
+    # Imported here so that the storage service picks up the fake Strapi's URL.
+    from api.dependencies import service
+    from api.main import app
+
+    stats = LoadStats()
+    limit = asyncio.Semaphore(concurrency)
+    # Players are unique by name, a fresh prefix lets several runs share a fake Strapi.
+    prefix = uuid.uuid4().hex[:8]
+
+    async def simulate(index: int) -> None:
+        async with limit:
+            await play_game(
+                client, stats, f"{prefix}g{index}", plies, random.Random(seed + index)
+            )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://app", timeout=None
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(simulate(index) for index in range(games)))
+        elapsed = time.perf_counter() - start
+    await service.aclose()
+
+    print(
+        f"{games} games of up to {plies} plies, {concurrency} at a time, in {elapsed:.1f} s"
+    )
+    stats.report(elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument(
+        "--plies", type=int, default=20, help="maximum plies played per game"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="games played at the same time, all of them by default",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=2.0,
+        help="latency of each fake Strapi response",
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=1.0, help="random latency added on top"
+    )
+    parser.add_argument(
+        "--strapi-url",
+        help="use a running (fake or real) Strapi instead of starting one",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fake_strapi, api_url = None, args.strapi_url
+    if api_url is None:
+        fake_strapi, api_url = start_fake_strapi(
+            args.latency_ms / 1000, args.jitter_ms / 1000
+        )
+    os.environ["STORAGE_BACKEND"] = "strapi"
+    os.environ["STRAPI_API_URL"] = api_url
+    try:
+        asyncio.run(
+            run(args.games, args.plies, args.concurrency or args.games, args.seed)
+        )
+    finally:
+        if fake_strapi is not None:
+            fake_strapi.terminate()
+
+
+if __name__ == "__main__":
+    main()
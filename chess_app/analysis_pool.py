@@ -0,0 +1,91 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import chess
+
+from chess_app.search import analyse
+from metrics.metrics import ENGINE_LATENCY
+from schemas.analysis import AnalysisResult
+
+
+class AnalysisPool:
+    """
+    Process pool running engine searches away from the API.
+
+    Searches are CPU bound: run in the event loop or in its threadpool they would
+    stall every other request, so each one runs in a worker process, within a depth
+    and time budget clamped to the configured maximums. Workers are started on the
+    first analysis.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_depth: int = 8,
+        max_time: float = 5.0,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers (int, optional): Number of worker processes, the number of CPUs if omitted.
+            max_depth (int): Maximum depth a request may ask for, in plies.
+            max_time (float): Maximum number of seconds a request may ask for.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_depth = max_depth
+        self.max_time = max_time
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls) -> "AnalysisPool":
+        """Build a pool configured by `ANALYSIS_WORKERS`, `ANALYSIS_MAX_DEPTH` and `ANALYSIS_MAX_TIME`."""
+        workers = os.getenv("ANALYSIS_WORKERS")
+        return cls(
+            max_workers=int(workers) if workers else None,
+            max_depth=int(os.getenv("ANALYSIS_MAX_DEPTH", 8)),
+            max_time=float(os.getenv("ANALYSIS_MAX_TIME", 5.0)),
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned rather than forked, so workers never inherit the event loop or open sockets.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    @ENGINE_LATENCY.timed(operation="analysis")
+    async def analyse(
+        self,
+        board: chess.Board,
+        depth: Optional[int] = None,
+        time_limit: Optional[float] = None,
+    ) -> AnalysisResult:
+        """
+        Search a position in a worker process.
+
+        Args:
+            board (chess.Board): The position, with its move stack. It is copied, not modified.
+            depth (int, optional): Requested depth, `max_depth` if omitted or larger.
+            time_limit (float, optional): Requested seconds, `max_time` if omitted or larger.
+
+        Returns:
+            AnalysisResult: The best move, its score and the search statistics.
+        """
+        depth = min(depth or self.max_depth, self.max_depth)
+        time_limit = min(time_limit or self.max_time, self.max_time)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), analyse, board.copy(), depth, time_limit
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
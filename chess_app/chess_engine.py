@@ -1,15 +1,57 @@
+from typing import List, Optional
+
 import chess
+import chess.polyglot
 
+from chess_app.legal_move_cache import LegalMoveCache
+from chess_app.move_log import decode_moves, encode_moves
+from chess_app.opening_book import OpeningBook
+from chess_app.tablebase import EndgameTablebase
 from custom_errors.custom_errors import (
     GameOverError,
     InvalidMoveError,
+    InvalidPlyError,
     InvalidTurnError,
 )
+from metrics.metrics import ENGINE_LATENCY, ILLEGAL_MOVES
+from schemas.book_move import BookMove
 from schemas.game import Game
-from schemas.player import Player
+from schemas.game_result import GameResult
+from schemas.player import Player, PlayerRef, same_player
+from schemas.tablebase import TablebaseMove, TablebaseResult
+
+
+def evaluate_outcome(board: chess.Board) -> Optional[chess.Outcome]:
+    """
+    Evaluate whether, and how, the game ends in the current position.
+
+    `board.outcome()` covers checkmate, stalemate, insufficient material and the
+    seventy-five-move and fivefold repetition rules; the threefold repetition and
+    fifty-move draws, which cannot be claimed through the API, are then added. The
+    board must carry its move stack for repetitions to be detected.
+
+    Args:
+        board (chess.Board): The position, with the moves leading to it.
+
+    Returns:
+        chess.Outcome or None: The outcome, or None if the game goes on.
+    """
+    outcome = board.outcome()
+    if outcome is None:
+        if board.is_repetition(3):
+            return chess.Outcome(chess.Termination.THREEFOLD_REPETITION, None)
+        # With no legal move left, `board.outcome()` already reported mate or stalemate.
+        if board.halfmove_clock >= 100:
+            return chess.Outcome(chess.Termination.FIFTY_MOVES, None)
+    return outcome
 
 
 class ChessGame:
+    # Shared by every game of the process.
+    legal_move_cache = LegalMoveCache.from_env()
+    opening_book: Optional[OpeningBook] = OpeningBook.from_env()
+    tablebase: Optional[EndgameTablebase] = EndgameTablebase.from_env()
+
     def __init__(self, game: Game):
         """
         Initialize a new instance of ChessGame.
@@ -17,16 +59,51 @@ class ChessGame:
         Args:
             game (Game): The Game object containing information about the current game.
         """
+        self.board = chess.Board()
+        self._position_key: Optional[int] = None
+        # Outcome of the current position, evaluated once per ply.
+        self._outcome: Optional[chess.Outcome] = None
+        self._outcome_known = False
+        self.bind(game)
+        self._rehydrate()
+
+    def bind(self, game: Game) -> None:
+        """
+        Attach the latest stored state of the game, keeping the board and its move stack.
+
+        Args:
+            game (Game): The Game object, whose FEN is expected to match the board.
+        """
         self.game = game
         self.white_player = game.white_player
         self.black_player = game.black_player
         self.current_turn = game.turn
-        self.board = chess.Board()
-        self.set_board(game.fen)
+
+    @ENGINE_LATENCY.timed(operation="rehydrate")
+    def _rehydrate(self) -> None:
+        """
+        Rebuild the board, with its move stack, from the stored game.
+
+        The move log is replayed from its start position; a game without a usable
+        log (or whose log does not lead to the stored FEN) is set from its FEN, which
+        becomes the snapshot the log starts from.
+        """
+        if self.game.move_log:
+            try:
+                self.board.set_fen(self.game.start_fen or chess.STARTING_FEN)
+                for move in decode_moves(self.game.move_log):
+                    self.board.push(move)
+            except ValueError:
+                pass
+            else:
+                if self.board.fen() == self.game.fen:
+                    self._board_changed()
+                    return
+        self.set_board(self.game.fen)
 
     def set_board(self, fen: str) -> None:
         """
-        Set the game board to a given FEN.
+        Set the game board to a given FEN, from which the move log restarts.
 
         Args:
             fen (str): The FEN string representing the board position.
@@ -38,7 +115,13 @@ class ChessGame:
             self.board.set_fen(fen)
         except ValueError as err:
             raise InvalidMoveError(f"Invalid FEN: {err}")
+        finally:
+            self._board_changed()
+        board_fen = self.board.fen()
+        self.game.start_fen = None if board_fen == chess.STARTING_FEN else board_fen
+        self.game.move_log = ""
 
+    @ENGINE_LATENCY.timed(operation="move")
     def move(self, move: str, player: Player) -> Game:
         """
         Make a move in the chess game.
@@ -62,11 +145,75 @@ class ChessGame:
         self._execute_move(move)
         self._update_turn()
         self._update_game_state()
-        self.game.game_over = self.is_game_over()
-        self.game.winner = self.determine_winner() if self.game.game_over else None
+        self._record_outcome()
 
         return self.game
 
+    @ENGINE_LATENCY.timed(operation="play_moves")
+    def play_moves(self, moves: List[str]) -> Game:
+        """
+        Play a sequence of moves from the current position, for both sides in turn.
+
+        All moves are validated on the board before the game is updated: if one of
+        them is invalid, the board is restored and nothing is applied.
+
+        Args:
+            moves (List[str]): The moves in SAN or UCI notation.
+
+        Returns:
+            Game: A Game Object containing the updated game state.
+
+        Raises:
+            GameOverError: If the game is already over.
+            InvalidPlyError: For the first invalid move, with its 1-based ply in the batch.
+        """
+        if self.is_game_over():
+            raise GameOverError("The game is already over.")
+
+        pushed = 0
+        try:
+            for ply, move in enumerate(moves, start=1):
+                # The starting position was evaluated above, each later one once here.
+                if pushed and evaluate_outcome(self.board) is not None:
+                    raise InvalidPlyError(ply, move, "the game is already over")
+                self.board.push(self._parse_move(ply, move))
+                pushed += 1
+        except InvalidPlyError:
+            for _ in range(pushed):
+                self.board.pop()
+            raise
+        finally:
+            if pushed:
+                self._board_changed()
+
+        if pushed % 2:
+            self._update_turn()
+        self._update_game_state()
+        self._record_outcome()
+
+        return self.game
+
+    def _parse_move(self, ply: int, move: str) -> chess.Move:
+        """
+        Parse a move in SAN, falling back to UCI, against the current position.
+
+        Raises:
+            InvalidPlyError: If the move is invalid or illegal in the current position.
+        """
+        try:
+            parsed_move = self.board.parse_san(move)
+        except ValueError as san_err:
+            try:
+                parsed_move = self.board.parse_uci(move)
+            except ValueError:
+                ILLEGAL_MOVES.inc()
+                raise InvalidPlyError(ply, move, str(san_err) or "invalid move")
+        # Both parsers accept null moves ("--", "0000"), which only pass the turn.
+        if parsed_move == chess.Move.null():
+            ILLEGAL_MOVES.inc()
+            raise InvalidPlyError(ply, move, "null moves are not allowed")
+        return parsed_move
+
     def _validate_player_turn(self, player: Player) -> None:
         """
         Validate if it's the correct player's turn.
@@ -77,7 +224,7 @@ class ChessGame:
         Raises:
             InvalidTurnError: If it's not the player's turn.
         """
-        if player != self.current_turn:
+        if not same_player(player, self.current_turn):
             raise InvalidTurnError(
                 f"Not your turn, {self.current_turn.name} needs to play first"
             )
@@ -93,13 +240,21 @@ class ChessGame:
             InvalidMoveError: If the move is illegal in the current position.
         """
         try:
-            self.board.push_san(move)
+            parsed_move = self.board.parse_san(move)
         except chess.IllegalMoveError as err:
+            ILLEGAL_MOVES.inc()
             raise InvalidMoveError(
                 f"The move '{move}' is illegal in the current position: {err}"
             )
         except chess.InvalidMoveError as err:
+            ILLEGAL_MOVES.inc()
             raise InvalidMoveError(f"The move '{move}' is invalid")
+        # python-chess parses "--" as a null move, which only passes the turn.
+        if parsed_move == chess.Move.null():
+            ILLEGAL_MOVES.inc()
+            raise InvalidMoveError(f"The move '{move}' is invalid")
+        self.board.push(parsed_move)
+        self._board_changed()
 
     def _update_turn(self) -> None:
         """
@@ -117,6 +272,45 @@ class ChessGame:
         Update the game state after a move.
         """
         self.game.fen = self.board.fen()
+        self.game.move_log = encode_moves(self.board.move_stack)
+
+    def _board_changed(self) -> None:
+        """
+        Forget what was computed for the previous position.
+        """
+        self._position_key = None
+        self._outcome = None
+        self._outcome_known = False
+
+    def _record_outcome(self) -> None:
+        """
+        Store the outcome of the position reached by a move on the game.
+        """
+        outcome = self.outcome()
+        self.game.game_over = outcome is not None
+        if outcome is None:
+            self.game.winner = None
+            self.game.result = None
+            return
+        self.game.is_active = False
+        self.game.winner = self.determine_winner()
+        self.game.result = GameResult(
+            result=outcome.result(),
+            termination=outcome.termination.name.lower(),
+            winner=self.game.winner,
+        )
+
+    def outcome(self) -> Optional[chess.Outcome]:
+        """
+        Get the outcome of the current position, evaluated once per ply.
+
+        Returns:
+            chess.Outcome or None: The outcome, see `evaluate_outcome`, or None if the game goes on.
+        """
+        if not self._outcome_known:
+            self._outcome = evaluate_outcome(self.board)
+            self._outcome_known = True
+        return self._outcome
 
     def is_game_over(self) -> bool:
         """
@@ -125,9 +319,10 @@ class ChessGame:
         Returns:
             bool: True if the game is over, False otherwise.
         """
-        if self.board.is_game_over():
-            self.game.is_active = False
-        return self.board.is_game_over()
+        if self.outcome() is None:
+            return False
+        self.game.is_active = False
+        return True
 
     def get_board_fen(self) -> str:
         """
@@ -138,34 +333,102 @@ class ChessGame:
         """
         return self.board.fen()
 
-    def get_player_turn(self) -> Player:
+    def get_last_move(self) -> Optional[str]:
+        """
+        Get the last move played.
+
+        Returns:
+            str or None: The last move in UCI notation, or None if no move was played.
+        """
+        return self.board.peek().uci() if self.board.move_stack else None
+
+    def get_player_turn(self) -> PlayerRef:
         """
         Get the current player's turn.
 
         Returns:
-            Player: The player whose turn it is.
+            PlayerRef: The player whose turn it is.
         """
         return self.current_turn
 
+    def position_key(self) -> int:
+        """
+        Get the Zobrist hash of the current position, computed once per ply.
+
+        Returns:
+            int: The Polyglot Zobrist hash of the board.
+        """
+        if self._position_key is None:
+            self._position_key = chess.polyglot.zobrist_hash(self.board)
+        return self._position_key
+
     def get_legal_move(self) -> list:
-        moves = list(self.board.legal_moves)
-        moves_uci = [move.uci() for move in moves]
-        return moves_uci
+        """
+        Get the legal moves of the current position, served from the shared cache when possible.
 
-    def determine_winner(self) -> [Player, str, None]:
+        Returns:
+            list: The legal moves in UCI notation.
+        """
+        return list(
+            self.legal_move_cache.get_or_compute(
+                self.position_key(), self._generate_legal_moves
+            )
+        )
+
+    # Only misses of the legal-move cache are timed, hits cost less than the timer.
+    @ENGINE_LATENCY.timed(operation="legal_moves")
+    def _generate_legal_moves(self) -> list:
+        return [move.uci() for move in self.board.legal_moves]
+
+    @ENGINE_LATENCY.timed(operation="book_moves")
+    def get_book_moves(self) -> List[BookMove]:
+        """
+        Get the opening book moves of the current position.
+
+        Returns:
+            List[BookMove]: The book moves by decreasing weight, empty when out of book
+                or when no opening book is configured.
+        """
+        if self.opening_book is None:
+            return []
+        return self.opening_book.get_moves(self.board, key=self.position_key())
+
+    @ENGINE_LATENCY.timed(operation="tablebase")
+    def probe_tablebase(self) -> Optional[TablebaseResult]:
+        """
+        Get the exact result of the current position from the endgame tablebase.
+
+        Returns:
+            TablebaseResult or None: The WDL, DTZ and best move, or None if the position
+                is not in the tables or no tablebase is configured.
+        """
+        if self.tablebase is None:
+            return None
+        return self.tablebase.probe(self.board)
+
+    @ENGINE_LATENCY.timed(operation="tablebase_moves")
+    def get_tablebase_moves(self) -> List[TablebaseMove]:
+        """
+        Get the legal moves with the exact result each of them leads to, best first.
+
+        Returns:
+            List[TablebaseMove]: The legal moves, without WDL and DTZ if the position is
+                not in the tables or no tablebase is configured.
+        """
+        if self.tablebase is not None:
+            moves = self.tablebase.probe_moves(self.board)
+            if moves is not None:
+                return moves
+        return [TablebaseMove(move=move) for move in self.get_legal_move()]
+
+    def determine_winner(self) -> Optional[PlayerRef]:
         """
         Determine the winner of the game.
 
         Returns:
-            Player or str: The winning player, "Draw" for a draw, or None if undecided.
+            PlayerRef or None: The winning player, or None for a draw or a game that goes on.
         """
-        if self.board.is_checkmate():
-            return (
-                self.white_player
-                if self.current_turn == self.black_player
-                else self.black_player
-            )
-        elif self.board.is_stalemate() or self.board.is_insufficient_material():
-            return "Draw"
-        else:
+        outcome = self.outcome()
+        if outcome is None or outcome.winner is None:
             return None
+        return self.white_player if outcome.winner == chess.WHITE else self.black_player
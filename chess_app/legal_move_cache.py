@@ -0,0 +1,77 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+
+class LegalMoveCache:
+    """
+    Bounded LRU cache of legal-move lists keyed by the Zobrist hash of a position.
+
+    The cache is shared by every game of the process, so a position reached in
+    several games (openings above all) is only generated once.
+    """
+
+    def __init__(self, maxsize: int = 50_000) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of positions kept, the least recently used is evicted first.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[int, Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "LegalMoveCache":
+        """Build a cache sized by `LEGAL_MOVE_CACHE_MAXSIZE`."""
+        return cls(maxsize=int(os.getenv("LEGAL_MOVE_CACHE_MAXSIZE", 50_000)))
+
+    def get_or_compute(
+        self, key: int, compute: Callable[[], Tuple[str, ...]]
+    ) -> Tuple[str, ...]:
+        """
+        Return the legal moves of a position, generating them on a miss.
+
+        Args:
+            key (int): Zobrist hash of the position.
+            compute (Callable): Generates the UCI moves of the position.
+
+        Returns:
+            tuple: The legal moves in UCI notation.
+        """
+        with self._lock:
+            moves = self._entries.get(key)
+            if moves is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return moves
+            self.misses += 1
+
+        moves = tuple(compute())
+        if self.maxsize <= 0:
+            return moves
+        with self._lock:
+            self._entries[key] = moves
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return moves
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit, miss and eviction counters along with the current size."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,90 @@
+"""
+Compact encoding of a game's move history.
+
+Each ply is packed in 16 bits: the origin square in bits 0-5, the target square in
+bits 6-11 and the promotion piece in bits 12-14 (0 for none, 1 for a knight up to 4
+for a queen). The big-endian words are base64-encoded so the log fits a JSON string,
+about 2.7 characters per ply.
+"""
+import base64
+import sys
+from array import array
+from typing import Iterable, List
+
+import chess
+
+_SQUARE_MASK = 0x3F
+
+
+def encode_move(move: chess.Move) -> int:
+    """
+    Pack a move in 16 bits.
+
+    Args:
+        move (chess.Move): The move to encode.
+
+    Returns:
+        int: The packed move.
+    """
+    promotion = move.promotion - chess.PAWN if move.promotion else 0
+    return move.from_square | (move.to_square << 6) | (promotion << 12)
+
+
+def decode_move(word: int) -> chess.Move:
+    """
+    Unpack a move packed by `encode_move`.
+
+    Args:
+        word (int): The packed move.
+
+    Returns:
+        chess.Move: The decoded move.
+    """
+    promotion = (word >> 12) & 0x7
+    return chess.Move(
+        word & _SQUARE_MASK,
+        (word >> 6) & _SQUARE_MASK,
+        promotion=promotion + chess.PAWN if promotion else None,
+    )
+
+
+def encode_moves(moves: Iterable[chess.Move]) -> str:
+    """
+    Encode a sequence of moves as a base64 move log.
+
+    Args:
+        moves (Iterable[chess.Move]): The moves, e.g. `board.move_stack`.
+
+    Returns:
+        str: The move log, "" for no moves.
+    """
+    words = array("H", (encode_move(move) for move in moves))
+    if words.itemsize != 2:
+        raise RuntimeError("16-bit unsigned arrays are required to encode move logs")
+    # array uses the native byte order, logs are big-endian.
+    if sys.byteorder == "little":
+        words.byteswap()
+    return base64.b64encode(words.tobytes()).decode("ascii")
+
+
+def decode_moves(move_log: str) -> List[chess.Move]:
+    """
+    Decode a base64 move log.
+
+    Args:
+        move_log (str): The move log produced by `encode_moves`.
+
+    Returns:
+        List[chess.Move]: The moves in playing order.
+
+    Raises:
+        ValueError: If the log is not valid base64 or has an odd number of bytes.
+    """
+    data = base64.b64decode(move_log, validate=True)
+    if len(data) % 2:
+        raise ValueError("A move log holds 2 bytes per ply")
+    words = array("H")
+    words.frombytes(data)
+    if sys.byteorder == "little":
+        words.byteswap()
+    return [decode_move(word) for word in words]
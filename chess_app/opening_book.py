@@ -0,0 +1,187 @@
+"""
+Polyglot opening book, read through a memory map.
+
+Run as a module to compile a book from PGN files:
+
+    python -m chess_app.opening_book games.pgn more.pgn -o book.bin --max-ply 24
+"""
+import argparse
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+from schemas.book_move import BookMove
+
+MAX_WEIGHT = 0xFFFF
+# Weight given to a move for the result of the game, from the side playing it.
+RESULT_WEIGHTS = {"win": 2, "draw": 1, "loss": 0}
+
+
+class OpeningBook:
+    """
+    Lookup of the book moves of a position in a Polyglot (.bin) opening book.
+
+    The book is memory mapped, so it costs no memory per worker beyond the page
+    cache shared by every process, and a lookup is a binary search on the sorted
+    Zobrist keys. The file is opened on the first lookup.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the book.
+
+        Args:
+            path (str): Path of the Polyglot book.
+        """
+        self.path = path
+        self._reader: Optional[chess.polyglot.MemoryMappedReader] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["OpeningBook"]:
+        """Open the book at `OPENING_BOOK_PATH`, or return None if no book is configured."""
+        path = os.getenv("OPENING_BOOK_PATH")
+        return cls(path) if path else None
+
+    @property
+    def reader(self) -> chess.polyglot.MemoryMappedReader:
+        if self._reader is None:
+            with self._lock:
+                if self._reader is None:
+                    self._reader = chess.polyglot.open_reader(self.path)
+        return self._reader
+
+    def __len__(self) -> int:
+        return len(self.reader)
+
+    def get_moves(
+        self, board: chess.Board, key: Optional[int] = None
+    ) -> List[BookMove]:
+        """
+        Get the legal book moves of a position, by decreasing weight.
+
+        Args:
+            board (chess.Board): The position.
+            key (int, optional): Its Polyglot Zobrist hash, if already known.
+
+        Returns:
+            List[BookMove]: The book moves, empty if the position is not in the book.
+        """
+        if key is None:
+            key = chess.polyglot.zobrist_hash(board)
+        moves = []
+        for entry in self.reader.find_all(key):
+            move = _from_polyglot_castling(board, entry.move)
+            if board.is_legal(move):
+                moves.append(
+                    BookMove(
+                        move=move.uci(),
+                        san=board.san(move),
+                        weight=entry.weight,
+                        learn=entry.learn,
+                    )
+                )
+        moves.sort(key=lambda book_move: book_move.weight, reverse=True)
+        return moves
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+def _from_polyglot_castling(board: chess.Board, move: chess.Move) -> chess.Move:
+    """Polyglot encodes castling as the king taking its own rook (e1h1), translate it to e1g1."""
+    if (
+        board.kings & chess.BB_SQUARES[move.from_square]
+        and board.rooks
+        & board.occupied_co[board.turn]
+        & chess.BB_SQUARES[move.to_square]
+    ):
+        rank = chess.square_rank(move.from_square)
+        file = 6 if move.to_square > move.from_square else 2
+        return chess.Move(move.from_square, chess.square(file, rank))
+    return move
+
+
+def _to_polyglot_move(board: chess.Board, move: chess.Move) -> int:
+    to_square = move.to_square
+    if board.is_castling(move):
+        rank = chess.square_rank(move.from_square)
+        to_square = chess.square(7 if board.is_kingside_castling(move) else 0, rank)
+    raw_move = to_square | (move.from_square << 6)
+    if move.promotion:
+        raw_move |= (move.promotion - 1) << 12
+    return raw_move
+
+
+def _result_weight(result: str, color: chess.Color) -> int:
+    if result == "1/2-1/2":
+        return RESULT_WEIGHTS["draw"]
+    if result in ("1-0", "0-1"):
+        won = (result == "1-0") == (color == chess.WHITE)
+        return RESULT_WEIGHTS["win" if won else "loss"]
+    return RESULT_WEIGHTS["draw"]
+
+
+def build_book(pgn_paths: Iterable[str], output_path: str, max_ply: int = 24) -> int:
+    """
+    Compile a Polyglot book from the mainlines of PGN games.
+
+    Each move played in the first `max_ply` plies is weighted by the result of its
+    game for the side playing it (2 for a win, 1 for a draw, 0 for a loss); weights
+    are scaled down to fit the 16 bits of a Polyglot entry.
+
+    Args:
+        pgn_paths (Iterable[str]): The PGN files.
+        output_path (str): Path of the book to write.
+        max_ply (int): Number of plies of each game added to the book.
+
+    Returns:
+        int: The number of entries written.
+    """
+    weights: Dict[Tuple[int, int], int] = defaultdict(int)
+    for pgn_path in pgn_paths:
+        with open(pgn_path, encoding="utf-8", errors="replace") as pgn_file:
+            while (game := chess.pgn.read_game(pgn_file)) is not None:
+                result = game.headers.get("Result", "*")
+                board = game.board()
+                for ply, move in enumerate(game.mainline_moves()):
+                    if ply >= max_ply:
+                        break
+                    key = chess.polyglot.zobrist_hash(board)
+                    weights[key, _to_polyglot_move(board, move)] += _result_weight(
+                        result, board.turn
+                    )
+                    board.push(move)
+
+    scale = max(1, -(-max(weights.values(), default=0) // MAX_WEIGHT))
+    with open(output_path, "wb") as book:
+        for (key, raw_move), weight in sorted(weights.items()):
+            book.write(
+                chess.polyglot.ENTRY_STRUCT.pack(key, raw_move, weight // scale, 0)
+            )
+    return len(weights)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compile a Polyglot opening book from PGN files."
+    )
+    parser.add_argument("pgn", nargs="+", help="PGN files to read")
+    parser.add_argument(
+        "-o", "--output", required=True, help="path of the book to write"
+    )
+    parser.add_argument("--max-ply", type=int, default=24)
+    args = parser.parse_args()
+    entries = build_book(args.pgn, args.output, args.max_ply)
+    print(f"{entries} entries written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import re
+from typing import List
+
+_HEADER = re.compile(r"^\s*\[.*\]\s*$", re.MULTILINE)
+_COMMENT = re.compile(r"\{[^}]*\}|;[^\n]*")
+_VARIATION = re.compile(r"\([^()]*\)")
+_MOVE_NUMBER = re.compile(r"^\d+\.+")
+_RESULTS = {"1-0", "0-1", "1/2-1/2", "*"}
+
+
+def movetext_to_moves(pgn: str) -> List[str]:
+    """
+    Extract the mainline SAN moves from a PGN (headers and movetext, or movetext only).
+
+    Comments, variations, NAGs, move numbers, annotation glyphs and the result are
+    dropped; the moves themselves are validated later, on the board.
+
+    Args:
+        pgn (str): The PGN text, e.g. "1. e4 e5 2. Nf3 {main line} Nc6 *".
+
+    Returns:
+        List[str]: The moves in SAN, e.g. ["e4", "e5", "Nf3", "Nc6"].
+    """
+    text = _COMMENT.sub(" ", _HEADER.sub(" ", pgn))
+    while True:
+        text, nested = _VARIATION.subn(" ", text)
+        if not nested:
+            break
+
+    moves = []
+    for token in text.split():
+        token = _MOVE_NUMBER.sub("", token).rstrip("!?")
+        if not token or token in _RESULTS or token.startswith("$"):
+            continue
+        moves.append(token)
+    return moves
@@ -0,0 +1,45 @@
+from typing import Tuple
+
+# Score of the white player for each game result.
+WHITE_SCORES = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}
+
+
+def expected_score(rating: int, opponent_rating: int) -> float:
+    """
+    Expected score of a player against an opponent, under the Elo model.
+
+    Args:
+        rating (int): The rating of the player.
+        opponent_rating (int): The rating of the opponent.
+
+    Returns:
+        float: The expected score, between 0 and 1.
+    """
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def rate_game(
+    white_rating: int, black_rating: int, result: str, k_factor: int = 32
+) -> Tuple[int, int]:
+    """
+    Update the ratings of both players of a finished game.
+
+    Args:
+        white_rating (int): The rating of the white player before the game.
+        black_rating (int): The rating of the black player before the game.
+        result (str): The result of the game, "1-0", "0-1" or "1/2-1/2".
+        k_factor (int): The largest change of a rating after a single game.
+
+    Returns:
+        Tuple[int, int]: The new ratings of the white and black players.
+
+    Raises:
+        ValueError: If the result is not the one of a finished game.
+    """
+    try:
+        score = WHITE_SCORES[result]
+    except KeyError:
+        raise ValueError(f"Cannot rate a game whose result is {result!r}")
+    # Rounded once and mirrored, so that the rating points of a game are exchanged.
+    change = round(k_factor * (score - expected_score(white_rating, black_rating)))
+    return white_rating + change, black_rating - change
@@ -0,0 +1,378 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+import chess
+
+from schemas.analysis import AnalysisResult
+
+INFINITY = 1_000_000
+MATE_SCORE = 100_000
+# Scores beyond this bound are mates, stored relative to the node in the transposition table.
+MATE_BOUND = MATE_SCORE - 1_000
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0,
+}
+
+# Piece-square tables from white's point of view, a8 first ("Simplified Evaluation Function").
+# fmt: off
+PIECE_SQUARE_TABLES = {
+    chess.PAWN: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ),
+    chess.KNIGHT: (
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ),
+    chess.BISHOP: (
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ),
+    chess.ROOK: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0,
+    ),
+    chess.QUEEN: (
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ),
+    chess.KING: (
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20,
+    ),
+}
+# fmt: on
+
+# Value of a piece of each color on each square, indexed by square (a1 first).
+_SQUARE_VALUES = {
+    (piece_type, color): tuple(
+        PIECE_VALUES[piece_type]
+        + table[square ^ 56 if color == chess.WHITE else square]
+        for square in chess.SQUARES
+    )
+    for piece_type, table in PIECE_SQUARE_TABLES.items()
+    for color in chess.COLORS
+}
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search once its time budget is spent"""
+
+
+def evaluate(board: chess.Board) -> int:
+    """
+    Static evaluation of a position: material and piece placement.
+
+    Args:
+        board (chess.Board): The position.
+
+    Returns:
+        int: The score in centipawns, from the side to move.
+    """
+    score = 0
+    for piece_type in chess.PIECE_TYPES:
+        white_values = _SQUARE_VALUES[piece_type, chess.WHITE]
+        black_values = _SQUARE_VALUES[piece_type, chess.BLACK]
+        pieces = board.pieces_mask(piece_type, chess.WHITE)
+        for square in chess.scan_forward(pieces):
+            score += white_values[square]
+        pieces = board.pieces_mask(piece_type, chess.BLACK)
+        for square in chess.scan_forward(pieces):
+            score -= black_values[square]
+    return score if board.turn == chess.WHITE else -score
+
+
+class Searcher:
+    """
+    Alpha-beta (negamax) search of a position with iterative deepening.
+
+    Each iteration reuses the transposition table of the previous ones, whose best
+    moves are searched first, followed by captures (most valuable victim, least
+    valuable attacker), killer moves and the history heuristic. Leaves are
+    extended with a quiescence search of captures.
+    """
+
+    def __init__(
+        self, board: chess.Board, time_limit: float, table_size: int = 200_000
+    ) -> None:
+        """
+        Initialize the search.
+
+        Args:
+            board (chess.Board): The position, with its move stack for repetitions. It is searched in place.
+            time_limit (float): Seconds after which the search stops.
+            table_size (int): Maximum number of positions in the transposition table.
+        """
+        self.board = board
+        self.deadline = time.perf_counter() + time_limit
+        self.table_size = table_size
+        self.nodes = 0
+        self.transpositions: Dict[
+            tuple, Tuple[int, int, int, Optional[chess.Move]]
+        ] = {}
+        self.killers: Dict[int, List[chess.Move]] = {}
+        self.history: Dict[Tuple[int, int], int] = {}
+
+    def _key(self) -> tuple:
+        # Cheaper than chess.polyglot.zobrist_hash, and what python-chess uses for repetitions.
+        return self.board._transposition_key()
+
+    def _tick(self) -> None:
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def _capture_value(self, move: chess.Move) -> int:
+        if self.board.is_en_passant(move):
+            victim = chess.PAWN
+        else:
+            victim = self.board.piece_type_at(move.to_square)
+        attacker = self.board.piece_type_at(move.from_square)
+        return 10 * PIECE_VALUES[victim] - PIECE_VALUES[attacker]
+
+    def _ordered_moves(
+        self, ply: int, hash_move: Optional[chess.Move], captures_only: bool = False
+    ) -> List[chess.Move]:
+        moves = (
+            self.board.generate_legal_captures()
+            if captures_only
+            else self.board.legal_moves
+        )
+        killers = self.killers.get(ply, ())
+        scored = []
+        for move in moves:
+            if move == hash_move:
+                score = 10_000_000
+            elif self.board.is_capture(move):
+                score = 1_000_000 + self._capture_value(move)
+            elif move in killers:
+                score = 900_000
+            else:
+                score = self.history.get((move.from_square, move.to_square), 0)
+            if move.promotion:
+                score += PIECE_VALUES[move.promotion] * 100
+            scored.append((score, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def _store(
+        self,
+        key: tuple,
+        depth: int,
+        score: int,
+        flag: int,
+        move: Optional[chess.Move],
+        ply: int,
+    ) -> None:
+        if (
+            len(self.transpositions) >= self.table_size
+            and key not in self.transpositions
+        ):
+            return
+        if score > MATE_BOUND:
+            score += ply
+        elif score < -MATE_BOUND:
+            score -= ply
+        self.transpositions[key] = (depth, score, flag, move)
+
+    def quiesce(self, alpha: int, beta: int, ply: int) -> int:
+        """Search captures only, until the position is quiet."""
+        self._tick()
+        stand_pat = evaluate(self.board)
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        for move in self._ordered_moves(ply, None, captures_only=True):
+            self.board.push(move)
+            score = -self.quiesce(-beta, -alpha, ply + 1)
+            self.board.pop()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Score of the position at a given depth, from the side to move.
+
+        Raises:
+            SearchTimeout: If the time budget is spent.
+        """
+        self._tick()
+        if ply and (
+            self.board.is_repetition(2)
+            or self.board.halfmove_clock >= 100
+            or self.board.is_insufficient_material()
+        ):
+            return 0
+
+        key = self._key()
+        entry = self.transpositions.get(key)
+        hash_move = None
+        if entry is not None:
+            entry_depth, score, flag, hash_move = entry
+            if ply and entry_depth >= depth:
+                if score > MATE_BOUND:
+                    score -= ply
+                elif score < -MATE_BOUND:
+                    score += ply
+                if (
+                    flag == EXACT
+                    or (flag == LOWER_BOUND and score >= beta)
+                    or (flag == UPPER_BOUND and score <= alpha)
+                ):
+                    return score
+
+        if depth <= 0:
+            return self.quiesce(alpha, beta, ply)
+
+        moves = self._ordered_moves(ply, hash_move)
+        if not moves:
+            return -MATE_SCORE + ply if self.board.is_check() else 0
+
+        original_alpha = alpha
+        best_score, best_move = -INFINITY, None
+        for move in moves:
+            self.board.push(move)
+            score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            self.board.pop()
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not self.board.is_capture(move):
+                    killers = self.killers.setdefault(ply, [])
+                    if move not in killers:
+                        killers.insert(0, move)
+                        del killers[2:]
+                    square_pair = (move.from_square, move.to_square)
+                    self.history[square_pair] = (
+                        self.history.get(square_pair, 0) + depth * depth
+                    )
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._store(key, depth, best_score, flag, best_move, ply)
+        return best_score
+
+    def principal_variation(self, max_length: int) -> List[chess.Move]:
+        """Follow the best moves of the transposition table from the root."""
+        pv = []
+        for _ in range(max_length):
+            entry = self.transpositions.get(self._key())
+            if entry is None or entry[3] is None or not self.board.is_legal(entry[3]):
+                break
+            pv.append(entry[3])
+            self.board.push(entry[3])
+        for _ in pv:
+            self.board.pop()
+        return pv
+
+
+def analyse(board: chess.Board, max_depth: int, time_limit: float) -> AnalysisResult:
+    """
+    Search a position by iterative deepening, within a depth and time budget.
+
+    The result of the deepest completed iteration is returned; if the time runs
+    out during the first one, the best move found so far is.
+
+    Args:
+        board (chess.Board): The position, with its move stack. It is searched in place and restored.
+        max_depth (int): Maximum depth of the search, in plies.
+        time_limit (float): Seconds the search may use.
+
+    Returns:
+        AnalysisResult: The best move, its score and principal variation, and search statistics.
+    """
+    started = time.perf_counter()
+    result = AnalysisResult(fen=board.fen())
+    if board.is_game_over():
+        if board.is_checkmate():
+            result.mate = 0
+        else:
+            result.score_cp = 0
+        return result
+
+    searcher = Searcher(board, time_limit)
+    stack_size = len(board.move_stack)
+    score, pv = None, []
+    for depth in range(1, max_depth + 1):
+        try:
+            score = searcher.negamax(depth, -INFINITY, INFINITY, 0)
+        except SearchTimeout:
+            while len(board.move_stack) > stack_size:
+                board.pop()
+            break
+        pv = searcher.principal_variation(depth)
+        result.depth = depth
+        if abs(score) > MATE_BOUND:
+            break
+
+    if not pv:
+        # Interrupted during the first iteration: keep the best move found so far.
+        pv = searcher.principal_variation(1) or searcher._ordered_moves(0, None)[:1]
+
+    result.best_move = pv[0].uci()
+    result.best_move_san = board.san(pv[0])
+    result.pv = [move.uci() for move in pv]
+    if score is not None:
+        if abs(score) > MATE_BOUND:
+            plies = MATE_SCORE - abs(score)
+            result.mate = (plies + 1) // 2 if score > 0 else -((plies + 1) // 2)
+        else:
+            result.score_cp = score
+    result.nodes = searcher.nodes
+    elapsed = time.perf_counter() - started
+    result.time_ms = round(elapsed * 1000, 1)
+    result.nps = int(searcher.nodes / elapsed) if elapsed > 0 else 0
+    return result
@@ -0,0 +1,109 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from chess_app.chess_engine import ChessGame
+from schemas.game import Game
+
+
+class GameSessionRegistry:
+    """
+    Live `ChessGame` sessions of the active games, kept in memory between requests.
+
+    A warm session keeps its `chess.Board` and move stack, so a move is a single
+    `push_san` instead of rebuilding the board from the stored FEN. A session whose
+    board no longer matches the stored FEN (a move was written elsewhere, or a write
+    failed) is rehydrated from storage.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        idle_timeout: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            max_sessions (int): Maximum number of live sessions, the least recently used is evicted first.
+            idle_timeout (float): Seconds without a request after which a session is evicted.
+            clock (Callable): Monotonic time source, injectable for tests.
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.warm_hits = 0
+        self.rehydrations = 0
+        self.evictions = 0
+        self._sessions: "OrderedDict[int, List]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "GameSessionRegistry":
+        """Build a registry sized by `GAME_SESSIONS_MAX` and `GAME_SESSIONS_IDLE_TIMEOUT`."""
+        return cls(
+            max_sessions=int(os.getenv("GAME_SESSIONS_MAX", 10_000)),
+            idle_timeout=float(os.getenv("GAME_SESSIONS_IDLE_TIMEOUT", 600.0)),
+        )
+
+    def get(self, game: Game) -> ChessGame:
+        """
+        Return the live session of a game, rehydrating it from the stored game if needed.
+
+        Args:
+            game (Game): The game as read from storage.
+
+        Returns:
+            ChessGame: A session bound to `game`.
+        """
+        if game.game_id is None:
+            return ChessGame(game=game)
+
+        now = self.clock()
+        self.evict_idle(now)
+        entry = self._sessions.get(game.game_id)
+        if entry is not None and entry[0].get_board_fen() == game.fen:
+            chess_game = entry[0]
+            chess_game.bind(game)
+            self.warm_hits += 1
+        else:
+            chess_game = ChessGame(game=game)
+            self.rehydrations += 1
+
+        self._sessions[game.game_id] = [chess_game, now]
+        self._sessions.move_to_end(game.game_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+        return chess_game
+
+    def discard(self, game_id: int) -> None:
+        """Forget the session of a game, e.g. once it is deleted."""
+        self._sessions.pop(game_id, None)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Evict the sessions idle for longer than `idle_timeout`.
+
+        Sessions are ordered by last use, so only the evicted ones are visited.
+
+        Returns:
+            int: The number of evicted sessions.
+        """
+        now = self.clock() if now is None else now
+        evicted = 0
+        while self._sessions:
+            game_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used < self.idle_timeout:
+                break
+            del self._sessions[game_id]
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, game_id: int) -> bool:
+        return game_id in self._sessions
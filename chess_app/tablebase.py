@@ -0,0 +1,166 @@
+import os
+import threading
+from typing import List, Optional, Tuple
+
+import chess
+import chess.syzygy
+
+from schemas.tablebase import WDL_CATEGORIES, TablebaseMove, TablebaseResult
+
+
+class EndgameTablebase:
+    """
+    Exact results of endgame positions from local Syzygy tablebases.
+
+    Positions with few enough pieces (and no castling rights) are probed for their
+    win/draw/loss (WDL) and distance to zeroing (DTZ), in constant time instead of
+    a search. Table files are opened on demand and at most `max_fds` of them stay
+    open, the least recently used being closed first.
+    """
+
+    def __init__(self, directories: List[str], max_fds: int = 128) -> None:
+        """
+        Initialize the tablebase.
+
+        Args:
+            directories (List[str]): Directories holding the .rtbw and .rtbz files.
+            max_fds (int): Maximum number of table files kept open.
+        """
+        self.directories = directories
+        self.max_fds = max_fds
+        self._tablebase: Optional[chess.syzygy.Tablebase] = None
+        self._max_pieces = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["EndgameTablebase"]:
+        """
+        Open the tables of `SYZYGY_PATH` (directories separated by `os.pathsep`).
+
+        Returns:
+            EndgameTablebase or None: The tablebase, or None if no directory is configured.
+        """
+        path = os.getenv("SYZYGY_PATH")
+        if not path:
+            return None
+        return cls(
+            [directory for directory in path.split(os.pathsep) if directory],
+            max_fds=int(os.getenv("SYZYGY_MAX_FDS", 128)),
+        )
+
+    def _open(self) -> chess.syzygy.Tablebase:
+        with self._lock:
+            if self._tablebase is None:
+                tablebase = chess.syzygy.Tablebase(max_fds=self.max_fds)
+                for directory in self.directories:
+                    tablebase.add_directory(directory)
+                # Table names list the pieces, e.g. "KRPvKR" holds 5 of them.
+                self._max_pieces = max(
+                    (len(name) - 1 for name in tablebase.wdl), default=0
+                )
+                self._tablebase = tablebase
+        return self._tablebase
+
+    @property
+    def tablebase(self) -> chess.syzygy.Tablebase:
+        return self._tablebase or self._open()
+
+    @property
+    def max_pieces(self) -> int:
+        """Number of pieces of the largest available table."""
+        if self._tablebase is None:
+            self._open()
+        return self._max_pieces
+
+    def covers(self, board: chess.Board) -> bool:
+        """Whether a position may be in the tables, checked without probing them."""
+        return (
+            chess.popcount(board.occupied) <= self.max_pieces
+            and not board.castling_rights
+        )
+
+    def _probe(self, board: chess.Board) -> Optional[Tuple[int, Optional[int]]]:
+        try:
+            wdl = self.tablebase.probe_wdl(board)
+        except KeyError:
+            return None
+        return wdl, self.tablebase.get_dtz(board)
+
+    def probe_moves(self, board: chess.Board) -> Optional[List[TablebaseMove]]:
+        """
+        Probe the result of each legal move, best move first.
+
+        Args:
+            board (chess.Board): The position, restored after probing.
+
+        Returns:
+            List[TablebaseMove] or None: The moves with their WDL and DTZ from the
+                side playing them, or None if the position is not in the tables.
+        """
+        if not self.covers(board) or self._probe(board) is None:
+            return None
+        ranked = []
+        for move in board.legal_moves:
+            zeroing = board.is_zeroing(move)
+            board.push(move)
+            try:
+                checkmate = board.is_checkmate()
+                probe = self._probe(board)
+            finally:
+                board.pop()
+            if probe is None:
+                return None
+            wdl, dtz = -probe[0], None if probe[1] is None else -probe[1]
+            ranked.append(
+                (
+                    _rank(wdl, dtz, zeroing, checkmate),
+                    TablebaseMove(move=move.uci(), wdl=wdl, dtz=dtz),
+                )
+            )
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return [tablebase_move for _, tablebase_move in ranked]
+
+    def probe(self, board: chess.Board) -> Optional[TablebaseResult]:
+        """
+        Probe the exact result of a position, and its best move.
+
+        Args:
+            board (chess.Board): The position.
+
+        Returns:
+            TablebaseResult or None: The result, or None if the position is not in the tables.
+        """
+        if not self.covers(board):
+            return None
+        probe = self._probe(board)
+        if probe is None:
+            return None
+        wdl, dtz = probe
+        moves = self.probe_moves(board) if not board.is_game_over() else []
+        return TablebaseResult(
+            wdl=wdl,
+            category=WDL_CATEGORIES[wdl],
+            dtz=dtz,
+            best_move=moves[0].move if moves else None,
+        )
+
+    def close(self) -> None:
+        if self._tablebase is not None:
+            self._tablebase.close()
+            self._tablebase = None
+
+
+def _rank(wdl: int, dtz: Optional[int], zeroing: bool, checkmate: bool) -> tuple:
+    """
+    Sort key of a move, the best one being the largest.
+
+    Winning moves are ranked by mate, then captures and pawn moves (which reset the
+    fifty-move counter), then the shortest distance to zeroing; losing moves by the
+    longest resistance.
+    """
+    distance = 0 if dtz is None else abs(dtz)
+    if wdl > 0:
+        return (wdl, checkmate, zeroing, -distance)
+    if wdl < 0:
+        return (wdl, False, False, distance)
+    return (wdl, False, False, 0)
@@ -2,8 +2,39 @@
 
 /**
  * game controller
+ *
+ * `update` is a compare-and-set on `version`: the write only applies if the game is
+ * still at the version the client read, and increments it. A client holding a stale
+ * version gets a 409 and has to read the game again.
  */
 
 const { createCoreController } = require('@strapi/strapi').factories;
 
-module.exports = createCoreController('api::game.game');
+module.exports = createCoreController('api::game.game', ({ strapi }) => ({
+  async update(ctx) {
+    const { id } = ctx.params;
+    const { data } = ctx.request.body || {};
+    if (!data || !Number.isInteger(data.version)) {
+      return super.update(ctx);
+    }
+
+    const { version, ...attributes } = data;
+    // Games stored before they were versioned have no version, and are read at 0.
+    const where = version === 0 ? { id, $or: [{ version: 0 }, { version: null }] } : { id, version };
+    // A single UPDATE ... WHERE id AND version, atomic across API workers.
+    const { count } = await strapi.db.query('api::game.game').updateMany({
+      where,
+      data: { ...attributes, version: version + 1 },
+    });
+    const entity = await strapi.entityService.findOne('api::game.game', id);
+    if (!entity) {
+      return ctx.notFound();
+    }
+    if (count === 0) {
+      return ctx.throw(409, `Game ${id} is at version ${entity.version}, not ${version}`);
+    }
+
+    const sanitizedEntity = await this.sanitizeOutput(entity, ctx);
+    return this.transformResponse(sanitizedEntity);
+  },
+}));
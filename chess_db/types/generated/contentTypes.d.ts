@@ -378,9 +378,13 @@ export interface ApiGameGame extends Schema.CollectionType {
     white_player: Attribute.JSON;
     black_player: Attribute.JSON;
     fen: Attribute.String;
+    start_fen: Attribute.String;
+    move_log: Attribute.Text;
     turn: Attribute.JSON;
     game_over: Attribute.Boolean;
     winner: Attribute.JSON;
+    result: Attribute.JSON;
+    version: Attribute.Integer & Attribute.DefaultTo<0>;
     createdAt: Attribute.DateTime;
     updatedAt: Attribute.DateTime;
     publishedAt: Attribute.DateTime;
@@ -56,4 +56,19 @@ class InvalidMoveError(Exception):
     pass
 
 
+class StaleGameError(Exception):
+    """Game was updated by another request since it was read !"""
+
+    pass
+
+
+class InvalidPlyError(InvalidMoveError):
+    """A move of a batch is invalid or illegal"""
+
+    def __init__(self, ply: int, move: str, reason: str):
+        super().__init__(f"Ply {ply} ({move}): {reason}")
+        self.ply = ply
+        self.move = move
+
+
 # https://www.programiz.com/python-programming/user-defined-exception
@@ -0,0 +1,338 @@
+"""
+Process-wide metrics, rendered in the Prometheus text exposition format.
+
+Histograms and counters are updated in place by the code they measure; counters
+that mirror statistics kept elsewhere (cache hit and miss counts, for instance)
+are read from their source when the metrics are rendered.
+"""
+import functools
+import inspect
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# Upper bounds in seconds, from the cheapest engine operations to slow Strapi calls.
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Upper bounds in seconds of the time players wait for an opponent.
+WAIT_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric(ABC):
+    """A named metric, rendered with its help and type lines followed by its samples."""
+
+    type_name = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as err:
+            raise ValueError(
+                f"{self.name} expects the labels {self.labelnames}"
+            ) from err
+
+    @abstractmethod
+    def samples(self) -> Iterable[str]:
+        """The sample lines of the metric, one per combination of label values."""
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    """Monotonic count, one per combination of label values."""
+
+    type_name = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class CounterFunction(Metric):
+    """Counter whose values are read from `collect` when rendered."""
+
+    type_name = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[Tuple[LabelValues, float]]],
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self.collect():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class GaugeFunction(CounterFunction):
+    """Value that goes up and down, read from `collect` when rendered."""
+
+    type_name = "gauge"
+
+
+class Histogram(Metric):
+    """Distribution of durations in seconds, one per combination of label values."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: the count of each bucket (the last one being +Inf), and the sum.
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        self._observe(self._key(labels), value)
+
+    def _observe(self, key: LabelValues, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return 0 if series is None else sum(series[0])
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the `with` block, including when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def timed(self, **labels: str) -> Callable[[Callable], Callable]:
+        """Decorator observing the duration of each call of a function or coroutine function."""
+        # Resolved once, the wrappers sit on hot paths such as cached legal-move lookups.
+        key = self._key(labels)
+        observe = self._observe
+
+        def decorator(function: Callable) -> Callable:
+            if inspect.iscoroutinefunction(function):
+
+                @functools.wraps(function)
+                async def async_wrapper(*args, **kwargs):
+                    start = time.perf_counter()
+                    try:
+                        return await function(*args, **kwargs)
+                    finally:
+                        observe(key, time.perf_counter() - start)
+
+                return async_wrapper
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    observe(key, time.perf_counter() - start)
+
+            return wrapper
+
+        return decorator
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            series = sorted(
+                (key, list(counts), total)
+                for key, (counts, total) in self._series.items()
+            )
+        bucket_labels = (*self.labelnames, "le")
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket{_format_labels(bucket_labels, (*key, le))} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {repr(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """The metrics of the process, by name."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric, replacing any metric registered under the same name.
+
+        Returns:
+            Metric: The registered metric.
+        """
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Metric:
+        return self._metrics[name]
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format (version 0.0.4).
+
+        Returns:
+            str: The exposition, one sample per line.
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def instrument_methods(histogram: Histogram, **labels: str) -> Callable[[type], type]:
+    """
+    Class decorator timing each public method of a class, including inherited ones.
+
+    Each call is observed on `histogram` with `labels` and a `method` label holding
+    the method name. Generators, properties and static or class methods are left as is.
+
+    Args:
+        histogram (Histogram): The histogram, whose labels are `labels` and `method`.
+
+    Returns:
+        Callable: The class decorator.
+    """
+
+    def decorator(cls: type) -> type:
+        for name in dir(cls):
+            if name.startswith("_"):
+                continue
+            attribute = inspect.getattr_static(cls, name)
+            if (
+                not inspect.isfunction(attribute)
+                or inspect.isgeneratorfunction(attribute)
+                or inspect.isasyncgenfunction(attribute)
+            ):
+                continue
+            setattr(cls, name, histogram.timed(**labels, method=name)(attribute))
+        return cls
+
+    return decorator
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Duration of the HTTP requests, by route template.",
+        ("method", "route", "status"),
+    )
+)
+STORAGE_LATENCY = registry.register(
+    Histogram(
+        "storage_call_duration_seconds",
+        "Duration of the storage service calls, Strapi or SQL.",
+        ("backend", "method"),
+    )
+)
+ENGINE_LATENCY = registry.register(
+    Histogram(
+        "engine_operation_duration_seconds",
+        "Duration of the chess engine operations.",
+        ("operation",),
+    )
+)
+ILLEGAL_MOVES = registry.register(
+    Counter("illegal_moves_total", "Moves rejected as illegal or unparsable.")
+)
+GAMES_COMPLETED = registry.register(
+    Counter(
+        "games_completed_total",
+        "Games finished by a move, by result (1-0, 0-1 or 1/2-1/2).",
+        ("result",),
+    )
+)
+MATCHMAKING_WAIT = registry.register(
+    Histogram(
+        "matchmaking_wait_seconds",
+        "Time players waited in the matchmaking queue, by outcome (matched or timeout).",
+        ("outcome",),
+        buckets=WAIT_BUCKETS,
+    )
+)
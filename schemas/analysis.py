@@ -0,0 +1,25 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from schemas.tablebase import TablebaseResult
+
+
+class AnalysisResult(BaseModel):
+    """Outcome of an engine search on a position"""
+
+    fen: str
+    # Best move found, in UCI and SAN notation, None if the game is over.
+    best_move: Optional[str] = None
+    best_move_san: Optional[str] = None
+    # Evaluation from the side to move: centipawns, or moves to mate (negative when mated).
+    score_cp: Optional[int] = None
+    mate: Optional[int] = None
+    # Principal variation, in UCI notation, starting with the best move.
+    pv: List[str] = []
+    # Exact result from the endgame tablebase, in which case no search is run.
+    tablebase: Optional[TablebaseResult] = None
+    depth: int = 0
+    nodes: int = 0
+    time_ms: float = 0.0
+    nps: int = 0
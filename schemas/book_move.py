@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class BookMove(BaseModel):
+    """Move of the opening book for a position"""
+
+    # The move in UCI and SAN notation.
+    move: str
+    san: str
+    # Relative weight of the move among the book moves of the position.
+    weight: int
+    learn: int = 0
@@ -1,8 +1,9 @@
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
-from schemas.player import Player
+from schemas.game_result import GameResult
+from schemas.player import PlayerRef
 
 
 class Game(BaseModel):
@@ -10,12 +11,27 @@ class Game(BaseModel):
 
     game_id: Optional[int] = None
     is_active: bool = False
-    white_player: Optional[Player] = None
-    black_player: Optional[Player] = None
-    turn: Optional[Player] = None
+    # Players are referenced, see `PlayerRef`; full players are served on `?expand=`.
+    white_player: Optional[PlayerRef] = None
+    black_player: Optional[PlayerRef] = None
+    turn: Optional[PlayerRef] = None
     fen: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+    # Position the move log starts from, None for the standard starting position.
+    start_fen: Optional[str] = None
+    # Moves played from `start_fen`, encoded by `chess_app.move_log`.
+    move_log: str = ""
     game_over: bool = False
-    winner: Optional[Player] = None
+    winner: Optional[PlayerRef] = None
+    # How the game ended, None while it is being played.
+    result: Optional[GameResult] = None
+    # Incremented by each update, which only applies to the version it was read at.
+    version: int = 0
+
+    @field_validator("winner", mode="before")
+    @classmethod
+    def drop_draw_marker(cls, winner):
+        # Earlier versions stored the string "Draw" as the winner of drawn games.
+        return None if isinstance(winner, str) else winner
 
 
 Game.model_rebuild()
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from schemas.player import PlayerRef
+
+# Ways a game ends, named after `chess.Termination`. Threefold repetition and the
+# fifty-move rule end the game as soon as they apply, there is no draw claim.
+TERMINATIONS = (
+    "checkmate",
+    "stalemate",
+    "insufficient_material",
+    "seventyfive_moves",
+    "fivefold_repetition",
+    "fifty_moves",
+    "threefold_repetition",
+)
+
+
+class GameResult(BaseModel):
+    """Outcome of a finished game"""
+
+    # "1-0", "0-1" or "1/2-1/2".
+    result: str
+    # One of `TERMINATIONS`.
+    termination: str
+    # None for a draw.
+    winner: Optional[PlayerRef] = None
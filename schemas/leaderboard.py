@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    """Position of a player in the leaderboard"""
+
+    # 1 for the best rated players, players with equal ratings share their rank.
+    rank: int
+    player_id: Optional[int] = None
+    name: str
+    rating: int
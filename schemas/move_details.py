@@ -1,6 +1,27 @@
-from pydantic import BaseModel
+from typing import List, Optional
+
+from pydantic import BaseModel, model_validator
+
+from chess_app.pgn import movetext_to_moves
 
 
 class MoveDetails(BaseModel):
     player_name: str
     move: str
+
+
+class MoveBatch(BaseModel):
+    """Sequence of moves to replay on a game, as a list or as PGN movetext"""
+
+    moves: List[str] = []
+    pgn: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_single_source(self) -> "MoveBatch":
+        if bool(self.moves) == bool(self.pgn):
+            raise ValueError("Provide either 'moves' or 'pgn'")
+        return self
+
+    def to_moves(self) -> List[str]:
+        """The moves of the batch, in SAN or UCI notation."""
+        return movetext_to_moves(self.pgn) if self.pgn else self.moves
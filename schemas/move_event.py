@@ -0,0 +1,20 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from schemas.game_result import GameResult
+from schemas.player import PlayerRef
+
+
+class MoveEvent(BaseModel):
+    """State of a game pushed to its subscribers after each move"""
+
+    game_id: int
+    fen: str
+    # Last move played, in UCI notation, None before the first move.
+    last_move: Optional[str] = None
+    turn: Optional[PlayerRef] = None
+    legal_moves: List[str] = []
+    game_over: bool = False
+    winner: Optional[PlayerRef] = None
+    result: Optional[GameResult] = None
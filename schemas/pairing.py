@@ -0,0 +1,16 @@
+from pydantic import BaseModel, model_validator
+
+from schemas.player import normalize_player_name
+
+
+class Pairing(BaseModel):
+    """White and black players of a game to create"""
+
+    white: str
+    black: str
+
+    @model_validator(mode="after")
+    def check_distinct_players(self) -> "Pairing":
+        if normalize_player_name(self.white) == normalize_player_name(self.black):
+            raise ValueError("A player cannot be paired against themselves")
+        return self
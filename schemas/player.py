@@ -1,6 +1,9 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, field_validator
+
+# Elo rating of a player who has not finished a game yet.
+DEFAULT_RATING = 1200
 
 
 class Player(BaseModel):
@@ -8,9 +11,71 @@ class Player(BaseModel):
 
     name: str
     player_id: Optional[int] = None
-    rank: Optional[int] = None
+    # Elo rating, updated each time one of the player's games ends.
+    rank: int = DEFAULT_RATING
     friends: List["Player"] = []
     active_games: List[int] = []
 
+    @field_validator("rank", mode="before")
+    @classmethod
+    def default_rating(cls, rank):
+        # Players stored before ratings were computed have no rank.
+        return DEFAULT_RATING if rank is None else rank
+
 
 Player.model_rebuild()
+
+
+class PlayerRef(BaseModel):
+    """
+    Reference to a stored player, as embedded in games.
+
+    Only the ID and the (unique) name are kept: the full player, with its friends
+    and active games, is looked up when a client asks for it.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    player_id: Optional[int] = None
+    name: str
+
+    @classmethod
+    def of(cls, player: Union[Player, "PlayerRef"]) -> "PlayerRef":
+        """Reference a player, or return an existing reference as is."""
+        if isinstance(player, PlayerRef):
+            return player
+        return cls(player_id=player.player_id, name=player.name)
+
+
+def normalize_player_name(name: str) -> str:
+    """
+    Canonical form under which player names are stored and looked up.
+
+    Args:
+        name (str): The name as typed by a client, e.g. "marius".
+
+    Returns:
+        str: The stored form of the name, e.g. "Marius".
+    """
+    return name.strip().capitalize()
+
+
+def same_player(
+    player: Optional[Union[Player, PlayerRef]],
+    other: Optional[Union[Player, PlayerRef]],
+) -> bool:
+    """
+    Whether two players or references refer to the same stored player.
+
+    Players are compared by ID (or by name when an ID is missing), not by value,
+    since a stored player and a reference to it never compare equal.
+
+    Args:
+        player (Player or PlayerRef, optional): A player, or None for an empty seat.
+        other (Player or PlayerRef, optional): Another player, or None for an empty seat.
+    """
+    if player is None or other is None:
+        return player is other
+    if player.player_id is not None and other.player_id is not None:
+        return player.player_id == other.player_id
+    return player.name == other.name
@@ -0,0 +1,32 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+# Syzygy WDL values, from the side to move. Cursed wins and blessed losses are
+# decided by the fifty-move rule.
+WDL_CATEGORIES = {
+    2: "win",
+    1: "cursed-win",
+    0: "draw",
+    -1: "blessed-loss",
+    -2: "loss",
+}
+
+
+class TablebaseResult(BaseModel):
+    """Exact result of an endgame position, from the side to move"""
+
+    wdl: int
+    category: str
+    # Distance to the next capture or pawn move (zeroing) with best play, if the DTZ table is available.
+    dtz: Optional[int] = None
+    # Best move in UCI notation, None if the game is over.
+    best_move: Optional[str] = None
+
+
+class TablebaseMove(BaseModel):
+    """Legal move with the exact result it leads to, from the side playing it"""
+
+    move: str
+    wdl: Optional[int] = None
+    dtz: Optional[int] = None
@@ -0,0 +1,436 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+from custom_errors.custom_errors import (
+    GameNotFoundError,
+    NameAlreadyExistsError,
+    PlayernotFoundError,
+    StaleGameError,
+)
+from metrics.metrics import STORAGE_LATENCY, instrument_methods
+from schemas.game import Game
+from schemas.player import Player, normalize_player_name
+from services.game_cache import GameCache
+from services.player_index import PlayerIndex
+from services.serialization import strapi_payload, to_json
+from services.storage import StorageService
+from services.strapi_service import GameFactory, PlayerFactory
+from services.transport import (
+    IDEMPOTENT_METHODS,
+    RETRY_STATUSES,
+    TransportConfig,
+    build_async_client,
+)
+
+
+@instrument_methods(STORAGE_LATENCY, backend="strapi")
+class AsyncStrapiApiService(StorageService):
+    """asyncio counterpart of `StrapiApiService`, the default storage of the API routers."""
+
+    API_URL = os.getenv("STRAPI_API_URL", "http://localhost:1337/api")
+    FILTER_PLAYER_BY_NAME = "/players?filters[name][$eq]="
+    PAGE_SIZE = 100  # Strapi's `maxLimit`, see chess_db/config/api.js
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        config: Optional[TransportConfig] = None,
+        game_cache: Optional[GameCache] = None,
+        player_index: Optional[PlayerIndex] = None,
+    ) -> None:
+        """
+        Initialize the async Strapi API service.
+
+        Args:
+            client (httpx.AsyncClient, optional): Client to reuse, a pooled one is built if omitted.
+            config (TransportConfig, optional): Pool, timeout and retry settings.
+            game_cache (GameCache, optional): Write-through cache in front of `get_single_game`.
+            player_index (PlayerIndex, optional): Name index in front of `get_single_player`.
+        """
+        self.config = config or TransportConfig.from_env()
+        super().__init__(concurrency=self.config.pool_maxsize)
+        self.client = client or build_async_client(self.config)
+        self.game_cache = game_cache if game_cache is not None else GameCache.from_env()
+        self.player_index = (
+            player_index if player_index is not None else PlayerIndex.from_env()
+        )
+
+    async def aclose(self) -> None:
+        """Release the pooled connections."""
+        await self.client.aclose()
+
+    async def _request(
+        self, method: str, path: str, versioned: bool = False, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request to Strapi, retrying idempotent calls with exponential backoff.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Path relative to `API_URL`.
+            versioned (bool): The call is a compare-and-set write, which would be rejected
+                as stale if replayed after its response was lost: it is only retried when
+                the connection could not be established.
+
+        Returns:
+            httpx.Response: The last response received.
+        """
+        retries = self.config.max_retries if method in IDEMPOTENT_METHODS else 0
+        for attempt in range(retries + 1):
+            try:
+                response = await self.client.request(
+                    method, f"{self.API_URL}{path}", **kwargs
+                )
+                if (
+                    versioned
+                    or response.status_code not in RETRY_STATUSES
+                    or attempt == retries
+                ):
+                    return response
+            except httpx.TransportError as err:
+                unsent = isinstance(err, (httpx.ConnectError, httpx.ConnectTimeout))
+                if attempt == retries or (versioned and not unsent):
+                    raise
+            await asyncio.sleep(self.config.backoff_factor * (2**attempt))
+
+    ## Get Methods
+
+    async def _get_page(
+        self, collection: str, page: int, page_size: int
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        """
+        Retrieve one page of a Strapi collection.
+
+        Args:
+            collection (str): "players" or "games".
+            page (int): The 1-based page number.
+            page_size (int): The number of entries per page.
+
+        Returns:
+            tuple: The entries of the page and Strapi's pagination metadata.
+
+        Raises:
+            httpx.HTTPStatusError: If an HTTP error occurs during the API request.
+        """
+        response = await self._request(
+            "GET",
+            f"/{collection}",
+            params={"pagination[page]": page, "pagination[pageSize]": page_size},
+        )
+        response.raise_for_status()
+        body = response.json()
+        return body["data"], body.get("meta", {}).get("pagination", {})
+
+    async def _iter_collection(
+        self, collection: str, page_size: int, start_page: int
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield the entries of a collection, fetching the next page only when needed."""
+        page = start_page
+        while True:
+            entries, pagination = await self._get_page(collection, page, page_size)
+            for entry in entries:
+                yield entry
+            if not entries or page >= pagination.get("pageCount", page):
+                return
+            page += 1
+
+    async def iter_players(
+        self, page_size: int = PAGE_SIZE, start_page: int = 1
+    ) -> AsyncIterator[Player]:
+        """
+        Lazily walk all players, one Strapi page at a time.
+
+        Args:
+            page_size (int): The number of players fetched per request.
+            start_page (int): The first page to read.
+        """
+        async for player in self._iter_collection("players", page_size, start_page):
+            yield PlayerFactory.from_strapi_response(player)
+
+    async def get_players(
+        self, page: Optional[int] = None, page_size: int = PAGE_SIZE
+    ) -> list[Player]:
+        """
+        Retrieve a list of players stored in the database.
+
+        Args:
+            page (int, optional): Only return this page, all pages are read if omitted.
+            page_size (int): The number of players per page.
+
+        Raises:
+            PlayernotFoundError: If no players are found in the database.
+        """
+        try:
+            if page is None:
+                players = [player async for player in self.iter_players(page_size)]
+            else:
+                players_json, _ = await self._get_page("players", page, page_size)
+                players = [
+                    PlayerFactory.from_strapi_response(player)
+                    for player in players_json
+                ]
+        except httpx.HTTPStatusError:
+            raise PlayernotFoundError("No players found in the database.")
+        if not players:
+            raise PlayernotFoundError("No players found in the database.")
+        return players
+
+    async def get_single_player(self, name: str) -> Player:
+        """
+        Retrieve a single player by name, from the player index when possible.
+
+        Args:
+            name (str): The name of the player to retrieve, normalized before the lookup.
+
+        Returns:
+            Player: An object representing the player's data if found.
+
+        Raises:
+            PlayernotFoundError: If no player with the specified name is found in the database.
+            httpx.HTTPStatusError: If an HTTP error occurs during the API request.
+        """
+        name = normalize_player_name(name)
+        indexed_player = await self.player_index.aget(name)
+        if indexed_player is not None:
+            return indexed_player
+        response = await self._request("GET", f"{self.FILTER_PLAYER_BY_NAME}{name}")
+        response.raise_for_status()
+        player_json = response.json()["data"]
+        if not player_json:
+            raise PlayernotFoundError("No player with this name")
+        player = PlayerFactory.from_strapi_response(player_json[0])
+        await self.player_index.aput(player)
+        return player
+
+    async def iter_games(
+        self, page_size: int = PAGE_SIZE, start_page: int = 1
+    ) -> AsyncIterator[Game]:
+        """
+        Lazily walk all games, one Strapi page at a time.
+
+        Args:
+            page_size (int): The number of games fetched per request.
+            start_page (int): The first page to read.
+        """
+        async for game in self._iter_collection("games", page_size, start_page):
+            yield GameFactory.from_strapi_response(game)
+
+    async def get_games(
+        self, page: Optional[int] = None, page_size: int = PAGE_SIZE
+    ) -> list[Game]:
+        """
+        Retrieve a list of games stored in the database.
+
+        Args:
+            page (int, optional): Only return this page, all pages are read if omitted.
+            page_size (int): The number of games per page.
+
+        Raises:
+            GameNotFoundError: If no games are found in the database.
+        """
+        if page is None:
+            games = [game async for game in self.iter_games(page_size)]
+        else:
+            games_json, _ = await self._get_page("games", page, page_size)
+            games = [GameFactory.from_strapi_response(game) for game in games_json]
+        if not games:
+            raise GameNotFoundError("No games found in the database.")
+        return games
+
+    async def get_single_game(self, game_id: int) -> Game:
+        """
+        Retrieve a single game by its ID, from the game cache when possible.
+
+        Args:
+            game_id (int): The ID of the game to retrieve.
+
+        Returns:
+            Game: An object representing the game's data if found.
+
+        Raises:
+            GameNotFoundError: If no game with the specified ID is found in the database.
+            httpx.HTTPStatusError: If an HTTP error occurs during the API request.
+        """
+        cached_game = await self.game_cache.aget(game_id)
+        if cached_game is not None:
+            return cached_game
+        response = await self._request("GET", f"/games/{game_id}")
+        if response.status_code == 404:
+            raise GameNotFoundError(f"No game with ID {game_id} found")
+        response.raise_for_status()
+        game = GameFactory.from_strapi_response(response.json()["data"])
+        await self.game_cache.aput(game)
+        return game
+
+    ## Post Methods
+
+    async def post_players(self, new_player: Player) -> Player:
+        """
+        Store a new player instance in the database, under its normalized name.
+
+        Args:
+            new_player (Player): The player instance to store.
+
+        Returns:
+            Player: The stored player object with updated data from the database.
+
+        Raises:
+            NameAlreadyExistsError: If a player with the same name already exists.
+        """
+        new_player.name = normalize_player_name(new_player.name)
+        response = await self._request(
+            "POST",
+            "/players",
+            headers={"Content-Type": "application/json"},
+            content=strapi_payload(new_player),
+        )
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as err:
+            raise NameAlreadyExistsError(
+                f"A player with this Name already exists : {err}"
+            )
+        player = PlayerFactory.from_strapi_response(response.json()["data"])
+        await self.player_index.aput(player)
+        return player
+
+    async def post_games(self, new_game: Game) -> Game:
+        """Store a new game instance in the database."""
+        response = await self._request(
+            "POST",
+            "/games",
+            headers={"Content-Type": "application/json"},
+            content=strapi_payload(new_game),
+        )
+        response.raise_for_status()
+        game = GameFactory.from_strapi_response(response.json()["data"])
+        await self.game_cache.aput(game)
+        return game
+
+    ## Put Methods
+
+    async def update_player(self, player: Player) -> Player:
+        """Function that makes the update call
+
+        Args:
+            player (Player): Player Object
+
+        Returns:
+            Player: updated Player
+        """
+        response = await self._request(
+            "PUT",
+            f"/players/{player.player_id}",
+            headers={"Content-Type": "application/json"},
+            content=strapi_payload(player),
+        )
+        response.raise_for_status()
+        updated_player = PlayerFactory.from_strapi_response(response.json()["data"])
+        await self.player_index.aput(updated_player)
+        return updated_player
+
+    async def update_player_rank(self, player: Player, rank: int) -> Player:
+        """
+        Store the rating of a player, sending only its `rank`.
+
+        Args:
+            player (Player): The player to update.
+            rank (int): The new rating.
+
+        Returns:
+            Player: The updated player.
+
+        Raises:
+            PlayernotFoundError: If the player no longer exists.
+            httpx.HTTPStatusError: If an HTTP error occurs during the API request.
+        """
+        response = await self._request(
+            "PUT",
+            f"/players/{player.player_id}",
+            headers={"Content-Type": "application/json"},
+            content=to_json({"data": {"rank": rank}}),
+        )
+        if response.status_code == 404:
+            raise PlayernotFoundError(f"No player with ID {player.player_id} found")
+        response.raise_for_status()
+        updated_player = PlayerFactory.from_strapi_response(response.json()["data"])
+        await self.player_index.aput(updated_player)
+        return updated_player
+
+    async def update_game(self, game: Game) -> Game:
+        """Function that makes the update call
+
+        Args:
+            game (game): game Object, at the version it was read at
+
+        Returns:
+            game: updated game, at its new version
+
+        Raises:
+            StaleGameError: If the game was updated by another request since it was read.
+        """
+        response = await self._request(
+            "PUT",
+            f"/games/{game.game_id}",
+            versioned=True,
+            headers={"Content-Type": "application/json"},
+            content=strapi_payload(game),
+        )
+        if response.status_code == 409:
+            await self.game_cache.ainvalidate(game.game_id)
+            raise StaleGameError(f"Game {game.game_id} was updated by another request")
+        response.raise_for_status()
+        updated_game = GameFactory.from_strapi_response(response.json()["data"])
+        await self.game_cache.aput(updated_game)
+        return updated_game
+
+    ## Delete Methods
+
+    async def delete_player(self, name: str) -> None:
+        """
+        Delete a player by name from the database.
+
+        Args:
+            name (str): The name of the player to delete.
+
+        Raises:
+            PlayernotFoundError: If no player with the specified name is found in the database.
+            httpx.HTTPStatusError: If an HTTP error occurs during the API request.
+        """
+        player = await self.get_single_player(name)
+        response = await self._request("DELETE", f"/players/{player.player_id}")
+        response.raise_for_status()
+        await self.player_index.aremove(player.name)
+
+    async def delete_game(self, game_id: int) -> None:
+        """
+        Delete a game by its ID from the database.
+
+        Both players' active games are updated concurrently.
+
+        Args:
+            game_id (int): The ID of the game to delete.
+
+        Raises:
+            GameNotFoundError: If no game with the specified ID is found in the database.
+            httpx.HTTPStatusError: If an HTTP error occurs during the API request.
+        """
+        game = await self.get_single_game(game_id)
+
+        await asyncio.gather(
+            *(
+                self._delete_game_from_player_active_games(player, game_id)
+                for player in [game.white_player, game.black_player]
+                if player
+            )
+        )
+
+        response = await self._request("DELETE", f"/games/{game_id}")
+        # Only once deleted, so that no read in between caches the game again.
+        await self.game_cache.ainvalidate(game_id)
+        if response.status_code == 404:
+            raise GameNotFoundError(f"No game with ID {game_id} found")
+        response.raise_for_status()
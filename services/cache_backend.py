@@ -0,0 +1,271 @@
+import asyncio
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class CacheBackend(ABC):
+    """
+    Key-value store behind the service caches, holding serialized models.
+
+    Values are bytes, so a backend may live outside of the process: every worker of
+    a node then shares the same entries, and an invalidation made by one of them is
+    seen by all. Backends whose calls may block (`blocking`) are called from the
+    event loop through `run`.
+    """
+
+    # Whether a call may wait on I/O or on another process, e.g. for a lock.
+    blocking = False
+
+    def __init__(self) -> None:
+        self.evictions = 0
+
+    async def run(self, function: Callable[..., T], *args: Any) -> T:
+        """
+        Call a method of the backend from the event loop, in a worker thread if it may block.
+
+        Args:
+            function (Callable): A bound method of the backend, e.g. `backend.get`.
+
+        Returns:
+            The result of the call.
+        """
+        if self.blocking:
+            return await asyncio.to_thread(function, *args)
+        return function(*args)
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value of a key, or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store a value, expiring after `ttl` seconds if given."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Drop a key, if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every key."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Bounded LRU in the memory of the process, the default backend."""
+
+    def __init__(
+        self, maxsize: Optional[int] = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            maxsize (int, optional): Maximum number of keys, the least recently used is evicted first.
+            clock (Callable): Monotonic time source, injectable for tests.
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        expires_at = None if ttl is None else self.clock() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCacheBackend(CacheBackend):
+    """
+    Cache in a local SQLite file, shared by the worker processes of a node.
+
+    Each namespace is a table of the file. Reads and writes are single statements
+    on a WAL database, so workers read concurrently and never see a partial write.
+    Expiry uses the wall clock, common to all processes. When the table outgrows
+    `maxsize`, the oldest writes are evicted, in batches every `prune_every` writes,
+    which keeps reads free of any bookkeeping write. A call may wait up to 5 seconds
+    for a write of another worker, so it is `blocking`.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        maxsize: Optional[int] = None,
+        prune_every: int = 64,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the backend, creating its table if needed.
+
+        Args:
+            path (str): Path of the SQLite file.
+            namespace (str): Name of the table, e.g. "games".
+            maxsize (int, optional): Number of keys above which the oldest writes are evicted.
+            prune_every (int): Writes between two evictions of expired and excess keys.
+            clock (Callable): Wall-clock time source, injectable for tests.
+        """
+        super().__init__()
+        if not re.fullmatch(r"[a-z_]+", namespace):
+            raise ValueError(f"Invalid cache namespace: {namespace!r}")
+        self.path = path
+        self.table = f"cache_{namespace}"
+        self.maxsize = maxsize
+        self.prune_every = prune_every
+        self.clock = clock
+        self._writes = 0
+        # sqlite3 connections belong to the thread that opened them.
+        self._local = threading.local()
+        self._connection().execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, stored_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT value FROM {self.table} WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, self.clock()),
+            )
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        now = self.clock()
+        self._connection().execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)",
+            (key, value, None if ttl is None else now + ttl, now),
+        )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def prune(self) -> int:
+        """
+        Delete the expired keys, then the oldest writes in excess of `maxsize`.
+
+        Returns:
+            int: The number of keys evicted for size.
+        """
+        connection = self._connection()
+        connection.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (self.clock(),),
+        )
+        if self.maxsize is None:
+            return 0
+        evicted = connection.execute(
+            f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} "
+            "ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        ).rowcount
+        self.evictions += evicted
+        return evicted
+
+    def delete(self, key: str) -> None:
+        self._connection().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connection().execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        return (
+            self._connection()
+            .execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE expires_at IS NULL OR expires_at > ?",
+                (self.clock(),),
+            )
+            .fetchone()[0]
+        )
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def build_cache_backend(namespace: str, maxsize: Optional[int] = None) -> CacheBackend:
+    """
+    Build the backend selected by `CACHE_BACKEND` ("memory" or "sqlite").
+
+    The SQLite file is `CACHE_PATH`, by default one per user in the temporary
+    directory, so that all workers started on the node find the same file.
+
+    Args:
+        namespace (str): Name of the cache, e.g. "games".
+        maxsize (int, optional): Maximum number of keys.
+
+    Returns:
+        CacheBackend: The backend.
+
+    Raises:
+        ValueError: If `CACHE_BACKEND` names an unknown backend.
+    """
+    backend = os.getenv("CACHE_BACKEND", "memory").lower()
+    if backend == "memory":
+        return MemoryCacheBackend(maxsize=maxsize)
+    if backend == "sqlite":
+        default_path = os.path.join(
+            tempfile.gettempdir(), f"chess_cache_{os.getuid()}.sqlite3"
+        )
+        return SqliteCacheBackend(
+            os.getenv("CACHE_PATH", default_path), namespace, maxsize
+        )
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend!r}")
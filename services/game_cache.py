@@ -0,0 +1,122 @@
+import os
+import time
+from typing import Callable, Optional
+
+from pydantic_core import to_json
+
+from schemas.game import Game
+from services.cache_backend import CacheBackend, MemoryCacheBackend, build_cache_backend
+
+
+class GameCache:
+    """
+    Bounded cache of games keyed by `game_id`, with a time-to-live per entry.
+
+    Games are stored serialized in a `CacheBackend`, an LRU in the memory of the
+    process by default, or a store shared by the workers of the node, in which case
+    a game written or invalidated by one worker is seen as such by all of them.
+    Callers always receive a fresh instance, so mutating it (as `ChessGame` does)
+    never alters the cached state.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        backend: Optional[CacheBackend] = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of games kept, the least recently used is evicted first.
+            ttl (float): Seconds after which an entry is considered stale, 0 disables caching.
+            clock (Callable): Monotonic time source of the default backend, injectable for tests.
+            backend (CacheBackend, optional): Store of the entries, a `MemoryCacheBackend` by default.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.backend = (
+            backend if backend is not None else MemoryCacheBackend(maxsize, clock)
+        )
+
+    @classmethod
+    def from_env(cls) -> "GameCache":
+        """
+        Build a cache sized by `GAME_CACHE_MAXSIZE` and `GAME_CACHE_TTL`, on the
+        backend selected by `CACHE_BACKEND`.
+        """
+        maxsize = int(os.getenv("GAME_CACHE_MAXSIZE", 1024))
+        return cls(
+            maxsize=maxsize,
+            ttl=float(os.getenv("GAME_CACHE_TTL", 30.0)),
+            backend=build_cache_backend("games", maxsize),
+        )
+
+    @property
+    def evictions(self) -> int:
+        return self.backend.evictions
+
+    def _decode(self, payload: Optional[bytes]) -> Optional[Game]:
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Game.model_validate_json(payload)
+
+    def _cacheable(self, game: Game) -> bool:
+        return game.game_id is not None and self.maxsize > 0 and self.ttl > 0
+
+    def get(self, game_id: int) -> Optional[Game]:
+        """
+        Return a copy of the cached game, or None on a miss or an expired entry.
+
+        Args:
+            game_id (int): The ID of the game.
+        """
+        return self._decode(self.backend.get(str(game_id)))
+
+    async def aget(self, game_id: int) -> Optional[Game]:
+        """`get` for the event loop, calling a blocking backend in a worker thread."""
+        return self._decode(await self.backend.run(self.backend.get, str(game_id)))
+
+    def put(self, game: Game) -> None:
+        """
+        Store a copy of a game, evicting the least recently used entries if full.
+
+        Args:
+            game (Game): The game to cache, ignored if it has no ID yet.
+        """
+        if self._cacheable(game):
+            self.backend.set(str(game.game_id), to_json(game), self.ttl)
+
+    async def aput(self, game: Game) -> None:
+        """`put` for the event loop, calling a blocking backend in a worker thread."""
+        if self._cacheable(game):
+            await self.backend.run(
+                self.backend.set, str(game.game_id), to_json(game), self.ttl
+            )
+
+    def invalidate(self, game_id: int) -> None:
+        """Drop a game from the cache."""
+        self.backend.delete(str(game_id))
+
+    async def ainvalidate(self, game_id: int) -> None:
+        """`invalidate` for the event loop, calling a blocking backend in a worker thread."""
+        await self.backend.run(self.backend.delete, str(game_id))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        """Hit, miss and eviction counters along with the current size."""
+        return {
+            "size": len(self.backend),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
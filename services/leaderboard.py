@@ -0,0 +1,118 @@
+import os
+import time
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from schemas.leaderboard import LeaderboardEntry
+from schemas.player import Player, PlayerRef, normalize_player_name
+
+
+class Leaderboard:
+    """
+    Players sorted by rating, best first, kept in memory.
+
+    The players are held in a list sorted by (-rating, name), so the rank of a player
+    and a page of the top players are found by binary search, without scanning the
+    players or their games. It is loaded from the storage, kept current by the rating
+    updates and player writes of this worker, and reloaded once older than `ttl`
+    seconds to pick up those of the other workers.
+    """
+
+    def __init__(
+        self, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Initialize an empty leaderboard.
+
+        Args:
+            ttl (float): Seconds after which the leaderboard should be reloaded from the storage.
+            clock (Callable): Monotonic time source, injectable for tests.
+        """
+        self.ttl = ttl
+        self.clock = clock
+        self.loaded_at: Optional[float] = None
+        self._keys: List[Tuple[int, str]] = []
+        # Per normalized name: the rating of the player, and the player as listed.
+        self._players: Dict[str, Tuple[int, PlayerRef]] = {}
+
+    @classmethod
+    def from_env(cls) -> "Leaderboard":
+        """Build a leaderboard reloaded every `LEADERBOARD_TTL` seconds."""
+        return cls(ttl=float(os.getenv("LEADERBOARD_TTL", 60.0)))
+
+    def is_stale(self) -> bool:
+        """Whether the leaderboard was never loaded, or was loaded more than `ttl` seconds ago."""
+        return self.loaded_at is None or self.clock() - self.loaded_at >= self.ttl
+
+    def load(self, players: Iterable[Player]) -> None:
+        """
+        Replace the content of the leaderboard.
+
+        Args:
+            players (Iterable[Player]): Every stored player.
+        """
+        self._players = {
+            normalize_player_name(player.name): (player.rank, PlayerRef.of(player))
+            for player in players
+        }
+        self._keys = sorted(
+            (-rating, name) for name, (rating, _) in self._players.items()
+        )
+        self.loaded_at = self.clock()
+
+    def put(self, player: Player) -> None:
+        """Add a player, or move it to the place of its current rating."""
+        name = normalize_player_name(player.name)
+        self._discard(name)
+        self._players[name] = (player.rank, PlayerRef.of(player))
+        insort(self._keys, (-player.rank, name))
+
+    def remove(self, name: str) -> None:
+        """Drop a player, e.g. once it is deleted."""
+        self._discard(normalize_player_name(name))
+
+    def _discard(self, name: str) -> None:
+        entry = self._players.pop(name, None)
+        if entry is not None:
+            del self._keys[bisect_left(self._keys, (-entry[0], name))]
+
+    def _entry(self, rating: int, player: PlayerRef) -> LeaderboardEntry:
+        return LeaderboardEntry(
+            # The first key of this rating sorts before every (-rating, name) key.
+            rank=bisect_left(self._keys, (-rating,)) + 1,
+            player_id=player.player_id,
+            name=player.name,
+            rating=rating,
+        )
+
+    def top(self, limit: int, offset: int = 0) -> List[LeaderboardEntry]:
+        """
+        Get a page of the leaderboard.
+
+        Args:
+            limit (int): The number of players to return.
+            offset (int): The number of better rated players to skip.
+
+        Returns:
+            List[LeaderboardEntry]: The players, best first.
+        """
+        return [
+            self._entry(*self._players[name])
+            for _, name in self._keys[offset : offset + limit]
+        ]
+
+    def rank_of(self, name: str) -> Optional[LeaderboardEntry]:
+        """
+        Get the position of a player in the leaderboard.
+
+        Args:
+            name (str): The player's name, normalized or not.
+
+        Returns:
+            LeaderboardEntry or None: The player's rank and rating, or None if the player is unknown.
+        """
+        entry = self._players.get(normalize_player_name(name))
+        return None if entry is None else self._entry(*entry)
+
+    def __len__(self) -> int:
+        return len(self._keys)
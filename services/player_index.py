@@ -0,0 +1,110 @@
+import os
+import time
+from typing import Callable, Optional
+
+from pydantic_core import to_json
+
+from schemas.player import Player, normalize_player_name
+from services.cache_backend import CacheBackend, MemoryCacheBackend, build_cache_backend
+
+
+class PlayerIndex:
+    """
+    Index from normalized player name to `Player`.
+
+    Kept current by the service methods that write players, so resolving a player by
+    name is a cache lookup instead of a filtered Strapi query. Players are stored
+    serialized in a `CacheBackend`, in the memory of the process by default or shared
+    by the workers of the node, and every lookup returns a fresh instance. Entries
+    expire after `ttl` seconds, so a shared index outliving the process (or a reset
+    storage) stops serving players that may no longer exist.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            backend (CacheBackend, optional): Store of the players, an unbounded `MemoryCacheBackend` by default.
+            ttl (float, optional): Seconds after which an entry expires, None to keep entries until removed.
+            clock (Callable): Monotonic time source of the default backend, injectable for tests.
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.backend = (
+            backend if backend is not None else MemoryCacheBackend(clock=clock)
+        )
+
+    @classmethod
+    def from_env(cls) -> "PlayerIndex":
+        """
+        Build an index sized by `PLAYER_INDEX_MAXSIZE`, whose entries expire after
+        `PLAYER_INDEX_TTL`, on the backend selected by `CACHE_BACKEND`.
+        """
+        return cls(
+            backend=build_cache_backend(
+                "players", int(os.getenv("PLAYER_INDEX_MAXSIZE", 100_000))
+            ),
+            ttl=float(os.getenv("PLAYER_INDEX_TTL", 300.0)),
+        )
+
+    def _decode(self, payload: Optional[bytes]) -> Optional[Player]:
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Player.model_validate_json(payload)
+
+    def get(self, name: str) -> Optional[Player]:
+        """
+        Return a copy of the indexed player, or None if the name is unknown.
+
+        Args:
+            name (str): The player's name, normalized or not.
+        """
+        return self._decode(self.backend.get(normalize_player_name(name)))
+
+    async def aget(self, name: str) -> Optional[Player]:
+        """`get` for the event loop, calling a blocking backend in a worker thread."""
+        key = normalize_player_name(name)
+        return self._decode(await self.backend.run(self.backend.get, key))
+
+    def get_id(self, name: str) -> Optional[int]:
+        """Return the `player_id` of an indexed player, or None if the name is unknown."""
+        payload = self.backend.get(normalize_player_name(name))
+        return (
+            None if payload is None else Player.model_validate_json(payload).player_id
+        )
+
+    def put(self, player: Player) -> None:
+        """Index (or refresh) a stored player."""
+        self.backend.set(normalize_player_name(player.name), to_json(player), self.ttl)
+
+    async def aput(self, player: Player) -> None:
+        """`put` for the event loop, calling a blocking backend in a worker thread."""
+        key = normalize_player_name(player.name)
+        await self.backend.run(self.backend.set, key, to_json(player), self.ttl)
+
+    def remove(self, name: str) -> None:
+        """Drop a player from the index, e.g. once it is deleted."""
+        self.backend.delete(normalize_player_name(name))
+
+    async def aremove(self, name: str) -> None:
+        """`remove` for the event loop, calling a blocking backend in a worker thread."""
+        await self.backend.run(self.backend.delete, normalize_player_name(name))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def stats(self) -> dict:
+        """Hit and miss counters along with the current size."""
+        return {"size": len(self.backend), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,33 @@
+from typing import Any
+
+import pydantic_core
+from pydantic import BaseModel
+
+
+def to_json(content: Any) -> bytes:
+    """
+    Serialize models, and any JSON-compatible structure holding them, to JSON bytes.
+
+    Models are dumped by pydantic's Rust serializer straight to bytes, without the
+    intermediate dicts of `model_dump` or the re-encoding of `json.dumps`.
+
+    Args:
+        content (Any): A model, a list or dict of models, or plain JSON data.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON.
+    """
+    return pydantic_core.to_json(content)
+
+
+def strapi_payload(model: BaseModel) -> bytes:
+    """
+    Build the body of a Strapi create or update request, `{"data": <model>}`.
+
+    Args:
+        model (BaseModel): The player or game to store.
+
+    Returns:
+        bytes: The JSON request body.
+    """
+    return to_json({"data": model})
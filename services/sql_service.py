@@ -0,0 +1,389 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Callable, Optional, Tuple, Type, TypeVar
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Index,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    event,
+    inspect,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from custom_errors.custom_errors import (
+    GameNotFoundError,
+    NameAlreadyExistsError,
+    PlayernotFoundError,
+    StaleGameError,
+)
+from metrics.metrics import STORAGE_LATENCY, instrument_methods
+from schemas.game import Game
+from schemas.player import Player, normalize_player_name
+from services.storage import StorageService
+
+T = TypeVar("T")
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class PlayerRow(Base):
+    __tablename__ = "players"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    rank: Mapped[Optional[int]]
+    friends: Mapped[list] = mapped_column(JSON, default=list)
+    active_games: Mapped[list] = mapped_column(JSON, default=list)
+
+
+class GameRow(Base):
+    __tablename__ = "games"
+    __table_args__ = (Index("ix_games_state", "is_active", "game_over"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=False)
+    white_player: Mapped[Optional[dict]] = mapped_column(JSON)
+    black_player: Mapped[Optional[dict]] = mapped_column(JSON)
+    turn: Mapped[Optional[dict]] = mapped_column(JSON)
+    fen: Mapped[str] = mapped_column(String(100))
+    start_fen: Mapped[Optional[str]] = mapped_column(String(100))
+    move_log: Mapped[str] = mapped_column(Text, default="")
+    game_over: Mapped[bool] = mapped_column(Boolean, default=False)
+    winner: Mapped[Optional[Any]] = mapped_column(JSON)
+    result: Mapped[Optional[dict]] = mapped_column(JSON)
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+
+PLAYER_COLUMNS = {field for field in Player.model_fields if field != "player_id"}
+GAME_COLUMNS = {field for field in Game.model_fields if field != "game_id"}
+
+
+def _player_from_row(row: PlayerRow) -> Player:
+    return Player(
+        player_id=row.id, **{column: getattr(row, column) for column in PLAYER_COLUMNS}
+    )
+
+
+def _game_from_row(row: GameRow) -> Game:
+    return Game(
+        game_id=row.id, **{column: getattr(row, column) for column in GAME_COLUMNS}
+    )
+
+
+def _write_row(row: Base, model: Any, columns: set) -> None:
+    for column, value in model.model_dump(mode="json", include=columns).items():
+        setattr(row, column, value)
+
+
+def _enable_sqlite_wal(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+# Columns of the games table added after its creation, with their DDL type.
+ADDED_GAME_COLUMNS = {
+    "start_fen": "VARCHAR(100)",
+    "move_log": "TEXT NOT NULL DEFAULT ''",
+    "version": "INTEGER NOT NULL DEFAULT 0",
+    "result": "JSON",
+}
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    """Add the columns in `ADDED_GAME_COLUMNS` to a games table created before them."""
+    columns = {
+        column["name"] for column in inspect(engine).get_columns(GameRow.__tablename__)
+    }
+    missing = [name for name in ADDED_GAME_COLUMNS if name not in columns]
+    if missing:
+        with engine.begin() as connection:
+            for name in missing:
+                connection.execute(
+                    text(
+                        f"ALTER TABLE games ADD COLUMN {name} {ADDED_GAME_COLUMNS[name]}"
+                    )
+                )
+
+
+def build_engine(database_url: str) -> Engine:
+    """
+    Create the SQLAlchemy engine, with WAL journaling for SQLite databases.
+
+    Args:
+        database_url (str): SQLAlchemy URL, e.g. "sqlite:///chess.db".
+
+    Returns:
+        Engine: The engine, shared by the worker threads of the service.
+    """
+    if not database_url.startswith("sqlite"):
+        return create_engine(database_url)
+    if database_url in ("sqlite://", "sqlite:///:memory:"):
+        return create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", _enable_sqlite_wal)
+    return engine
+
+
+@instrument_methods(STORAGE_LATENCY, backend="sql")
+class SqlStorageService(StorageService):
+    """
+    Storage of players and games in a SQL database through SQLAlchemy.
+
+    Suited to single-node deployments: there is no HTTP hop, and the name and game
+    state columns are indexed. Blocking database calls run in worker threads so the
+    event loop is never blocked.
+    """
+
+    def __init__(self, engine: Engine, concurrency: int = 8) -> None:
+        """
+        Initialize the SQL storage, creating the tables if needed.
+
+        Args:
+            engine (Engine): The SQLAlchemy engine to use.
+            concurrency (int): Maximum number of database calls issued concurrently by bulk operations.
+        """
+        super().__init__(concurrency=concurrency)
+        self.engine = engine
+        self.session_factory = sessionmaker(engine, expire_on_commit=False)
+        Base.metadata.create_all(engine)
+        _add_missing_columns(engine)
+
+    @classmethod
+    def from_env(cls) -> "SqlStorageService":
+        """Build the storage of the database given by `DATABASE_URL`."""
+        return cls(build_engine(os.getenv("DATABASE_URL", "sqlite:///chess.db")))
+
+    async def aclose(self) -> None:
+        """Release the pooled connections."""
+        self.engine.dispose()
+
+    async def _run(self, function: Callable[[Session], T]) -> T:
+        """Run `function` in a transaction, in a worker thread."""
+
+        def transaction() -> T:
+            with self.session_factory.begin() as session:
+                return function(session)
+
+        return await asyncio.to_thread(transaction)
+
+    async def _iter_rows(
+        self, row_type: Type[Base], page_size: int, start_page: int
+    ) -> AsyncIterator[Base]:
+        """Yield rows by ID order, one keyset-paginated query per page."""
+        offset = (start_page - 1) * page_size
+        last_id = 0
+        while True:
+            query = (
+                select(row_type)
+                .where(row_type.id > last_id)
+                .order_by(row_type.id)
+                .offset(offset)
+                .limit(page_size)
+            )
+            rows = await self._run(lambda session: session.scalars(query).all())
+            for row in rows:
+                yield row
+            if len(rows) < page_size:
+                return
+            offset = 0
+            last_id = rows[-1].id
+
+    async def _get_page(self, row_type: Type[Base], page: int, page_size: int) -> list:
+        query = (
+            select(row_type)
+            .order_by(row_type.id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        return await self._run(lambda session: session.scalars(query).all())
+
+    ## Get Methods
+
+    async def iter_players(
+        self, page_size: int = StorageService.PAGE_SIZE, start_page: int = 1
+    ) -> AsyncIterator[Player]:
+        async for row in self._iter_rows(PlayerRow, page_size, start_page):
+            yield _player_from_row(row)
+
+    async def get_players(
+        self, page: Optional[int] = None, page_size: int = StorageService.PAGE_SIZE
+    ) -> list[Player]:
+        if page is None:
+            players = [player async for player in self.iter_players(page_size)]
+        else:
+            rows = await self._get_page(PlayerRow, page, page_size)
+            players = [_player_from_row(row) for row in rows]
+        if not players:
+            raise PlayernotFoundError("No players found in the database.")
+        return players
+
+    async def get_single_player(self, name: str) -> Player:
+        query = select(PlayerRow).where(PlayerRow.name == normalize_player_name(name))
+        row = await self._run(lambda session: session.scalars(query).first())
+        if row is None:
+            raise PlayernotFoundError("No player with this name")
+        return _player_from_row(row)
+
+    async def iter_games(
+        self, page_size: int = StorageService.PAGE_SIZE, start_page: int = 1
+    ) -> AsyncIterator[Game]:
+        async for row in self._iter_rows(GameRow, page_size, start_page):
+            yield _game_from_row(row)
+
+    async def get_games(
+        self, page: Optional[int] = None, page_size: int = StorageService.PAGE_SIZE
+    ) -> list[Game]:
+        if page is None:
+            games = [game async for game in self.iter_games(page_size)]
+        else:
+            rows = await self._get_page(GameRow, page, page_size)
+            games = [_game_from_row(row) for row in rows]
+        if not games:
+            raise GameNotFoundError("No games found in the database.")
+        return games
+
+    async def get_single_game(self, game_id: int) -> Game:
+        row = await self._run(lambda session: session.get(GameRow, game_id))
+        if row is None:
+            raise GameNotFoundError(f"No game with ID {game_id} found")
+        return _game_from_row(row)
+
+    ## Post Methods
+
+    async def post_players(self, new_player: Player) -> Player:
+        new_player.name = normalize_player_name(new_player.name)
+
+        def insert(session: Session) -> PlayerRow:
+            row = PlayerRow()
+            _write_row(row, new_player, PLAYER_COLUMNS)
+            session.add(row)
+            session.flush()
+            return row
+
+        try:
+            return _player_from_row(await self._run(insert))
+        except IntegrityError as err:
+            raise NameAlreadyExistsError(
+                f"A player with this Name already exists : {err.orig}"
+            )
+
+    async def post_games(self, new_game: Game) -> Game:
+        def insert(session: Session) -> GameRow:
+            row = GameRow()
+            _write_row(row, new_game, GAME_COLUMNS)
+            session.add(row)
+            session.flush()
+            return row
+
+        return _game_from_row(await self._run(insert))
+
+    ## Put Methods
+
+    async def update_player(self, player: Player) -> Player:
+        def update(session: Session) -> Optional[PlayerRow]:
+            row = session.get(PlayerRow, player.player_id)
+            if row is not None:
+                _write_row(row, player, PLAYER_COLUMNS)
+            return row
+
+        row = await self._run(update)
+        if row is None:
+            raise PlayernotFoundError(f"No player with ID {player.player_id} found")
+        return _player_from_row(row)
+
+    async def update_player_rank(self, player: Player, rank: int) -> Player:
+        def update_rank(session: Session) -> Optional[PlayerRow]:
+            session.execute(
+                update(PlayerRow)
+                .where(PlayerRow.id == player.player_id)
+                .values(rank=rank)
+            )
+            return session.get(PlayerRow, player.player_id, populate_existing=True)
+
+        row = await self._run(update_rank)
+        if row is None:
+            raise PlayernotFoundError(f"No player with ID {player.player_id} found")
+        return _player_from_row(row)
+
+    async def update_game(self, game: Game) -> Game:
+        def compare_and_set(session: Session) -> Tuple[Optional[GameRow], bool]:
+            # A single UPDATE guarded by the version, atomic across workers and processes.
+            result = session.execute(
+                update(GameRow)
+                .where(GameRow.id == game.game_id, GameRow.version == game.version)
+                .values(
+                    **game.model_dump(mode="json", include=GAME_COLUMNS - {"version"}),
+                    version=GameRow.version + 1,
+                )
+            )
+            row = session.get(GameRow, game.game_id)
+            return row, result.rowcount == 1
+
+        row, updated = await self._run(compare_and_set)
+        if row is None:
+            raise GameNotFoundError(f"No game with ID {game.game_id} found")
+        if not updated:
+            raise StaleGameError(
+                f"Game {game.game_id} is at version {row.version}, not {game.version}"
+            )
+        return _game_from_row(row)
+
+    ## Delete Methods
+
+    async def delete_player(self, name: str) -> None:
+        def delete(session: Session) -> bool:
+            row = session.scalars(
+                select(PlayerRow).where(PlayerRow.name == normalize_player_name(name))
+            ).first()
+            if row is None:
+                return False
+            session.delete(row)
+            return True
+
+        if not await self._run(delete):
+            raise PlayernotFoundError(f"No player with name {name} found")
+
+    async def delete_game(self, game_id: int) -> None:
+        def delete(session: Session) -> bool:
+            row = session.get(GameRow, game_id)
+            if row is None:
+                return False
+            for seat in (row.white_player, row.black_player):
+                if not seat:
+                    continue
+                if seat.get("player_id") is not None:
+                    player_row = session.get(PlayerRow, seat["player_id"])
+                else:
+                    player_row = session.scalars(
+                        select(PlayerRow).where(PlayerRow.name == seat["name"])
+                    ).first()
+                if player_row is not None and game_id in player_row.active_games:
+                    player_row.active_games = [
+                        active_game
+                        for active_game in player_row.active_games
+                        if active_game != game_id
+                    ]
+            session.delete(row)
+            return True
+
+        if not await self._run(delete):
+            raise GameNotFoundError(f"No game with ID {game_id} found")
@@ -0,0 +1,329 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Awaitable, Iterable, Optional, TypeVar
+
+from custom_errors.custom_errors import (
+    GameIsFullError,
+    PlayerAlreadyInGameError,
+    PlayernotFoundError,
+)
+from schemas.game import Game
+from schemas.pairing import Pairing
+from schemas.player import Player, PlayerRef, normalize_player_name
+
+T = TypeVar("T")
+
+
+class StorageService(ABC):
+    """
+    Asynchronous storage of players and games used by the API routers.
+
+    Implementations provide the primitive reads and writes; joining a game and
+    creating paired games are built on top of them here.
+    """
+
+    PAGE_SIZE = 100
+
+    def __init__(self, concurrency: int = 32) -> None:
+        """
+        Initialize the storage service.
+
+        Args:
+            concurrency (int): Maximum number of storage calls issued concurrently by bulk operations.
+        """
+        self.concurrency = concurrency
+
+    async def aclose(self) -> None:
+        """Release the resources held by the storage."""
+
+    async def _gather_bounded(self, calls: Iterable[Awaitable[T]]) -> list[T]:
+        """Await calls concurrently, at most `concurrency` of them in flight."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(call: Awaitable[T]) -> T:
+            async with semaphore:
+                return await call
+
+        return await asyncio.gather(*(bounded(call) for call in calls))
+
+    @staticmethod
+    def _check_full_game(game: Game) -> bool:
+        return game.white_player is not None and game.black_player is not None
+
+    ## Get Methods
+
+    @abstractmethod
+    def iter_players(
+        self, page_size: int = PAGE_SIZE, start_page: int = 1
+    ) -> AsyncIterator[Player]:
+        """Lazily walk all players, one page at a time."""
+
+    @abstractmethod
+    async def get_players(
+        self, page: Optional[int] = None, page_size: int = PAGE_SIZE
+    ) -> list[Player]:
+        """
+        Retrieve all players, or a single page of them.
+
+        Raises:
+            PlayernotFoundError: If no players are found in the database.
+        """
+
+    @abstractmethod
+    async def get_single_player(self, name: str) -> Player:
+        """
+        Retrieve a single player by name.
+
+        Raises:
+            PlayernotFoundError: If no player with the specified name is found in the database.
+        """
+
+    async def get_players_by_name(
+        self, names: Iterable[str], missing_ok: bool = False
+    ) -> dict[str, Player]:
+        """
+        Retrieve several players at once, each distinct name being looked up once.
+
+        Args:
+            names (Iterable[str]): The player names, duplicates allowed.
+            missing_ok (bool): Leave unknown names out of the result instead of raising.
+
+        Returns:
+            dict[str, Player]: The players by normalized name.
+
+        Raises:
+            PlayernotFoundError: If a name matches no player and `missing_ok` is False.
+        """
+
+        async def lookup(name: str) -> Optional[Player]:
+            try:
+                return await self.get_single_player(name)
+            except PlayernotFoundError:
+                if missing_ok:
+                    return None
+                raise
+
+        unique_names = list(dict.fromkeys(map(normalize_player_name, names)))
+        players = await self._gather_bounded(map(lookup, unique_names))
+        return {
+            name: player
+            for name, player in zip(unique_names, players)
+            if player is not None
+        }
+
+    @abstractmethod
+    def iter_games(
+        self, page_size: int = PAGE_SIZE, start_page: int = 1
+    ) -> AsyncIterator[Game]:
+        """Lazily walk all games, one page at a time."""
+
+    @abstractmethod
+    async def get_games(
+        self, page: Optional[int] = None, page_size: int = PAGE_SIZE
+    ) -> list[Game]:
+        """
+        Retrieve all games, or a single page of them.
+
+        Raises:
+            GameNotFoundError: If no games are found in the database.
+        """
+
+    @abstractmethod
+    async def get_single_game(self, game_id: int) -> Game:
+        """
+        Retrieve a single game by its ID.
+
+        Raises:
+            GameNotFoundError: If no game with the specified ID is found in the database.
+        """
+
+    ## Post Methods
+
+    @abstractmethod
+    async def post_players(self, new_player: Player) -> Player:
+        """
+        Store a new player under its normalized name.
+
+        Raises:
+            NameAlreadyExistsError: If a player with the same name already exists.
+        """
+
+    @abstractmethod
+    async def post_games(self, new_game: Game) -> Game:
+        """Store a new game."""
+
+    ## Put Methods
+
+    @abstractmethod
+    async def update_player(self, player: Player) -> Player:
+        """Store the new state of a player."""
+
+    @abstractmethod
+    async def update_game(self, game: Game) -> Game:
+        """Store the new state of a game."""
+
+    @abstractmethod
+    async def update_player_rank(self, player: Player, rank: int) -> Player:
+        """
+        Store the rating of a player, leaving its other fields as they are stored.
+
+        Unlike `update_player`, a concurrent write of the player (e.g. a join adding
+        to its active games) is kept.
+
+        Returns:
+            Player: The stored player, with its new rating.
+
+        Raises:
+            PlayernotFoundError: If the player no longer exists.
+        """
+
+    async def add_player_to_game(self, player_name: str, game_id: int) -> Game:
+        """
+        Add a player to a game in the database.
+
+        The player and the game are fetched concurrently.
+
+        Args:
+            player_name (str): The name of the player to add to the game.
+            game_id (int): The ID of the game to which the player is to be added.
+
+        Returns:
+            Game: The updated game object with the new player added.
+
+        Raises:
+            GameIsFullError: If the game cannot accommodate more players.
+            PlayerAlreadyInGameError: If the player is already in the game.
+        """
+        player, game = await asyncio.gather(
+            self.get_single_player(player_name), self.get_single_game(game_id)
+        )
+
+        if self._check_full_game(game):
+            raise GameIsFullError(f"Game with ID {game.game_id} is already full.")
+        if game.game_id in player.active_games:
+            raise PlayerAlreadyInGameError(
+                f"Player {player.name} already in game with ID: {game.game_id}"
+            )
+
+        if not game.white_player:
+            game.white_player = game.turn = PlayerRef.of(player)
+        elif not game.black_player:
+            game.black_player = PlayerRef.of(player)
+
+        if self._check_full_game(game):
+            game.is_active = True
+
+        # The game is written first, so a stale write (StaleGameError) leaves the
+        # player without the ID of a game they did not join.
+        updated_game = await self.update_game(game=game)
+        await self._add_game_to_player_active_games(player, updated_game)
+        return updated_game
+
+    async def create_paired_games(self, pairings: list[Pairing]) -> list[Game]:
+        """
+        Create, seat and activate one game per pairing.
+
+        Players are resolved up front, so an unknown name fails before anything is
+        written. Games are then stored concurrently, and each player is updated once
+        with all of their new games.
+
+        Args:
+            pairings (list[Pairing]): The (white, black) names of each game.
+
+        Returns:
+            list[Game]: The created games, in the order of the pairings.
+
+        Raises:
+            PlayernotFoundError: If one of the names matches no player.
+        """
+        players = await self.get_players_by_name(
+            name for pairing in pairings for name in (pairing.white, pairing.black)
+        )
+
+        games = await self._gather_bounded(
+            self.post_games(
+                Game(
+                    white_player=players[normalize_player_name(pairing.white)],
+                    black_player=players[normalize_player_name(pairing.black)],
+                    turn=players[normalize_player_name(pairing.white)],
+                    is_active=True,
+                )
+            )
+            for pairing in pairings
+        )
+
+        for game in games:
+            for player in (game.white_player, game.black_player):
+                players[player.name].active_games.append(game.game_id)
+        await self._gather_bounded(map(self.update_player, players.values()))
+
+        return games
+
+    async def _add_game_to_player_active_games(
+        self, player: Player, game: Game
+    ) -> Player:
+        """
+        Add a game to a player's list of active games in the database.
+
+        Raises:
+            PlayerAlreadyInGameError: If the player is already in the specified game.
+        """
+        if game.game_id in player.active_games:
+            raise PlayerAlreadyInGameError(
+                f"Player {player.name} already in game with ID: {game.game_id}"
+            )
+        player.active_games.append(game.game_id)
+        return await self.update_player(player=player)
+
+    async def _delete_game_from_player_active_games(
+        self, player: Player, game_id: int
+    ) -> Optional[Player]:
+        # The snapshot embedded in the game may be outdated, update the stored player.
+        player = await self.get_single_player(player.name)
+        if game_id in player.active_games:
+            player.active_games.remove(game_id)
+            return await self.update_player(player)
+        return None
+
+    ## Delete Methods
+
+    @abstractmethod
+    async def delete_player(self, name: str) -> None:
+        """
+        Delete a player by name.
+
+        Raises:
+            PlayernotFoundError: If no player with the specified name is found in the database.
+        """
+
+    @abstractmethod
+    async def delete_game(self, game_id: int) -> None:
+        """
+        Delete a game by its ID and remove it from its players' active games.
+
+        Raises:
+            GameNotFoundError: If no game with the specified ID is found in the database.
+        """
+
+
+def build_storage_service() -> StorageService:
+    """
+    Build the storage selected by the `STORAGE_BACKEND` environment variable.
+
+    `strapi` (the default) talks to the Strapi REST API, `sql` stores everything in
+    the database given by `DATABASE_URL` (a local SQLite file by default).
+
+    Returns:
+        StorageService: The configured storage.
+    """
+    backend = os.getenv("STORAGE_BACKEND", "strapi").lower()
+    if backend == "strapi":
+        from services.async_strapi_service import AsyncStrapiApiService
+
+        return AsyncStrapiApiService()
+    if backend == "sql":
+        from services.sql_service import SqlStorageService
+
+        return SqlStorageService.from_env()
+    raise ValueError(f"Unknown STORAGE_BACKEND '{backend}', expected 'strapi' or 'sql'")
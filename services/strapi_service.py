@@ -1,5 +1,5 @@
-import json
-from typing import Any, Dict, List
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
 
@@ -9,9 +9,15 @@ from custom_errors.custom_errors import (
     NameAlreadyExistsError,
     PlayerAlreadyInGameError,
     PlayernotFoundError,
+    StaleGameError,
 )
+from metrics.metrics import STORAGE_LATENCY, instrument_methods
 from schemas.game import Game
-from schemas.player import Player
+from schemas.player import Player, PlayerRef, normalize_player_name
+from services.game_cache import GameCache
+from services.player_index import PlayerIndex
+from services.serialization import strapi_payload
+from services.transport import TransportConfig, build_session
 
 
 class PlayerFactory:
@@ -19,11 +25,9 @@ class PlayerFactory:
 
     @staticmethod
     def from_strapi_response(strapi_response: dict[str, Any]) -> Player:
-        player_attributes = strapi_response["attributes"]
-        player_id = strapi_response["id"]
-        player = Player(**player_attributes)
-        player.player_id = player_id
-        return player
+        return Player.model_validate(
+            {**strapi_response["attributes"], "player_id": strapi_response["id"]}
+        )
 
 
 class GameFactory:
@@ -31,21 +35,59 @@ class GameFactory:
 
     @staticmethod
     def from_strapi_response(response_data: Dict[str, Any]) -> Game:
-        """Converts game JSON data to a Game object."""
-        game_attributes = response_data["attributes"]
-        game_id = response_data["id"]
-        game = Game(**game_attributes)
-        game.game_id = game_id
-        return game
+        """
+        Converts game JSON data to a Game object, in a single validation pass.
+
+        Players stored in full by earlier versions are reduced to references, their
+        other fields are skipped without being validated. Games stored before they
+        were versioned are at version 0.
+        """
+        attributes = response_data["attributes"]
+        return Game.model_validate(
+            {
+                **attributes,
+                "game_id": response_data["id"],
+                "version": attributes.get("version") or 0,
+            }
+        )
 
 
+@instrument_methods(STORAGE_LATENCY, backend="strapi_sync")
 class StrapiApiService:
-    API_URL = "http://localhost:1337/api"
+    API_URL = os.getenv("STRAPI_API_URL", "http://localhost:1337/api")
     FILTER_PLAYER_BY_NAME = "/players?filters[name][$eq]="
+    PAGE_SIZE = 100  # Strapi's `maxLimit`, see chess_db/config/api.js
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        config: Optional[TransportConfig] = None,
+        game_cache: Optional[GameCache] = None,
+        player_index: Optional[PlayerIndex] = None,
+    ) -> None:
+        """
+        Initialize the Strapi API service.
+
+        Args:
+            session (requests.Session, optional): Transport to reuse, a pooled one is built if omitted.
+            config (TransportConfig, optional): Pool, timeout and retry settings.
+            game_cache (GameCache, optional): Write-through cache in front of `get_single_game`.
+            player_index (PlayerIndex, optional): Name index in front of `get_single_player`.
+        """
+        self.config = config or TransportConfig.from_env()
+        self.session = session or build_session(self.config)
+        # Game updates are compare-and-set writes, which must not be replayed.
+        self.versioned_session = session or build_session(self.config, versioned=True)
+        self.timeout = self.config.timeout
+        self.game_cache = game_cache if game_cache is not None else GameCache.from_env()
+        self.player_index = (
+            player_index if player_index is not None else PlayerIndex.from_env()
+        )
 
-    def __init__(self) -> None:
-        """Initialize the Strapi API service."""
-        pass
+    def close(self) -> None:
+        """Release the pooled connections."""
+        self.session.close()
+        self.versioned_session.close()
 
     @staticmethod
     def _check_full_game(game: Game) -> bool:
@@ -53,32 +95,92 @@ class StrapiApiService:
 
     ## Get Methods
 
-    def get_players(self) -> List[Player]:
+    def _get_page(
+        self, collection: str, page: int, page_size: int
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
-        Retrieve a list of all players stored in the database.
+        Retrieve one page of a Strapi collection.
+
+        Args:
+            collection (str): "players" or "games".
+            page (int): The 1-based page number.
+            page_size (int): The number of entries per page.
+
+        Returns:
+            tuple: The entries of the page and Strapi's pagination metadata.
+
+        Raises:
+            requests.exceptions.HTTPError: If an HTTP error occurs during the API request.
+        """
+        response = self.session.get(
+            f"{self.API_URL}/{collection}",
+            params={"pagination[page]": page, "pagination[pageSize]": page_size},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        body = response.json()
+        return body["data"], body.get("meta", {}).get("pagination", {})
+
+    def _iter_collection(
+        self, collection: str, page_size: int, start_page: int
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the entries of a collection, fetching the next page only when needed."""
+        page = start_page
+        while True:
+            entries, pagination = self._get_page(collection, page, page_size)
+            yield from entries
+            if not entries or page >= pagination.get("pageCount", page):
+                return
+            page += 1
+
+    def iter_players(
+        self, page_size: int = PAGE_SIZE, start_page: int = 1
+    ) -> Iterator[Player]:
+        """
+        Lazily walk all players, one Strapi page at a time.
+
+        Args:
+            page_size (int): The number of players fetched per request.
+            start_page (int): The first page to read.
+        """
+        for player in self._iter_collection("players", page_size, start_page):
+            yield PlayerFactory.from_strapi_response(player)
+
+    def get_players(
+        self, page: Optional[int] = None, page_size: int = PAGE_SIZE
+    ) -> List[Player]:
+        """
+        Retrieve a list of players stored in the database.
+
+        Args:
+            page (int, optional): Only return this page, all pages are read if omitted.
+            page_size (int): The number of players per page.
 
         Raises:
             PlayernotFoundError: If no players are found in the database.
         """
         try:
-            response = requests.get(f"{self.API_URL}/players")
-            response.raise_for_status()
-            players_json = response.json()["data"]
-            if not players_json:
+            if page is None:
+                players = list(self.iter_players(page_size))
+            else:
+                players_json, _ = self._get_page("players", page, page_size)
+                players = [
+                    PlayerFactory.from_strapi_response(player)
+                    for player in players_json
+                ]
+            if not players:
                 raise PlayernotFoundError("No players found in the database.")
-            return [
-                PlayerFactory.from_strapi_response(player) for player in players_json
-            ]
+            return players
 
         except requests.exceptions.HTTPError:
             raise PlayernotFoundError("No players found in the database.")
 
     def get_single_player(self, name: str) -> Player:
         """
-        Retrieve a single player by name from the database.
+        Retrieve a single player by name, from the player index when possible.
 
         Args:
-            name (str): The name of the player to retrieve.
+            name (str): The name of the player to retrieve, normalized before the lookup.
 
         Returns:
             Player: An object representing the player's data if found.
@@ -87,32 +189,64 @@ class StrapiApiService:
             PlayernotFoundError: If no player with the specified name is found in the database.
             requests.exceptions.HTTPError: If an HTTP error occurs during the API request.
         """
+        name = normalize_player_name(name)
+        indexed_player = self.player_index.get(name)
+        if indexed_player is not None:
+            return indexed_player
         try:
-            response = requests.get(f"{self.API_URL}{self.FILTER_PLAYER_BY_NAME}{name}")
+            response = self.session.get(
+                f"{self.API_URL}{self.FILTER_PLAYER_BY_NAME}{name}",
+                timeout=self.timeout,
+            )
             response.raise_for_status()
             player_json = response.json()["data"]
             if not player_json:
                 raise PlayernotFoundError("No player with this name")
-            return PlayerFactory.from_strapi_response(player_json[0])
+            player = PlayerFactory.from_strapi_response(player_json[0])
+            self.player_index.put(player)
+            return player
 
         except requests.exceptions.HTTPError as err:
             raise err
 
-    def get_games(self) -> List[Game]:
-        """Retrieve a list of all games stored in the database."""
-        try:
-            response = requests.get(f"{self.API_URL}/games")
-            response.raise_for_status()
-            games_json = response.json()["data"]
-            if not games_json:
-                raise GameNotFoundError("No games found in the database.")
-            return [GameFactory.from_strapi_response(game) for game in games_json]
-        except requests.exceptions.HTTPError as err:
-            raise err
+    def iter_games(
+        self, page_size: int = PAGE_SIZE, start_page: int = 1
+    ) -> Iterator[Game]:
+        """
+        Lazily walk all games, one Strapi page at a time.
+
+        Args:
+            page_size (int): The number of games fetched per request.
+            start_page (int): The first page to read.
+        """
+        for game in self._iter_collection("games", page_size, start_page):
+            yield GameFactory.from_strapi_response(game)
+
+    def get_games(
+        self, page: Optional[int] = None, page_size: int = PAGE_SIZE
+    ) -> List[Game]:
+        """
+        Retrieve a list of games stored in the database.
+
+        Args:
+            page (int, optional): Only return this page, all pages are read if omitted.
+            page_size (int): The number of games per page.
+
+        Raises:
+            GameNotFoundError: If no games are found in the database.
+        """
+        if page is None:
+            games = list(self.iter_games(page_size))
+        else:
+            games_json, _ = self._get_page("games", page, page_size)
+            games = [GameFactory.from_strapi_response(game) for game in games_json]
+        if not games:
+            raise GameNotFoundError("No games found in the database.")
+        return games
 
     def get_single_game(self, game_id: int) -> Game:
         """
-        Retrieve a single game by its ID from the database.
+        Retrieve a single game by its ID, from the game cache when possible.
 
         Args:
             game_id (int): The ID of the game to retrieve.
@@ -124,20 +258,25 @@ class StrapiApiService:
             GameNotFoundError: If no game with the specified ID is found in the database.
             requests.exceptions.HTTPError: If an HTTP error occurs during the API request.
         """
-        try:
-            response = requests.get(f"{self.API_URL}/games/{game_id}")
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as err:
-            if err.status_code == 404:
-                raise GameNotFoundError(f"No game with ID {game_id} found")
+        cached_game = self.game_cache.get(game_id)
+        if cached_game is not None:
+            return cached_game
+        response = self.session.get(
+            f"{self.API_URL}/games/{game_id}", timeout=self.timeout
+        )
+        if response.status_code == 404:
+            raise GameNotFoundError(f"No game with ID {game_id} found")
+        response.raise_for_status()
         game_json = response.json()["data"]
-        return GameFactory.from_strapi_response(game_json)
+        game = GameFactory.from_strapi_response(game_json)
+        self.game_cache.put(game)
+        return game
 
     ## Post Methods
 
     def post_players(self, new_player: Player) -> Player:
         """
-        Store a new player instance in the database.
+        Store a new player instance in the database, under its normalized name.
 
         Args:
             new_player (Player): The player instance to store.
@@ -149,17 +288,20 @@ class StrapiApiService:
             NameAlreadyExistsError: If a player with the same name already exists.
             HTTPError: If an HTTP error occurs during the request.
         """
+        new_player.name = normalize_player_name(new_player.name)
         try:
-            new_player_json = json.loads(new_player.model_dump_json())
-            payload = json.dumps({"data": new_player_json})
-            response = requests.post(
+            payload = strapi_payload(new_player)
+            response = self.session.post(
                 f"{self.API_URL}/players",
                 headers={"Content-Type": "application/json"},
                 data=payload,
+                timeout=self.timeout,
             )
             response.raise_for_status()
             player_json = response.json()["data"]
-            return PlayerFactory.from_strapi_response(player_json)
+            player = PlayerFactory.from_strapi_response(player_json)
+            self.player_index.put(player)
+            return player
         except requests.exceptions.HTTPError as err:
             raise NameAlreadyExistsError(
                 f"A player with this Name already exists : {err}"
@@ -168,15 +310,17 @@ class StrapiApiService:
     def post_games(self, new_game: Game) -> Game:
         """Store a new game instance in the database."""
         try:
-            new_game_json = json.loads(new_game.model_dump_json())
-            payload = json.dumps({"data": new_game_json})
-            response = requests.post(
+            payload = strapi_payload(new_game)
+            response = self.session.post(
                 f"{self.API_URL}/games",
                 headers={"Content-Type": "application/json"},
                 data=payload,
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return GameFactory.from_strapi_response(response.json()["data"])
+            game = GameFactory.from_strapi_response(response.json()["data"])
+            self.game_cache.put(game)
+            return game
         except requests.exceptions.HTTPError as err:
             raise requests.exceptions.HTTPError(
                 f"Failed to store game in database: {err}"
@@ -193,38 +337,48 @@ class StrapiApiService:
         Returns:
             Player: updated Player
         """
-        player_data_json = json.loads(player.model_dump_json())
-        payload = json.dumps({"data": player_data_json})
+        payload = strapi_payload(player)
 
-        response = requests.put(
+        response = self.session.put(
             f"{self.API_URL}/players/{player.player_id}",
             headers={"Content-Type": "application/json"},
             data=payload,
+            timeout=self.timeout,
         )
         response.raise_for_status()
         updated_player_data = response.json()["data"]
-        return PlayerFactory.from_strapi_response(updated_player_data)
+        updated_player = PlayerFactory.from_strapi_response(updated_player_data)
+        self.player_index.put(updated_player)
+        return updated_player
 
     def update_game(self, game: Game) -> Game:
         """Function that makes the update call
 
         Args:
-            game (game): game Object
+            game (game): game Object, at the version it was read at
 
         Returns:
-            game: updated game
+            game: updated game, at its new version
+
+        Raises:
+            StaleGameError: If the game was updated by another request since it was read.
         """
-        game_data_json = json.loads(game.model_dump_json())
-        payload = json.dumps({"data": game_data_json})
+        payload = strapi_payload(game)
 
-        response = requests.put(
+        response = self.versioned_session.put(
             f"{self.API_URL}/games/{game.game_id}",
             headers={"Content-Type": "application/json"},
             data=payload,
+            timeout=self.timeout,
         )
+        if response.status_code == 409:
+            self.game_cache.invalidate(game.game_id)
+            raise StaleGameError(f"Game {game.game_id} was updated by another request")
         response.raise_for_status()
         updated_game_data = response.json()["data"]
-        return GameFactory.from_strapi_response(updated_game_data)
+        updated_game = GameFactory.from_strapi_response(updated_game_data)
+        self.game_cache.put(updated_game)
+        return updated_game
 
     def add_player_to_game(self, player_name: str, game_id: int) -> Game:
         """
@@ -239,6 +393,7 @@ class StrapiApiService:
 
         Raises:
             GameIsFullError: If the game cannot accommodate more players.
+            PlayerAlreadyInGameError: If the player is already in the game.
             requests.exceptions.HTTPError: If an HTTP error occurs during the API request.
         """
         player = self.get_single_player(player_name)
@@ -247,19 +402,24 @@ class StrapiApiService:
         # Check if the game can has more players
         if self._check_full_game(game):
             raise GameIsFullError(f"Game with ID {game.game_id} is already full.")
+        if game.game_id in player.active_games:
+            raise PlayerAlreadyInGameError(
+                f"Player {player.name} already in game with ID: {game.game_id}"
+            )
 
         if not game.white_player:
-            game.white_player = player
-            game.turn = player
+            game.white_player = game.turn = PlayerRef.of(player)
         elif not game.black_player:
-            game.black_player = player
+            game.black_player = PlayerRef.of(player)
 
         if self._check_full_game(game):
             game.is_active = True
 
-        self._add_game_to_player_active_games(player, game)
-
-        return self.update_game(game=game)
+        # The game is written first, so a stale write (StaleGameError) leaves the
+        # player without the ID of a game they did not join.
+        updated_game = self.update_game(game=game)
+        self._add_game_to_player_active_games(player, updated_game)
+        return updated_game
 
     def _add_game_to_player_active_games(self, player: Player, game: Game) -> Player:
         """
@@ -284,8 +444,10 @@ class StrapiApiService:
         return self.update_player(player=player)
 
     def _delete_game_from_player_active_games(
-        self, player: Player, game_id: int
-    ) -> Player:
+        self, player: PlayerRef, game_id: int
+    ) -> Optional[Player]:
+        # Games only hold a reference to their players, update the stored player.
+        player = self.get_single_player(player.name)
         if game_id in player.active_games:
             player.active_games.remove(game_id)
             return self.update_player(player)
@@ -308,8 +470,11 @@ class StrapiApiService:
             player = self.get_single_player(name)
             if not player:
                 raise PlayernotFoundError(f"No player with name {name} found")
-            response = requests.delete(f"{self.API_URL}/players/{player.player_id}")
+            response = self.session.delete(
+                f"{self.API_URL}/players/{player.player_id}", timeout=self.timeout
+            )
             response.raise_for_status()
+            self.player_index.remove(player.name)
 
         except requests.exceptions.HTTPError as err:
             raise err
@@ -332,7 +497,11 @@ class StrapiApiService:
                 if player:
                     self._delete_game_from_player_active_games(player, game_id)
 
-            response = requests.delete(f"{self.API_URL}/games/{game_id}")
+            response = self.session.delete(
+                f"{self.API_URL}/games/{game_id}", timeout=self.timeout
+            )
+            # Only once deleted, so that no read in between caches the game again.
+            self.game_cache.invalidate(game_id)
 
             if response.status_code == 404:
                 raise GameNotFoundError(f"No game with ID {game_id} found")
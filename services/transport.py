@@ -0,0 +1,121 @@
+import os
+from typing import Optional, Tuple
+
+import httpx
+import requests
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Only methods that can be replayed without side effects are retried, so a
+# timed-out POST never creates the same player or game twice.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = (502, 503, 504)
+
+
+class TransportConfig(BaseModel):
+    """Settings of the pooled HTTP transport used to talk to Strapi."""
+
+    pool_connections: int = 4
+    pool_maxsize: int = 32
+    pool_block: bool = False
+    keep_alive: bool = True
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    max_retries: int = 3
+    backoff_factor: float = 0.1
+
+    @classmethod
+    def from_env(cls) -> "TransportConfig":
+        """
+        Build a config from `STRAPI_*` environment variables, falling back to defaults.
+
+        Returns:
+            TransportConfig: The transport settings.
+        """
+        overrides = {}
+        for field in cls.model_fields:
+            value = os.getenv(f"STRAPI_{field.upper()}")
+            if value is not None:
+                overrides[field] = value
+        return cls(**overrides)
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """(connect, read) timeout tuple as expected by `requests`."""
+        return (self.connect_timeout, self.read_timeout)
+
+    def retry_policy(self, versioned: bool = False) -> Retry:
+        """
+        Build the bounded retry policy applied to idempotent calls.
+
+        Args:
+            versioned (bool): Policy of compare-and-set writes, which are not idempotent:
+                a PUT whose response was lost would be rejected as stale when replayed.
+                They are only retried when the connection could not be established.
+
+        Returns:
+            Retry: urllib3 retry settings with exponential backoff.
+        """
+        replays = 0 if versioned else self.max_retries
+        return Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=replays,
+            status=replays,
+            other=replays,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        )
+
+
+def build_session(
+    config: Optional[TransportConfig] = None, versioned: bool = False
+) -> requests.Session:
+    """
+    Create a keep-alive `requests.Session` backed by a bounded connection pool.
+
+    Args:
+        config (TransportConfig, optional): Transport settings, read from the environment if omitted.
+        versioned (bool): Apply the retry policy of compare-and-set writes, see `TransportConfig.retry_policy`.
+
+    Returns:
+        requests.Session: A session whose adapters reuse TCP connections between calls.
+    """
+    config = config or TransportConfig.from_env()
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        max_retries=config.retry_policy(versioned),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not config.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def build_async_client(config: Optional[TransportConfig] = None) -> httpx.AsyncClient:
+    """
+    Create a keep-alive `httpx.AsyncClient` with the same pool and timeout settings.
+
+    Retries are applied by the caller (see `AsyncStrapiApiService._request`) since
+    httpx only retries failed connection attempts.
+
+    Args:
+        config (TransportConfig, optional): Transport settings, read from the environment if omitted.
+
+    Returns:
+        httpx.AsyncClient: A client whose pool is shared by all coroutines.
+    """
+    config = config or TransportConfig.from_env()
+    limits = httpx.Limits(
+        max_connections=config.pool_maxsize,
+        max_keepalive_connections=config.pool_maxsize if config.keep_alive else 0,
+    )
+    timeout = httpx.Timeout(config.read_timeout, connect=config.connect_timeout)
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
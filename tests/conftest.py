@@ -0,0 +1,47 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api import chess_engine_api, games_api, players_api
+from chess_app.session_registry import GameSessionRegistry
+from services.leaderboard import Leaderboard
+from services.sql_service import SqlStorageService, build_engine
+
+
+class FakeClock:
+    """Time source set by hand, advanced by `tick` seconds on each read if given."""
+
+    def __init__(self, now: float = 0.0, tick: float = 0.0):
+        self.now = now
+        self.tick = tick
+
+    def __call__(self):
+        self.now += self.tick
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return SqlStorageService(build_engine(f"sqlite:///{tmp_path / 'chess.db'}"))
+
+
+@pytest.fixture
+def api_storage(storage, monkeypatch):
+    """SQL storage used by the routers, with fresh sessions and leaderboard."""
+    for module in (chess_engine_api, players_api):
+        monkeypatch.setattr(module, "service", storage)
+    monkeypatch.setattr(games_api, "chess_api_manager", storage)
+    monkeypatch.setattr(chess_engine_api, "sessions", GameSessionRegistry())
+    monkeypatch.setattr(chess_engine_api, "leaderboard", Leaderboard())
+    return storage
+
+
+@pytest.fixture
+def client(api_storage):
+    from api.main import app
+
+    return TestClient(app)
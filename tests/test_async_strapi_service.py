@@ -0,0 +1,246 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from custom_errors.custom_errors import (
+    GameNotFoundError,
+    PlayernotFoundError,
+    StaleGameError,
+)
+from schemas.game import Game
+from schemas.pairing import Pairing
+from schemas.player import Player
+from services.async_strapi_service import AsyncStrapiApiService
+from services.transport import TransportConfig
+
+PLAYER = {"id": 1, "attributes": {"name": "Marius", "active_games": []}}
+GAME = {"id": 3, "attributes": {"is_active": False, "game_over": False}}
+
+
+def make_service(handler) -> AsyncStrapiApiService:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncStrapiApiService(
+        client=client, config=TransportConfig(max_retries=2, backoff_factor=0)
+    )
+
+
+def test_get_single_player():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["filters[name][$eq]"] == "Marius"
+        return httpx.Response(200, json={"data": [PLAYER]})
+
+    player = asyncio.run(make_service(handler).get_single_player("Marius"))
+
+    assert player.name == "Marius"
+    assert player.player_id == 1
+
+
+def test_get_single_player_no_player_found():
+    service = make_service(lambda request: httpx.Response(200, json={"data": []}))
+
+    with pytest.raises(PlayernotFoundError):
+        asyncio.run(service.get_single_player("Random"))
+
+
+def test_get_single_game_not_found():
+    service = make_service(lambda request: httpx.Response(404, json={"data": None}))
+
+    with pytest.raises(GameNotFoundError):
+        asyncio.run(service.get_single_game(42))
+
+
+def test_idempotent_calls_are_retried():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"data": GAME})
+
+    game = asyncio.run(make_service(handler).get_single_game(3))
+
+    assert game.game_id == 3
+    assert calls == ["GET", "GET", "GET"]
+
+
+def test_post_is_not_retried():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(503)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(make_service(handler).post_games(Game()))
+
+    assert calls == ["POST"]
+
+
+def test_add_player_to_game():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET" and request.url.path.endswith("/players"):
+            return httpx.Response(200, json={"data": [PLAYER]})
+        if request.method == "GET":
+            return httpx.Response(200, json={"data": GAME})
+        row_id = int(request.url.path.rsplit("/", 1)[1])
+        attributes = json.loads(request.content)["data"]
+        return httpx.Response(
+            200, json={"data": {"id": row_id, "attributes": attributes}}
+        )
+
+    game = asyncio.run(make_service(handler).add_player_to_game("Marius", 3))
+
+    assert game.game_id == 3
+    assert game.white_player.name == "Marius"
+    assert game.turn.name == "Marius"
+
+
+def test_get_games_walks_all_pages():
+    pages = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["pagination[page]"])
+        pages.append(page)
+        games = [{"id": page * 10 + i, "attributes": {}} for i in range(2)]
+        pagination = {"page": page, "pageSize": 2, "pageCount": 3, "total": 6}
+        return httpx.Response(
+            200, json={"data": games, "meta": {"pagination": pagination}}
+        )
+
+    games = asyncio.run(make_service(handler).get_games(page_size=2))
+
+    assert pages == [1, 2, 3]
+    assert [game.game_id for game in games] == [10, 11, 20, 21, 30, 31]
+
+
+def test_get_games_single_page():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["pagination[page]"] == "2"
+        return httpx.Response(200, json={"data": [GAME], "meta": {}})
+
+    games = asyncio.run(make_service(handler).get_games(page=2, page_size=10))
+
+    assert [game.game_id for game in games] == [3]
+
+
+def test_create_paired_games():
+    players = {"Alice": 1, "Bob": 2, "Carol": 3, "Dave": 4}
+    updated_players = {}
+    created_games = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            name = request.url.params["filters[name][$eq]"]
+            attributes = {"name": name, "active_games": []}
+            return httpx.Response(
+                200, json={"data": [{"id": players[name], "attributes": attributes}]}
+            )
+        attributes = json.loads(request.content)["data"]
+        if request.method == "POST":
+            created_games.append(attributes)
+            row_id = 100 + len(created_games)
+        else:
+            row_id = int(request.url.path.rsplit("/", 1)[1])
+            updated_players[attributes["name"]] = attributes["active_games"]
+        return httpx.Response(
+            200, json={"data": {"id": row_id, "attributes": attributes}}
+        )
+
+    pairings = [
+        Pairing(white="alice", black="bob"),
+        Pairing(white="carol", black="dave"),
+    ]
+    games = asyncio.run(make_service(handler).create_paired_games(pairings))
+
+    assert [(game.white_player.name, game.black_player.name) for game in games] == [
+        ("Alice", "Bob"),
+        ("Carol", "Dave"),
+    ]
+    assert all(game.is_active and game.turn == game.white_player for game in games)
+    assert sorted(updated_players) == ["Alice", "Bob", "Carol", "Dave"]
+    assert updated_players["Alice"] == [games[0].game_id]
+
+
+def test_update_game_with_a_stale_version():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json={"data": GAME})
+        assert json.loads(request.content)["data"]["version"] == 0
+        return httpx.Response(409, json={"data": None})
+
+    service = make_service(handler)
+    game = asyncio.run(service.get_single_game(3))
+
+    with pytest.raises(StaleGameError):
+        asyncio.run(service.update_game(game))
+    assert service.game_cache.get(3) is None
+
+
+def test_update_game_is_not_replayed_after_a_lost_response():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json={"data": GAME})
+        calls.append(request.method)
+        raise httpx.ReadTimeout("response lost", request=request)
+
+    service = make_service(handler)
+    game = asyncio.run(service.get_single_game(3))
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(service.update_game(game))
+    assert calls == ["PUT"]
+
+
+def test_update_game_is_retried_when_unsent():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json={"data": GAME})
+        calls.append(request.method)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(
+            200,
+            json={"data": {**GAME, "attributes": {**GAME["attributes"], "version": 1}}},
+        )
+
+    service = make_service(handler)
+    game = asyncio.run(service.get_single_game(3))
+
+    assert asyncio.run(service.update_game(game)).version == 1
+    assert calls == ["PUT", "PUT"]
+
+
+def test_update_player_rank_only_sends_the_rank():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "PUT"
+        assert json.loads(request.content) == {"data": {"rank": 1216}}
+        stored = {**PLAYER["attributes"], "rank": 1216, "active_games": [3]}
+        return httpx.Response(200, json={"data": {"id": 1, "attributes": stored}})
+
+    service = make_service(handler)
+    player = asyncio.run(
+        service.update_player_rank(Player(name="Marius", player_id=1), 1216)
+    )
+
+    assert (player.rank, player.active_games) == (1216, [3])
+    assert service.player_index.get("Marius").rank == 1216
+
+
+def test_game_read_during_its_delete_is_not_left_cached():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "DELETE":
+            # Another worker reads the game while it is being deleted.
+            service.game_cache.put(Game(game_id=3))
+        return httpx.Response(200, json={"data": GAME})
+
+    service = make_service(handler)
+    asyncio.run(service.delete_game(3))
+
+    assert service.game_cache.get(3) is None
@@ -0,0 +1,117 @@
+import asyncio
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from schemas.game import Game
+from schemas.player import Player
+from services.cache_backend import SqliteCacheBackend, build_cache_backend
+from services.game_cache import GameCache
+from services.player_index import PlayerIndex
+
+
+def test_sqlite_backend_expires_and_evicts_oldest_writes(tmp_path, clock):
+    backend = SqliteCacheBackend(
+        str(tmp_path / "cache.sqlite3"), "games", maxsize=2, prune_every=1, clock=clock
+    )
+    backend.set("1", b"one", ttl=10)
+    clock.now += 1
+    backend.set("2", b"two")
+    clock.now += 1
+    backend.set("3", b"three")
+
+    assert backend.get("1") is None
+    assert backend.evictions == 1
+    assert len(backend) == 2
+
+    backend.set("4", b"four", ttl=5)
+    clock.now += 6
+
+    assert backend.get("4") is None
+    assert backend.get("3") == b"three"
+
+
+def test_game_cache_is_shared_by_caches_on_the_same_file(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    worker_a = GameCache(backend=SqliteCacheBackend(path, "games"))
+    worker_b = GameCache(backend=SqliteCacheBackend(path, "games"))
+
+    worker_a.put(Game(game_id=1, version=4))
+
+    assert worker_b.get(1).version == 4
+
+    worker_b.invalidate(1)
+
+    assert worker_a.get(1) is None
+    assert worker_a.stats()["misses"] == 1
+
+
+def test_player_index_entries_expire(tmp_path, clock):
+    backend = SqliteCacheBackend(
+        str(tmp_path / "cache.sqlite3"), "players", clock=clock
+    )
+    index = PlayerIndex(backend=backend, ttl=300)
+
+    index.put(Player(name="Marius", player_id=1))
+    clock.now += 299
+    assert index.get_id("marius") == 1
+    clock.now += 1
+    assert index.get("marius") is None
+
+
+def test_player_index_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    index = PlayerIndex(backend=SqliteCacheBackend(path, "players"))
+    index.put(Player(name="Marius", player_id=7))
+
+    script = (
+        "from services.cache_backend import SqliteCacheBackend\n"
+        "from services.player_index import PlayerIndex\n"
+        f"index = PlayerIndex(backend=SqliteCacheBackend({path!r}, 'players'))\n"
+        "print(index.get_id('marius'))\n"
+        "index.remove('Marius')\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    ).stdout
+
+    assert output.strip() == "7"
+    assert index.get("Marius") is None
+
+
+def test_build_cache_backend_rejects_unknown_backends(monkeypatch):
+    monkeypatch.setenv("CACHE_BACKEND", "redis")
+
+    with pytest.raises(ValueError):
+        build_cache_backend("games")
+
+
+def test_async_calls_to_a_sqlite_backend_run_off_the_event_loop(tmp_path):
+    backend = SqliteCacheBackend(str(tmp_path / "cache.sqlite3"), "games")
+    cache = GameCache(backend=backend)
+    threads = []
+    original_get = backend.get
+
+    def recording_get(key):
+        threads.append(threading.get_ident())
+        return original_get(key)
+
+    backend.get = recording_get
+
+    async def round_trip():
+        await cache.aput(Game(game_id=1))
+        cached = await cache.aget(1)
+        await cache.ainvalidate(1)
+        return cached, await cache.aget(1)
+
+    cached, invalidated = asyncio.run(round_trip())
+    assert cached.game_id == 1 and invalidated is None
+    assert threads and threading.get_ident() not in threads
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -1,9 +1,15 @@
+import base64
+
 import chess
 import pytest
-from custom_errors.custom_errors import InvalidTurnError, InvalidMoveError
+from custom_errors.custom_errors import InvalidTurnError, InvalidMoveError, InvalidPlyError
 from schemas.game import Game
 from schemas.player import Player
+from chess_app import chess_engine
 from chess_app.chess_engine import ChessGame
+from chess_app.legal_move_cache import LegalMoveCache
+from chess_app.move_log import decode_moves, encode_moves
+from chess_app.pgn import movetext_to_moves
 
 
 @pytest.fixture
@@ -74,6 +80,59 @@ def test_is_game_over(default_game):
     assert default_game.is_game_over()
 
 
+def test_checkmate_result(default_game):
+    white, black = default_game.white_player, default_game.black_player
+    for move, player in zip(("f3", "e5", "g4", "Qh4#"), (white, black, white, black)):
+        default_game.move(move, player)
+
+    result = default_game.game.result
+    assert default_game.game.game_over and not default_game.game.is_active
+    assert (result.result, result.termination) == ("0-1", "checkmate")
+    assert default_game.game.winner == result.winner == black
+
+
+def test_threefold_repetition_ends_the_game(default_game):
+    shuffle = ["Nf3", "Nf6", "Ng1", "Ng8"]
+
+    with pytest.raises(InvalidPlyError) as err:
+        default_game.play_moves(shuffle * 2 + ["e4"])
+    assert err.value.ply == 9
+
+    default_game.play_moves(shuffle * 2)
+
+    result = default_game.game.result
+    assert (result.result, result.termination, result.winner) == (
+        "1/2-1/2",
+        "threefold_repetition",
+        None,
+    )
+    assert default_game.game.winner is None
+
+
+def test_fifty_move_rule_ends_the_game(default_game):
+    default_game.set_board("8/8/4k3/8/8/4K3/8/4R3 w - - 99 80")
+    default_game.move("Ra1", default_game.white_player)
+
+    assert default_game.game.result.termination == "fifty_moves"
+
+
+def test_outcome_evaluated_once_per_ply(default_game, monkeypatch):
+    calls = []
+    evaluate_outcome = chess_engine.evaluate_outcome
+    monkeypatch.setattr(
+        chess_engine,
+        "evaluate_outcome",
+        lambda board: calls.append(board.fen()) or evaluate_outcome(board),
+    )
+
+    default_game.move("e4", default_game.white_player)
+    default_game.move("e5", default_game.black_player)
+    default_game.play_moves(["Nf3", "Nc6"])
+
+    # The starting position, then each of the four positions reached.
+    assert len(calls) == 5
+
+
 def tests_get_legal_move(default_game):
     legal_moves = [
         "g1h3",
@@ -107,4 +166,108 @@ def test_move(default_game):
     default_game.move("e4", default_game.white_player)
     
     assert default_game.game.fen == fen_with_e4_as_first_move
-    assert default_game.game.turn == default_game.game.black_player
\ No newline at end of file
+    assert default_game.game.turn == default_game.game.black_player
+
+def test_legal_moves_cached_across_games(default_game):
+    cache = LegalMoveCache()
+    default_game.legal_move_cache = cache
+    other_game = ChessGame(game=default_game.game.model_copy(deep=True))
+    other_game.legal_move_cache = cache
+
+    assert default_game.get_legal_move() == other_game.get_legal_move()
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_legal_moves_follow_the_position(default_game):
+    default_game.legal_move_cache = LegalMoveCache()
+    opening_key = default_game.position_key()
+    default_game.get_legal_move()
+
+    default_game._execute_move("e4")
+
+    assert default_game.position_key() != opening_key
+    assert "e7e5" in default_game.get_legal_move()
+
+
+def test_legal_move_cache_eviction():
+    cache = LegalMoveCache(maxsize=1)
+    cache.get_or_compute(1, lambda: ["e2e4"])
+    cache.get_or_compute(2, lambda: ["d2d4"])
+
+    assert cache.get_or_compute(1, lambda: ["c2c4"]) == ("c2c4",)
+    assert cache.stats()["evictions"] == 2
+
+
+def test_play_moves(default_game):
+    default_game.play_moves(["e4", "e7e5", "Nf3"])
+
+    assert default_game.game.fen == (
+        "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2"
+    )
+    assert default_game.game.turn == default_game.black_player
+    assert len(default_game.board.move_stack) == 3
+
+
+def test_play_moves_reports_first_invalid_ply(default_game):
+    with pytest.raises(InvalidPlyError) as err:
+        default_game.play_moves(["e4", "e5", "Ke3", "Nf6"])
+
+    assert err.value.ply == 3
+    assert default_game.board.fen() == default_game.game.fen
+    assert default_game.board.move_stack == []
+
+
+def test_null_moves_are_rejected(default_game):
+    with pytest.raises(InvalidPlyError) as err:
+        default_game.play_moves(["e4", "--", "d4"])
+    assert err.value.ply == 2
+    with pytest.raises(InvalidPlyError):
+        default_game.play_moves(["0000"])
+    with pytest.raises(InvalidMoveError):
+        default_game._execute_move("--")
+
+    assert default_game.board.move_stack == []
+
+
+def test_movetext_to_moves():
+    pgn = '[Event "Casual"]\n\n1. e4 e5 2.Nf3 {main line} (2. Bc4 Nf6) Nc6 $1 3. Bb5!? a6 *'
+
+    assert movetext_to_moves(pgn) == ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6"]
+
+
+def test_validate_player_turn_ignores_outdated_snapshot(default_game):
+    white_player = Player(name=default_game.white_player.name, active_games=[1, 2])
+
+    default_game._validate_player_turn(white_player)
+
+
+def test_move_log_round_trip():
+    board = chess.Board()
+    for move in ["e4", "d5", "exd5", "c6", "dxc6", "Nf6", "cxb7", "Nbd7", "bxa8=Q"]:
+        board.push_san(move)
+
+    move_log = encode_moves(board.move_stack)
+
+    assert len(base64.b64decode(move_log)) == 2 * len(board.move_stack)
+    assert decode_moves(move_log) == board.move_stack
+
+
+def test_board_rehydrated_from_move_log(default_game):
+    default_game.play_moves(["Nf3", "Nf6", "Ng1", "Ng8", "Nf3", "Nf6", "Ng1", "Ng8"])
+
+    rehydrated_game = ChessGame(game=default_game.game.model_copy(deep=True))
+
+    assert rehydrated_game.board.move_stack == default_game.board.move_stack
+    assert rehydrated_game.board.can_claim_threefold_repetition()
+
+
+def test_game_without_move_log_starts_log_from_its_fen(default_game):
+    fen = "rnbqkbnr/pp2pppp/2p5/3p4/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 0 1"
+    game = default_game.game.model_copy(update={"fen": fen})
+
+    chess_game = ChessGame(game=game)
+    chess_game.move("exd5", chess_game.white_player)
+
+    assert game.start_fen == fen
+    assert ChessGame(game=game.model_copy()).board.move_stack == chess_game.board.move_stack
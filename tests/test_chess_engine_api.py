@@ -0,0 +1,168 @@
+import asyncio
+import json
+from typing import List
+
+import chess
+import httpx
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from api import chess_engine_api
+from custom_errors.custom_errors import StaleGameError
+from metrics.metrics import GAMES_COMPLETED
+
+
+def test_batch_ending_a_game_without_players(client):
+    game_id = client.post("/games/").json()["game_id"]
+
+    response = client.post(
+        f"/games/{game_id}/moves", json={"pgn": "1. f3 e5 2. g4 Qh4#"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["result"]["termination"] == "checkmate"
+
+
+def test_batch_rejected_on_a_seated_game(client):
+    game_id = client.post("/games/").json()["game_id"]
+    client.post("/players/alice")
+    client.patch(f"/games/{game_id}/alice")
+
+    response = client.post(f"/games/{game_id}/moves", json={"moves": ["e4", "e5"]})
+
+    assert response.status_code == 403
+    assert client.get(f"/games/{game_id}").json()["move_log"] == ""
+
+
+def test_legal_moves_of_an_unknown_game(client):
+    assert client.get("/games/move/9999").status_code == 404
+
+
+def _seated_game(client) -> int:
+    game_id = client.post("/games/").json()["game_id"]
+    for name in ("alice", "bob"):
+        client.post(f"/players/{name}")
+        client.patch(f"/games/{game_id}/{name}")
+    return game_id
+
+
+def _first_mover(client, game_id: int) -> str:
+    return client.get(f"/games/{game_id}").json()["turn"]["name"]
+
+
+def test_websocket_sends_the_state_then_each_move(client):
+    with client:
+        game_id = _seated_game(client)
+        player = _first_mover(client, game_id)
+        with client.websocket_connect(f"/games/{game_id}/ws") as websocket:
+            state = websocket.receive_json()
+            assert state["game_id"] == game_id
+            assert state["fen"] == chess.STARTING_FEN
+            assert len(state["legal_moves"]) == 20
+
+            client.patch(
+                f"/games/{game_id}", json={"player_name": player, "move": "e4"}
+            )
+
+            event = websocket.receive_json()
+            assert event["last_move"] == "e2e4"
+            assert event["turn"]["name"] != player
+
+
+def test_websocket_of_an_unknown_game_is_closed(client):
+    with pytest.raises(WebSocketDisconnect) as disconnect:
+        with client.websocket_connect("/games/9999/ws") as websocket:
+            websocket.receive_json()
+
+    assert disconnect.value.code == 1008
+
+
+def test_events_stream_the_state_then_each_move(client):
+    from api.main import app
+
+    game_id = _seated_game(client)
+    player = _first_mover(client, game_id)
+
+    async def stream() -> List[str]:
+        # The test client buffers whole responses, so the stream is read from the
+        # ASGI messages directly.
+        chunks: "asyncio.Queue[str]" = asyncio.Queue()
+        done = asyncio.Event()
+        requested = False
+
+        async def receive() -> dict:
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            if message["type"] == "http.response.body" and message.get("body"):
+                await chunks.put(message["body"].decode())
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/games/{game_id}/events",
+            "raw_path": f"/games/{game_id}/events".encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        response = asyncio.create_task(app(scope, receive, send))
+        events = [await asyncio.wait_for(chunks.get(), 5)]
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+        ) as http:
+            await http.patch(
+                f"/games/{game_id}", json={"player_name": player, "move": "e4"}
+            )
+        events.append(await asyncio.wait_for(chunks.get(), 5))
+        done.set()
+        await asyncio.wait_for(response, 5)
+        return events
+
+    state, move = asyncio.run(stream())
+
+    assert state.startswith("event: state\ndata: ")
+    assert json.loads(state.split("data: ", 1)[1])["fen"] == chess.STARTING_FEN
+    assert move.startswith("event: move\ndata: ")
+    assert json.loads(move.split("data: ", 1)[1])["last_move"] == "e2e4"
+
+
+def test_events_of_an_unknown_game(client):
+    assert client.get("/games/9999/events").status_code == 404
+
+
+def test_game_ended_by_a_retried_move_is_counted_once(client, monkeypatch):
+    game_id = _seated_game(client)
+    storage = chess_engine_api.service
+    update_game = storage.update_game
+    stale_writes = []
+
+    async def stale_once(game):
+        if game.game_over and not stale_writes:
+            stale_writes.append(game.game_id)
+            raise StaleGameError(f"Game {game.game_id} was updated meanwhile")
+        return await update_game(game)
+
+    first = _first_mover(client, game_id)
+    second = "bob" if first.lower() == "alice" else "alice"
+    for move, player in zip(("f3", "e5", "g4"), (first, second, first)):
+        client.patch(f"/games/{game_id}", json={"player_name": player, "move": move})
+    monkeypatch.setattr(storage, "update_game", stale_once)
+    black_wins = GAMES_COMPLETED.value(result="0-1")
+
+    response = client.patch(
+        f"/games/{game_id}", json={"player_name": second, "move": "Qh4#"}
+    )
+
+    assert response.json()["game_over"] and stale_writes == [game_id]
+    assert GAMES_COMPLETED.value(result="0-1") == black_wins + 1
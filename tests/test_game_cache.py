@@ -0,0 +1,45 @@
+from schemas.game import Game
+from services.game_cache import GameCache
+
+
+def test_put_and_get_returns_a_copy():
+    cache = GameCache()
+    cache.put(Game(game_id=1))
+
+    cached_game = cache.get(1)
+    cached_game.fen = "8/8/8/8/8/8/8/8 w - - 0 1"
+
+    assert cache.get(1).fen == Game().fen
+    assert cache.stats()["hits"] == 2
+
+
+def test_miss_and_expiry(clock):
+    cache = GameCache(ttl=10, clock=clock)
+    cache.put(Game(game_id=1))
+
+    clock.now = 11
+
+    assert cache.get(1) is None
+    assert cache.get(2) is None
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction():
+    cache = GameCache(maxsize=2)
+    cache.put(Game(game_id=1))
+    cache.put(Game(game_id=2))
+    cache.get(1)
+    cache.put(Game(game_id=3))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate():
+    cache = GameCache()
+    cache.put(Game(game_id=1))
+    cache.invalidate(1)
+
+    assert cache.get(1) is None
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from api.chess_engine_api import MOVE_ATTEMPTS, _serialized
+from api.dependencies import game_locks
+from api.game_locks import GameLocks
+from custom_errors.custom_errors import StaleGameError
+from schemas.game import Game
+
+
+def test_requests_on_a_game_are_serialized():
+    locks = GameLocks()
+    events = []
+
+    async def request(game_id: int, name: str) -> None:
+        async with locks.hold(game_id):
+            events.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name} end")
+
+    async def main() -> None:
+        await asyncio.gather(request(1, "a"), request(1, "b"), request(2, "c"))
+
+    asyncio.run(main())
+
+    assert events.index("a end") < events.index("b start")
+    assert events.index("c start") < events.index("a end")
+    assert len(locks) == 0
+
+
+def test_stale_writes_are_retried():
+    attempts = []
+
+    async def apply() -> Game:
+        attempts.append(len(game_locks))
+        if len(attempts) == 1:
+            raise StaleGameError("game 7 was updated")
+        return Game(game_id=7, version=2)
+
+    game = asyncio.run(_serialized(7, apply))
+
+    assert game.version == 2
+    assert attempts == [1, 1]
+    assert len(game_locks) == 0
+
+
+def test_conflict_after_too_many_stale_writes():
+    attempts = []
+
+    async def apply() -> Game:
+        attempts.append(1)
+        raise StaleGameError("game 7 was updated")
+
+    with pytest.raises(HTTPException) as err:
+        asyncio.run(_serialized(7, apply))
+
+    assert err.value.status_code == 409
+    assert len(attempts) == MOVE_ATTEMPTS
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from api import chess_engine_api
+from chess_app.rating import rate_game
+from schemas.game import Game
+from schemas.game_result import GameResult
+from schemas.player import Player, PlayerRef
+from services.leaderboard import Leaderboard
+
+
+def test_rate_game_exchanges_rating_points():
+    assert rate_game(1200, 1200, "1-0") == (1216, 1184)
+    assert rate_game(1200, 1200, "1/2-1/2") == (1200, 1200)
+    assert rate_game(1600, 1200, "0-1", k_factor=16) == (1585, 1215)
+    with pytest.raises(ValueError):
+        rate_game(1200, 1200, "*")
+
+
+def test_ranks_and_pages():
+    leaderboard = Leaderboard()
+    leaderboard.load(
+        [
+            Player(name="Alice", player_id=1, rank=1300),
+            Player(name="Bob", player_id=2, rank=1250),
+            Player(name="Carol", player_id=3, rank=1300),
+            Player(name="Dave", player_id=4),
+        ]
+    )
+
+    assert [(entry.rank, entry.name) for entry in leaderboard.top(3)] == [
+        (1, "Alice"),
+        (1, "Carol"),
+        (3, "Bob"),
+    ]
+    assert leaderboard.rank_of("dave").rank == 4
+
+    leaderboard.put(Player(name="Dave", player_id=4, rank=1400))
+    leaderboard.remove("Alice")
+
+    assert [entry.name for entry in leaderboard.top(2, offset=1)] == ["Carol", "Bob"]
+    assert leaderboard.rank_of("Dave").rating == 1400
+    assert leaderboard.rank_of("Alice") is None
+    assert len(leaderboard) == 3
+
+
+def test_reloaded_once_stale(clock):
+    leaderboard = Leaderboard(ttl=60, clock=clock)
+
+    assert leaderboard.is_stale()
+    leaderboard.load([])
+    clock.now = 59
+    assert not leaderboard.is_stale()
+    clock.now = 60
+    assert leaderboard.is_stale()
+
+
+def test_finished_game_rates_its_players(api_storage):
+    storage = api_storage
+    white = asyncio.run(storage.post_players(Player(name="White")))
+    black = asyncio.run(storage.post_players(Player(name="Black")))
+    game = Game(
+        white_player=PlayerRef.of(white),
+        black_player=PlayerRef.of(black),
+        game_over=True,
+        result=GameResult(
+            result="0-1", termination="checkmate", winner=PlayerRef.of(black)
+        ),
+    )
+
+    asyncio.run(chess_engine_api._rate_players(game))
+
+    assert asyncio.run(storage.get_single_player("White")).rank == 1184
+    assert asyncio.run(storage.get_single_player("Black")).rank == 1216
+    top = chess_engine_api.leaderboard.top(2)
+    assert [entry.name for entry in top] == ["Black", "White"]
+
+
+def test_rating_keeps_a_game_joined_meanwhile(storage):
+    snapshot = asyncio.run(storage.post_players(Player(name="White")))
+    game = asyncio.run(storage.post_games(Game()))
+    asyncio.run(storage.add_player_to_game("White", game.game_id))
+
+    rated = asyncio.run(storage.update_player_rank(snapshot, 1216))
+
+    assert rated.rank == 1216
+    assert rated.active_games == [game.game_id]
@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+
+from api import games_api
+from api.matchmaking import MatchmakingQueue
+from metrics.metrics import MATCHMAKING_WAIT
+from schemas.player import Player
+
+
+def test_players_are_paired_with_the_nearest_bucket(clock):
+    clock.tick = 1
+
+    async def main():
+        queue = MatchmakingQueue(bucket_width=100, max_spread=1, clock=clock)
+        queue.enqueue(Player(name="Low", rank=1200))
+        queue.enqueue(Player(name="High", rank=1450))
+        queue.enqueue(Player(name="Higher", rank=1420))
+
+        assert queue.pop_opponent(Player(name="Far", rank=1700)) is None
+        assert queue.pop_opponent(Player(name="Mid", rank=1390)).player.name == "Low"
+        assert queue.pop_opponent(Player(name="Top", rank=1590)).player.name == "High"
+        assert "higher" in queue and len(queue) == 1
+
+    asyncio.run(main())
+
+
+def test_matchmaking_endpoint_seats_both_players(api_storage):
+    from api.main import app
+
+    storage = api_storage
+    matched = MATCHMAKING_WAIT.count(outcome="matched")
+    timeouts = MATCHMAKING_WAIT.count(outcome="timeout")
+
+    async def main():
+        for name in ("Alice", "Bob", "Carol"):
+            await storage.post_players(Player(name=name))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            waiting = asyncio.create_task(client.post("/matchmaking/alice"))
+            while "Alice" not in games_api.matchmaking:
+                await asyncio.sleep(0.01)
+            duplicate = await client.post("/matchmaking/alice")
+            paired, waited = await asyncio.gather(
+                client.post("/matchmaking/bob"), waiting
+            )
+            lonely = await client.post("/matchmaking/carol", params={"timeout": 0.05})
+        return duplicate, paired, waited, lonely
+
+    duplicate, paired, waited, lonely = asyncio.run(main())
+
+    assert duplicate.status_code == 409
+    assert paired.json() == waited.json()
+    game = paired.json()
+    assert game["is_active"]
+    assert (game["white_player"]["name"], game["black_player"]["name"]) == (
+        "Alice",
+        "Bob",
+    )
+    assert lonely.status_code == 204
+    assert len(games_api.matchmaking) == 0
+    assert MATCHMAKING_WAIT.count(outcome="matched") == matched + 2
+    assert MATCHMAKING_WAIT.count(outcome="timeout") == timeouts + 1
+    alice = asyncio.run(storage.get_single_player("Alice"))
+    assert alice.active_games == [game["game_id"]]
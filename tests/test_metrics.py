@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from chess_app.chess_engine import ChessGame
+from custom_errors.custom_errors import InvalidMoveError
+from metrics.metrics import (
+    ENGINE_LATENCY,
+    ILLEGAL_MOVES,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    instrument_methods,
+)
+from schemas.game import Game
+from schemas.player import Player
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram(
+        "duration_seconds", "Durations.", ("route",), buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, route="/games")
+    registry = MetricsRegistry()
+    registry.register(histogram)
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == [
+        "# HELP duration_seconds Durations.",
+        "# TYPE duration_seconds histogram",
+    ]
+    assert lines[2:] == [
+        'duration_seconds_bucket{route="/games",le="0.1"} 2',
+        'duration_seconds_bucket{route="/games",le="1.0"} 3',
+        'duration_seconds_bucket{route="/games",le="+Inf"} 4',
+        'duration_seconds_sum{route="/games"} 3.65',
+        'duration_seconds_count{route="/games"} 4',
+    ]
+
+
+def test_counter_requires_its_labels():
+    counter = Counter("moves_total", "Moves.", ("result",))
+    counter.inc(result="1-0")
+    counter.inc(2, result="1-0")
+
+    assert counter.value(result="1-0") == 3
+    assert list(counter.samples()) == ['moves_total{result="1-0"} 3']
+    with pytest.raises(ValueError):
+        counter.inc()
+
+
+def test_instrument_methods_times_sync_and_async_methods():
+    histogram = Histogram("calls_seconds", "Calls.", ("backend", "method"))
+
+    @instrument_methods(histogram, backend="fake")
+    class Service:
+        def get(self):
+            return 1
+
+        async def fetch(self):
+            return 2
+
+        async def iterate(self):
+            yield 3
+
+        def _private(self):
+            return 4
+
+    service = Service()
+
+    assert service.get() == 1
+    assert asyncio.run(service.fetch()) == 2
+    assert histogram.count(backend="fake", method="get") == 1
+    assert histogram.count(backend="fake", method="fetch") == 1
+    assert histogram.count(backend="fake", method="iterate") == 0
+    assert histogram.count(backend="fake", method="_private") == 0
+
+
+def test_engine_counts_illegal_moves():
+    white, black = Player(name="White"), Player(name="Black")
+    chess_game = ChessGame(
+        game=Game(white_player=white, black_player=black, turn=white)
+    )
+    illegal_moves = ILLEGAL_MOVES.value()
+    moves = ENGINE_LATENCY.count(operation="move")
+
+    with pytest.raises(InvalidMoveError):
+        chess_game.move("e5", white)
+    for move, player in zip(("f3", "e5", "g4", "Qh4#"), (white, black, white, black)):
+        chess_game.move(move, player)
+
+    assert ILLEGAL_MOVES.value() == illegal_moves + 1
+    assert ENGINE_LATENCY.count(operation="move") == moves + 5
+
+
+def test_metrics_endpoint_reports_routes_by_template():
+    from api.main import app
+
+    client = TestClient(app)
+    client.get("/")
+    client.get("/games/not-a-number")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/",status="200"}'
+        in body
+    )
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/games/{game_id}",status="422"}'
+        in body
+    )
+    assert 'cache_requests_total{cache="legal_moves",result="hit"}' in body
@@ -0,0 +1,44 @@
+import asyncio
+
+from api.move_hub import MoveHub
+from schemas.move_event import MoveEvent
+
+
+def event(game_id: int, fen: str = "8/8/8/8/8/8/8/8 w - - 0 1") -> MoveEvent:
+    return MoveEvent(game_id=game_id, fen=fen)
+
+
+def test_events_reach_the_subscribers_of_their_game():
+    async def scenario():
+        hub = MoveHub()
+        with hub.subscribe(1) as first, hub.subscribe(1) as second, hub.subscribe(
+            2
+        ) as other:
+            assert hub.publish(event(1)) == 2
+            assert (await first.get()).game_id == 1
+            assert (await second.get()).game_id == 1
+            assert other._queue.empty()
+
+    asyncio.run(scenario())
+
+
+def test_lagging_subscriber_keeps_latest_events():
+    async def scenario():
+        hub = MoveHub(queue_size=2)
+        with hub.subscribe(1) as subscription:
+            for fen in ("a", "b", "c"):
+                hub.publish(event(1, fen))
+            assert subscription.dropped == 1
+            assert [(await subscription.get()).fen for _ in range(2)] == ["b", "c"]
+
+    asyncio.run(scenario())
+
+
+def test_unsubscribe_on_exit():
+    hub = MoveHub()
+    with hub.subscribe(1):
+        assert hub.has_subscribers(1)
+
+    assert not hub.has_subscribers(1)
+    assert hub.publish(event(1)) == 0
+    assert hub.stats() == {"games": 0, "subscribers": 0, "published": 1}
@@ -0,0 +1,63 @@
+import chess
+import pytest
+
+from chess_app.chess_engine import ChessGame
+from chess_app.opening_book import OpeningBook, build_book
+from schemas.game import Game
+
+PGN = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. O-O Nf6 1-0
+
+[Result "0-1"]
+
+1. e4 c5 2. Nf3 d6 0-1
+
+[Result "1/2-1/2"]
+
+1. d4 d5 2. c4 e6 1/2-1/2
+"""
+
+
+@pytest.fixture
+def book(tmp_path):
+    pgn_path = tmp_path / "games.pgn"
+    pgn_path.write_text(PGN)
+    book_path = tmp_path / "book.bin"
+    build_book([str(pgn_path)], str(book_path), max_ply=8)
+    book = OpeningBook(str(book_path))
+    yield book
+    book.close()
+
+
+def test_book_moves_weighted_by_results(book):
+    moves = book.get_moves(chess.Board())
+
+    assert [(move.san, move.weight) for move in moves] == [("e4", 2), ("d4", 1)]
+
+
+def test_book_castling_is_translated(book):
+    board = chess.Board()
+    for move in ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6"]:
+        board.push_san(move)
+
+    assert [move.move for move in book.get_moves(board)] == ["e1g1"]
+
+
+def test_moves_only_played_in_losses_are_not_suggested(book):
+    board = chess.Board()
+    for move in ["e4", "c5"]:
+        board.push_san(move)
+
+    assert book.get_moves(board) == []
+    assert len(book) == 15
+
+
+def test_chess_game_book_moves(book, monkeypatch):
+    monkeypatch.setattr(ChessGame, "opening_book", book)
+    chess_game = ChessGame(game=Game())
+
+    assert chess_game.get_book_moves()[0].san == "e4"
+
+    monkeypatch.setattr(ChessGame, "opening_book", None)
+    assert chess_game.get_book_moves() == []
@@ -0,0 +1,70 @@
+import asyncio
+
+import chess
+
+from chess_app.analysis_pool import AnalysisPool
+from chess_app.search import analyse, evaluate
+
+SCHOLARS_MATE = "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
+HANGING_QUEEN = "rnb1kbnr/pppp1ppp/8/4p3/4P2q/5N2/PPPP1PPP/RNBQKB1R w KQkq - 0 3"
+
+
+def test_evaluate_is_symmetric():
+    board = chess.Board()
+
+    assert evaluate(board) == 0
+    board.push_san("e4")
+    assert evaluate(board) == evaluate(board.mirror()) < 0
+
+
+def test_analyse_finds_mate_in_one():
+    board = chess.Board(SCHOLARS_MATE)
+
+    result = analyse(board, max_depth=3, time_limit=5)
+
+    assert result.best_move_san == "Qxf7#"
+    assert result.mate == 1
+    assert result.nodes > 0 and result.nps > 0
+    assert board.fen() == SCHOLARS_MATE
+
+
+def test_analyse_wins_material():
+    result = analyse(chess.Board(HANGING_QUEEN), max_depth=3, time_limit=5)
+
+    assert result.best_move == "f3h4"
+    assert result.score_cp > 500
+    assert result.pv[0] == result.best_move
+
+
+def test_analyse_stops_at_time_limit():
+    board = chess.Board()
+    board.push_san("e4")
+
+    result = analyse(board, max_depth=30, time_limit=0.2)
+
+    assert result.best_move is not None
+    assert result.depth < 30
+    assert result.time_ms < 1000
+    assert board.move_stack == [chess.Move.from_uci("e2e4")]
+
+
+def test_analyse_game_over():
+    board = chess.Board()
+    for move in ["f3", "e5", "g4", "Qh4#"]:
+        board.push_san(move)
+
+    result = analyse(board, max_depth=3, time_limit=1)
+
+    assert result.best_move is None
+    assert result.mate == 0
+
+
+def test_pool_clamps_budget_and_runs_in_worker():
+    pool = AnalysisPool(max_workers=1, max_depth=2, max_time=1.0)
+    try:
+        result = asyncio.run(pool.analyse(chess.Board(HANGING_QUEEN), depth=10))
+    finally:
+        pool.shutdown()
+
+    assert result.depth <= 2
+    assert result.best_move == "f3h4"
@@ -0,0 +1,23 @@
+import json
+
+from api.responses import ModelResponse
+from schemas.game import Game
+from schemas.player import Player
+from services.serialization import strapi_payload
+
+
+def test_strapi_payload_matches_model_dump():
+    player = Player(name="Marius", player_id=1, friends=[Player(name="Bob")])
+
+    assert json.loads(strapi_payload(player)) == {
+        "data": player.model_dump(mode="json")
+    }
+
+
+def test_model_response_renders_models_in_containers():
+    game = Game(game_id=1, white_player=Player(name="Marius", player_id=1))
+
+    response = ModelResponse({"games": [game]})
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"games": [game.model_dump(mode="json")]}
@@ -0,0 +1,61 @@
+import pytest
+
+from chess_app.session_registry import GameSessionRegistry
+from schemas.game import Game
+from schemas.player import Player
+
+
+@pytest.fixture
+def stored_game():
+    player_1 = Player(name="Player1")
+    player_2 = Player(name="Player2")
+    return Game(
+        game_id=1,
+        white_player=player_1,
+        black_player=player_2,
+        turn=player_1,
+    )
+
+
+def test_warm_session_keeps_move_stack(stored_game):
+    registry = GameSessionRegistry()
+    chess_game = registry.get(stored_game)
+    updated_game = chess_game.move("e4", stored_game.white_player)
+
+    warm_game = registry.get(updated_game.model_copy(deep=True))
+
+    assert warm_game is chess_game
+    assert [move.uci() for move in warm_game.board.move_stack] == ["e2e4"]
+    assert registry.warm_hits == 1
+
+
+def test_session_rehydrated_when_fen_differs(stored_game):
+    registry = GameSessionRegistry()
+    chess_game = registry.get(stored_game.model_copy(deep=True))
+    chess_game.move("e4", stored_game.white_player)
+
+    # The write failed: storage still holds the starting position.
+    rehydrated_game = registry.get(stored_game)
+
+    assert rehydrated_game is not chess_game
+    assert rehydrated_game.board.move_stack == []
+    assert registry.rehydrations == 2
+
+
+def test_idle_sessions_are_evicted(stored_game, clock):
+    registry = GameSessionRegistry(idle_timeout=60, clock=clock)
+    registry.get(stored_game)
+
+    clock.now = 61
+
+    assert registry.evict_idle() == 1
+    assert 1 not in registry
+
+
+def test_least_recently_used_session_is_evicted(stored_game):
+    registry = GameSessionRegistry(max_sessions=1)
+    registry.get(stored_game)
+    registry.get(Game(game_id=2))
+
+    assert 1 not in registry
+    assert len(registry) == 1
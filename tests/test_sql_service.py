@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+
+from custom_errors.custom_errors import (
+    GameIsFullError,
+    GameNotFoundError,
+    NameAlreadyExistsError,
+    PlayernotFoundError,
+    StaleGameError,
+)
+from schemas.game import Game
+from schemas.pairing import Pairing
+from schemas.player import Player, PlayerRef
+from services.sql_service import SqlStorageService, build_engine
+from sqlalchemy import text
+
+
+def test_post_and_get_player(storage):
+    asyncio.run(storage.post_players(Player(name="marius")))
+
+    player = asyncio.run(storage.get_single_player("Marius"))
+
+    assert player.name == "Marius"
+    assert player.player_id == 1
+
+
+def test_post_player_name_already_exists(storage):
+    asyncio.run(storage.post_players(Player(name="Marius")))
+
+    with pytest.raises(NameAlreadyExistsError):
+        asyncio.run(storage.post_players(Player(name="marius")))
+
+
+def test_get_single_player_not_found(storage):
+    with pytest.raises(PlayernotFoundError):
+        asyncio.run(storage.get_single_player("Random"))
+
+
+def test_join_game_and_delete_it(storage):
+    asyncio.run(storage.post_players(Player(name="Alice")))
+    asyncio.run(storage.post_players(Player(name="Bob")))
+    game = asyncio.run(storage.post_games(Game()))
+
+    asyncio.run(storage.add_player_to_game("alice", game.game_id))
+    game = asyncio.run(storage.add_player_to_game("bob", game.game_id))
+
+    assert game.is_active
+    assert game.turn.name == "Alice"
+    assert asyncio.run(storage.get_single_player("Bob")).active_games == [game.game_id]
+    with pytest.raises(GameIsFullError):
+        asyncio.run(storage.add_player_to_game("alice", game.game_id))
+
+    asyncio.run(storage.delete_game(game.game_id))
+
+    assert asyncio.run(storage.get_single_player("Alice")).active_games == []
+    with pytest.raises(GameNotFoundError):
+        asyncio.run(storage.get_single_game(game.game_id))
+
+
+def test_pagination_and_bulk_creation(storage):
+    for name in ("Alice", "Bob", "Carol", "Dave"):
+        asyncio.run(storage.post_players(Player(name=name)))
+    pairings = [
+        Pairing(white="Alice", black="Bob"),
+        Pairing(white="Carol", black="Dave"),
+    ]
+    games = asyncio.run(storage.create_paired_games(pairings * 3))
+
+    async def walk():
+        return [game.game_id async for game in storage.iter_games(page_size=4)]
+
+    assert asyncio.run(walk()) == [1, 2, 3, 4, 5, 6]
+    second_page = asyncio.run(storage.get_games(page=2, page_size=4))
+    assert [game.game_id for game in second_page] == [5, 6]
+    carol_games = [game.game_id for game in games if game.white_player.name == "Carol"]
+    assert asyncio.run(storage.get_single_player("Carol")).active_games == carol_games
+
+
+def test_games_reference_their_players(storage):
+    asyncio.run(
+        storage.post_players(Player(name="Alice", friends=[Player(name="Bob")]))
+    )
+    asyncio.run(storage.post_players(Player(name="Bob")))
+    game = asyncio.run(
+        storage.create_paired_games([Pairing(white="Alice", black="Bob")])
+    )[0]
+
+    stored_game = asyncio.run(storage.get_single_game(game.game_id))
+
+    assert stored_game.white_player == PlayerRef(player_id=1, name="Alice")
+    assert stored_game.turn == stored_game.white_player
+
+
+def test_get_players_by_name(storage):
+    asyncio.run(storage.post_players(Player(name="Alice")))
+
+    players = asyncio.run(
+        storage.get_players_by_name(["alice", "Alice", "Bob"], missing_ok=True)
+    )
+
+    assert list(players) == ["Alice"]
+    with pytest.raises(PlayernotFoundError):
+        asyncio.run(storage.get_players_by_name(["Alice", "Bob"]))
+
+
+def test_update_game_is_a_compare_and_set(tmp_path):
+    # Two services on one database, as two API workers.
+    database_url = f"sqlite:///{tmp_path / 'chess.db'}"
+    worker_1 = SqlStorageService(build_engine(database_url))
+    worker_2 = SqlStorageService(build_engine(database_url))
+    game = asyncio.run(worker_1.post_games(Game()))
+    read_1 = asyncio.run(worker_1.get_single_game(game.game_id))
+    read_2 = asyncio.run(worker_2.get_single_game(game.game_id))
+
+    read_1.fen = "8/8/8/8/8/8/8/K6k w - - 0 1"
+    updated = asyncio.run(worker_1.update_game(read_1))
+    read_2.is_active = True
+
+    assert (read_1.version, updated.version) == (0, 1)
+    with pytest.raises(StaleGameError):
+        asyncio.run(worker_2.update_game(read_2))
+    stored = asyncio.run(worker_2.get_single_game(game.game_id))
+    assert (stored.fen, stored.is_active, stored.version) == (read_1.fen, False, 1)
+    with pytest.raises(GameNotFoundError):
+        asyncio.run(worker_2.update_game(Game(game_id=42)))
+
+
+def test_columns_added_to_existing_table(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'chess.db'}")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE games (id INTEGER PRIMARY KEY, is_active BOOLEAN, white_player JSON, "
+                "black_player JSON, turn JSON, fen VARCHAR(100), start_fen VARCHAR(100), "
+                "move_log TEXT, game_over BOOLEAN, winner JSON)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO games (id, is_active, fen, move_log, game_over, winner) "
+                "VALUES (1, 0, 'fen', '', 1, '\"Draw\"')"
+            )
+        )
+
+    storage = SqlStorageService(engine)
+    game = asyncio.run(storage.get_single_game(1))
+
+    assert game.version == 0
+    assert game.winner is None and game.result is None
+
+
+def test_move_log_added_to_a_table_without_it(tmp_path):
+    fen = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+    engine = build_engine(f"sqlite:///{tmp_path / 'chess.db'}")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE games (id INTEGER PRIMARY KEY, is_active BOOLEAN, white_player JSON, "
+                "black_player JSON, turn JSON, fen VARCHAR(100), game_over BOOLEAN, winner JSON)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO games (id, is_active, fen, game_over) VALUES (1, 1, :fen, 0)"
+            ),
+            {"fen": fen},
+        )
+
+    storage = SqlStorageService(engine)
+    game = asyncio.run(storage.get_single_game(1))
+
+    assert (game.fen, game.start_fen, game.move_log) == (fen, None, "")
+
+
+def test_stale_join_leaves_the_player_untouched(storage, monkeypatch):
+    asyncio.run(storage.post_players(Player(name="Alice")))
+    game = asyncio.run(storage.post_games(Game()))
+
+    async def stale_update(game):
+        raise StaleGameError(f"Game {game.game_id} was updated by another request")
+
+    monkeypatch.setattr(storage, "update_game", stale_update)
+    with pytest.raises(StaleGameError):
+        asyncio.run(storage.add_player_to_game("Alice", game.game_id))
+
+    assert asyncio.run(storage.get_single_player("Alice")).active_games == []
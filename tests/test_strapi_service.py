@@ -1,13 +1,21 @@
+import json
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock
 
 import requests
 from custom_errors.custom_errors import PlayernotFoundError
-from services.strapi_service import StrapiApiService
+from schemas.player import PlayerRef
+from services.strapi_service import GameFactory, StrapiApiService
+from services.transport import TransportConfig, build_session
 
 
-@patch("services.strapi_service.requests.get")
-def test_get_single_player(mock_get):
+@pytest.fixture
+def mock_session():
+    return MagicMock(spec=requests.Session)
+
+
+def test_get_single_player(mock_session):
+    mock_get = mock_session.get
     mock_get.return_value.status_code = 200
     mock_get.return_value.json.return_value = {
         "data": [
@@ -26,30 +34,127 @@ def test_get_single_player(mock_get):
         ],
         "meta": {"pagination": {"page": 1, "pageSize": 25, "pageCount": 1, "total": 1}},
     }
-    service = StrapiApiService()
+    service = StrapiApiService(session=mock_session)
     player = service.get_single_player("Marius")
-    mock_get.assert_called_once_with("http://localhost:1337/api/players?filters[name][$eq]=Marius")
+    mock_get.assert_called_once_with(
+        "http://localhost:1337/api/players?filters[name][$eq]=Marius",
+        timeout=service.timeout,
+    )
     
     assert player.name == "Marius"
     assert player.player_id == 1
     assert player.active_games == [3, 4]
     
-@patch("services.strapi_service.requests.get")
-def test_get_single_player_no_player_found(mock_get):
+def test_get_single_player_no_player_found(mock_session):
+    mock_get = mock_session.get
     mock_get.return_value.status_code = 200
     mock_get.return_value.json.return_value = {"data": []}  # Aucun joueur trouvé
 
-    service = StrapiApiService()
+    service = StrapiApiService(session=mock_session)
 
     with pytest.raises(PlayernotFoundError):
         service.get_single_player("Random")
 
 
-@patch("services.strapi_service.requests.get")
-def test_get_single_player_http_error(mock_get):
+def test_get_single_player_http_error(mock_session):
+    mock_get = mock_session.get
     mock_get.side_effect = requests.exceptions.HTTPError("Error HTTP")
 
-    service = StrapiApiService()
+    service = StrapiApiService(session=mock_session)
 
     with pytest.raises(requests.exceptions.HTTPError):
-        service.get_single_player("Random")
\ No newline at end of file
+        service.get_single_player("Random")
+
+
+def test_session_is_pooled_with_retries():
+    config = TransportConfig(pool_maxsize=8, max_retries=2)
+    session = build_session(config)
+    adapter = session.get_adapter("http://localhost:1337/api")
+
+    assert adapter._pool_maxsize == 8
+    assert adapter.max_retries.total == 2
+    assert "POST" not in adapter.max_retries.allowed_methods
+
+
+def test_versioned_session_only_retries_unsent_requests():
+    config = TransportConfig(max_retries=2)
+    retries = build_session(config, versioned=True).get_adapter("http://x").max_retries
+
+    assert retries.connect == 2
+    assert retries.read == retries.status == retries.other == 0
+
+
+def test_transport_config_from_env(monkeypatch):
+    monkeypatch.setenv("STRAPI_POOL_MAXSIZE", "64")
+    monkeypatch.setenv("STRAPI_READ_TIMEOUT", "2.5")
+
+    config = TransportConfig.from_env()
+
+    assert config.pool_maxsize == 64
+    assert config.timeout == (config.connect_timeout, 2.5)
+
+
+def test_get_single_player_served_from_index(mock_session):
+    mock_session.get.return_value.json.return_value = {
+        "data": [{"id": 1, "attributes": {"name": "Marius", "active_games": []}}]
+    }
+    service = StrapiApiService(session=mock_session)
+
+    service.get_single_player("marius")
+    player = service.get_single_player("Marius ")
+
+    assert player.player_id == 1
+    assert mock_session.get.call_count == 1
+
+
+def test_delete_player_removes_it_from_index(mock_session):
+    mock_session.get.return_value.json.return_value = {
+        "data": [{"id": 1, "attributes": {"name": "Marius", "active_games": []}}]
+    }
+    service = StrapiApiService(session=mock_session)
+
+    service.get_single_player("Marius")
+    service.delete_player("marius")
+
+    assert service.player_index.get("Marius") is None
+
+
+def test_game_factory_reduces_embedded_players_to_references():
+    stored_player = {"name": "Marius", "player_id": 1, "rank": 3, "friends": [], "active_games": [5]}
+
+    game = GameFactory.from_strapi_response(
+        {"id": 5, "attributes": {"white_player": stored_player, "turn": stored_player}}
+    )
+
+    assert game.game_id == 5
+    assert game.white_player == PlayerRef(player_id=1, name="Marius")
+    assert game.model_dump()["turn"] == {"player_id": 1, "name": "Marius"}
+
+
+def test_delete_seated_game_updates_the_stored_players(mock_session):
+    reference = {"player_id": 1, "name": "Marius"}
+    stored_player = {"id": 1, "attributes": {"name": "Marius", "active_games": [5, 6]}}
+
+    def get(url, **kwargs):
+        response = MagicMock(status_code=200)
+        if "/games/" in url:
+            response.json.return_value = {
+                "data": {"id": 5, "attributes": {"white_player": reference}}
+            }
+        else:
+            response.json.return_value = {"data": [stored_player]}
+        return response
+
+    mock_session.get.side_effect = get
+    mock_session.put.return_value.json.return_value = {
+        "data": {"id": 1, "attributes": {"name": "Marius", "active_games": [6]}}
+    }
+    mock_session.delete.return_value.status_code = 200
+    service = StrapiApiService(session=mock_session)
+
+    service.delete_game(5)
+
+    payload = json.loads(mock_session.put.call_args.kwargs["data"])
+    assert mock_session.put.call_args.args[0].endswith("/players/1")
+    assert payload["data"]["active_games"] == [6]
+    mock_session.delete.assert_called_once()
@@ -0,0 +1,90 @@
+import chess
+import pytest
+
+from chess_app.chess_engine import ChessGame
+from chess_app.tablebase import EndgameTablebase
+from schemas.game import Game
+
+
+class FakeSyzygy:
+    """Stands in for the KRvK and KvK tables: the side with the rook wins."""
+
+    def probe_wdl(self, board: chess.Board) -> int:
+        if chess.popcount(board.occupied) > 3:
+            raise KeyError(board.fen())
+        if board.pieces(chess.ROOK, board.turn):
+            return 2
+        if board.pieces(chess.ROOK, not board.turn):
+            return -2
+        return 0
+
+    def get_dtz(self, board: chess.Board) -> int:
+        return {2: 1, -2: -1, 0: 0}[self.probe_wdl(board)]
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def tablebase():
+    tablebase = EndgameTablebase([])
+    tablebase._tablebase = FakeSyzygy()
+    tablebase._max_pieces = 3
+    return tablebase
+
+
+def test_empty_directory_covers_nothing(tmp_path):
+    tablebase = EndgameTablebase([str(tmp_path)])
+    board = chess.Board("k7/8/1K6/8/8/8/8/7R w - - 0 1")
+
+    assert tablebase.max_pieces == 0
+    assert tablebase.probe(board) is None
+    assert tablebase.probe_moves(board) is None
+
+
+def test_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("SYZYGY_PATH", raising=False)
+    assert EndgameTablebase.from_env() is None
+
+    monkeypatch.setenv("SYZYGY_PATH", str(tmp_path))
+    monkeypatch.setenv("SYZYGY_MAX_FDS", "8")
+    tablebase = EndgameTablebase.from_env()
+    assert tablebase.directories == [str(tmp_path)]
+    assert tablebase.max_fds == 8
+
+
+def test_winning_side_prefers_mate(tablebase):
+    board = chess.Board("k7/8/1K6/8/8/8/8/7R w - - 0 1")
+
+    result = tablebase.probe(board)
+
+    assert (result.wdl, result.category, result.dtz) == (2, "win", 1)
+    assert result.best_move == "h1h8"
+    assert board.fen() == "k7/8/1K6/8/8/8/8/7R w - - 0 1"
+
+
+def test_losing_side_prefers_drawing_capture(tablebase):
+    board = chess.Board("7K/8/8/8/8/2k5/1R6/8 b - - 0 1")
+
+    moves = tablebase.probe_moves(board)
+
+    assert (moves[0].move, moves[0].wdl) == ("c3b2", 0)
+    assert all(move.wdl == -2 for move in moves[1:])
+    assert tablebase.probe(board).category == "loss"
+
+
+def test_positions_outside_the_tables(tablebase):
+    assert tablebase.probe(chess.Board()) is None
+    assert tablebase.probe(chess.Board("k7/8/1K6/8/8/8/8/R6R w - - 0 1")) is None
+
+
+def test_chess_game_tablebase(tablebase, monkeypatch):
+    chess_game = ChessGame(game=Game(fen="k7/8/1K6/8/8/8/8/7R w - - 0 1"))
+
+    monkeypatch.setattr(ChessGame, "tablebase", None)
+    assert chess_game.probe_tablebase() is None
+    assert all(move.wdl is None for move in chess_game.get_tablebase_moves())
+
+    monkeypatch.setattr(ChessGame, "tablebase", tablebase)
+    assert chess_game.probe_tablebase().best_move == "h1h8"
+    assert chess_game.get_tablebase_moves()[0].move == "h1h8"